@@ -15,7 +15,7 @@ from core.config import settings
 from core.database import Base
 
 # Explicit imports so Alembic discovers models for autogenerate.
-from models import flashcard, flashcardWordList, randomWordList, refresh_token, user  # noqa: F401
+from models import flashcard, flashcardWordList, randomWordList, job_run, refresh_token, user, user_stats, wordChain  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,57 @@
+"""add flashcard review schedule
+
+Revision ID: 3c7a91e0b2d4
+Revises: 8fd3039e2d3d
+Create Date: 2026-10-18 10:12:41.318220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7a91e0b2d4'
+down_revision: Union[str, Sequence[str], None] = '8fd3039e2d3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('due_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('interval_days', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('ease', sa.Float(), server_default='2.5', nullable=False))
+        batch_op.add_column(sa.Column('repetitions', sa.Integer(), server_default='0', nullable=False))
+
+    # Carry over the old ad-hoc rule: unrated, hard or never reviewed cards are
+    # due now, everything else three days after its last review.
+    if op.get_bind().dialect.name == 'sqlite':
+        reviewed_due = "datetime(last_review, '+3 days')"
+    else:
+        reviewed_due = "last_review + interval '3 days'"
+    op.execute(
+        "UPDATE flashcard_words SET due_at = CASE "
+        "WHEN last_review IS NULL OR difficulty IS NULL OR difficulty = 'hard' THEN CURRENT_TIMESTAMP "
+        f"ELSE {reviewed_due} END"
+    )
+    op.execute(
+        "UPDATE flashcard_words SET interval_days = 3, repetitions = 1 "
+        "WHERE last_review IS NOT NULL AND difficulty IN ('medium', 'easy')"
+    )
+
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.alter_column('due_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_flashcard_words_deck_due', ['deck_id', 'due_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcard_words_deck_due')
+        batch_op.drop_column('repetitions')
+        batch_op.drop_column('ease')
+        batch_op.drop_column('interval_days')
+        batch_op.drop_column('due_at')
@@ -0,0 +1,41 @@
+"""add flashcard sample key
+
+Revision ID: 5e19d4a7c830
+Revises: 3c7a91e0b2d4
+Create Date: 2026-10-18 11:02:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e19d4a7c830'
+down_revision: Union[str, Sequence[str], None] = '3c7a91e0b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sample_key', sa.Float(), nullable=True))
+
+    if op.get_bind().dialect.name == 'sqlite':
+        random_key = "(abs(random()) % 1000000000) / 1000000000.0"
+    else:
+        random_key = "random()"
+    op.execute(f"UPDATE flashcard_words SET sample_key = {random_key}")
+
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.alter_column('sample_key', existing_type=sa.Float(), nullable=False)
+        batch_op.create_index('ix_flashcard_words_deck_sample', ['deck_id', 'sample_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcard_words_deck_sample')
+        batch_op.drop_column('sample_key')
@@ -0,0 +1,45 @@
+"""add user stats
+
+Revision ID: 9a4f2c6d81e3
+Revises: 5e19d4a7c830
+Create Date: 2026-10-18 11:48:05.112734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f2c6d81e3'
+down_revision: Union[str, Sequence[str], None] = '5e19d4a7c830'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are built lazily on first read, so no backfill is needed.
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_cards', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('cards_unrated', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('cards_easy', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('cards_medium', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('cards_hard', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('due_cards', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('due_valid_until', sa.DateTime(), nullable=True),
+    sa.Column('words_easy', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('words_ok', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('words_hard', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('stale', sa.Boolean(), server_default=sa.false(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
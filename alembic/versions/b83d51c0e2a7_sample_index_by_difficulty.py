@@ -0,0 +1,34 @@
+"""sample index by difficulty
+
+Revision ID: b83d51c0e2a7
+Revises: e7b2f9c4a1d6
+Create Date: 2026-10-18 19:12:40.218331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83d51c0e2a7'
+down_revision: Union[str, Sequence[str], None] = 'e7b2f9c4a1d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcard_words_deck_sample')
+        batch_op.create_index(
+            'ix_flashcard_words_deck_difficulty_sample', ['deck_id', 'difficulty', 'sample_key'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcard_words_deck_difficulty_sample')
+        batch_op.create_index('ix_flashcard_words_deck_sample', ['deck_id', 'sample_key'], unique=False)
@@ -0,0 +1,77 @@
+"""composite query indexes
+
+Revision ID: c41d7e2a9f05
+Revises: 9a4f2c6d81e3
+Create Date: 2026-10-18 14:02:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e2a9f05'
+down_revision: Union[str, Sequence[str], None] = '9a4f2c6d81e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column indexes no query filters or sorts on by themselves. Lookups by
+# owner are covered by the leading column of the unique constraints and the
+# composite indexes below.
+UNUSED_INDEXES = {
+    'flashcard_words': ['deck_id', 'word', 'definition', 'example', 'difficulty'],
+    'user_words': ['user_id', 'word', 'status', 'translate', 'comment', 'lang'],
+    'cardDecks': ['user_id', 'title', 'description', 'category', 'lang'],
+    'word_chain': ['user_id', 'used_word'],
+}
+
+COMPOSITE_INDEXES = {
+    'flashcard_words': {'ix_flashcard_words_deck_id_id': ['deck_id', 'id']},
+    'user_words': {
+        'ix_user_words_user_lang_id': ['user_id', 'lang', 'id'],
+        'ix_user_words_user_lang_status_id': ['user_id', 'lang', 'status', 'id'],
+    },
+    'cardDecks': {'ix_cardDecks_user_lang': ['user_id', 'lang']},
+    'word_chain': {'ix_word_chain_user_id_id': ['user_id', 'id']},
+}
+
+
+def _existing_indexes(table: str) -> set[str]:
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # word_chain was only ever created by create_all(); make sure it exists.
+    if not sa.inspect(op.get_bind()).has_table('word_chain'):
+        op.create_table('word_chain',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('used_word', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'used_word', name='uq_user_word_chain')
+        )
+
+    for table, columns in UNUSED_INDEXES.items():
+        existing = _existing_indexes(table)
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in columns:
+                name = op.f(f'ix_{table}_{column}')
+                if name in existing:
+                    batch_op.drop_index(name)
+            for name, index_columns in COMPOSITE_INDEXES[table].items():
+                batch_op.create_index(name, index_columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, indexes in COMPOSITE_INDEXES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name in indexes:
+                batch_op.drop_index(name)
+            for column in UNUSED_INDEXES[table]:
+                batch_op.create_index(op.f(f'ix_{table}_{column}'), [column], unique=False)
@@ -0,0 +1,30 @@
+"""deck keyset index
+
+Revision ID: d2c6a8f41b97
+Revises: b83d51c0e2a7
+Create Date: 2026-10-18 20:05:13.402519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c6a8f41b97'
+down_revision: Union[str, Sequence[str], None] = 'b83d51c0e2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('cardDecks', schema=None) as batch_op:
+        batch_op.create_index('ix_cardDecks_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cardDecks', schema=None) as batch_op:
+        batch_op.drop_index('ix_cardDecks_user_id_id')
@@ -0,0 +1,38 @@
+"""sample from due index
+
+Revision ID: f41a7c9d2e58
+Revises: d2c6a8f41b97
+Create Date: 2026-10-19 10:24:51.630817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41a7c9d2e58'
+down_revision: Union[str, Sequence[str], None] = 'd2c6a8f41b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcard_words_deck_difficulty_sample')
+        batch_op.drop_index('ix_flashcard_words_deck_due')
+        batch_op.create_index(
+            'ix_flashcard_words_deck_due_sample', ['deck_id', 'due_at', 'difficulty', 'sample_key'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('flashcard_words', schema=None) as batch_op:
+        batch_op.drop_index('ix_flashcard_words_deck_due_sample')
+        batch_op.create_index('ix_flashcard_words_deck_due', ['deck_id', 'due_at'], unique=False)
+        batch_op.create_index(
+            'ix_flashcard_words_deck_difficulty_sample', ['deck_id', 'difficulty', 'sample_key'], unique=False
+        )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,8 +7,28 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     DATABASE_URL: str = "sqlite:///users.db"
+    DATABASE_ASYNC: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_JOURNAL_MODE: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    DB_REPORT_ON_STARTUP: bool = True
     SECRET_KEY: str
     DEEPL_KEY: str | None = None
+    DEEPL_API_URL: str = "https://api-free.deepl.com/v2/translate"
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    TRANSLATION_CACHE_SIZE: int = 10000
+    TRANSLATION_CACHE_TTL_SECONDS: int = 86400
+    TRANSLATION_BATCH_SIZE: int = 50
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
@@ -16,6 +38,37 @@ class Settings(BaseSettings):
     JWT_COOKIE_SECURE: bool = False
     JWT_COOKIE_SAMESITE: str = "lax"
     JWT_COOKIE_CSRF_PROTECT: bool = True
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+    ADMIN_TOKEN: str | None = None
+    JWT_VERIFY_CACHE_MAX_ENTRIES: int = 10000
+    JWT_VERIFY_CACHE_TTL_SECONDS: float = 300.0
+    REFRESH_TOKEN_GC_INTERVAL_SECONDS: int = 3600
+    REFRESH_TOKEN_GC_RETENTION_DAYS: int = 7
+    REFRESH_TOKEN_GC_CHUNK_SIZE: int = 1000
+    REFRESH_TOKEN_GC_PAUSE_SECONDS: float = 0.05
+    REFRESH_TOKEN_GC_COMPACT: bool = True
+    REFRESH_TOKEN_CACHE_BACKEND: Literal["local", "redis"] = "local"
+    REFRESH_TOKEN_CACHE_REDIS_URL: str | None = None
+    REFRESH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    REFRESH_TOKEN_CACHE_TTL_SECONDS: float = 60.0
+    PRELOAD_SPELLCHECKERS: bool = True
+    FLASHCARD_IMPORT_MAX_ROWS: int = 50000
+    FLASHCARD_IMPORT_BATCH_SIZE: int = 500
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 21600
+    STATS_RECONCILE_CHUNK_SIZE: int = 500
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    COUNTER_FLUSH_MAX_PENDING: int = 500
+    DAILY_RESET_HOUR_UTC: int = 0
+    DAILY_RESET_JITTER_SECONDS: float = 300.0
+    DAILY_RESET_CHUNK_SIZE: int = 10000
+    JOB_LEASE_SECONDS: int = 3600
+    JOB_RETRY_SECONDS: float = 60.0
+    USER_PROFILE_CACHE_TTL_SECONDS: float = 30.0
+    USER_PROFILE_CACHE_MAX_ENTRIES: int = 10000
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
 
 
@@ -0,0 +1,210 @@
+import csv
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from random import choice, randrange
+from sys import intern
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Code stored in the level column for rows without a CEFR level.
+NO_LEVEL = 255
+# Level key used by the length index for buckets that ignore the level.
+ANY_LEVEL = -1
+
+
+@dataclass(frozen=True)
+class CorpusSource:
+    path: Path
+    level_column: str | None = None
+    rank_column: str | None = None
+
+
+SOURCES: dict[str, CorpusSource] = {
+    "en": CorpusSource(BASE_DIR / "eng_words.csv", level_column="level"),
+    "de": CorpusSource(BASE_DIR / "germany_words.csv", rank_column="rank"),
+}
+
+LANG_ALIASES = {
+    "en": "en",
+    "english": "en",
+    "de": "de",
+    "germany": "de",
+}
+
+
+def normalize_lang(lang: str | None) -> str | None:
+    return LANG_ALIASES.get((lang or "").strip().lower())
+
+
+class LanguageCorpus:
+    """Read-only, column-oriented word list for one language.
+
+    Row ``i`` is spread over ``words[i]``, ``level_codes[i]`` and ``ranks[i]``
+    instead of one dict per CSV row, so a corpus costs a few bytes per word
+    on top of the (interned) strings themselves.
+    """
+
+    __slots__ = ("lang", "words", "levels", "level_codes", "ranks", "_level_lookup", "_length_index", "_letter_index")
+
+    def __init__(
+        self,
+        *,
+        lang: str,
+        words: tuple[str, ...],
+        levels: tuple[str, ...],
+        level_codes: array,
+        ranks: array,
+    ):
+        self.lang = lang
+        self.words = words
+        self.levels = levels
+        self.level_codes = level_codes
+        self.ranks = ranks
+        self._level_lookup = {level: code for code, level in enumerate(levels)}
+        self._length_index = self._build_length_index()
+        self._letter_index = self._build_letter_index()
+
+    def _build_length_index(self) -> dict[tuple[int, int], array]:
+        # (length, level code) -> word indices sorted by rank, so a rank band
+        # inside a bucket is a contiguous slice found with two bisects.
+        buckets: dict[tuple[int, int], list[int]] = {}
+        for index, word in enumerate(self.words):
+            length = len(word)
+            buckets.setdefault((length, ANY_LEVEL), []).append(index)
+            code = self.level_codes[index]
+            if code != NO_LEVEL:
+                buckets.setdefault((length, code), []).append(index)
+        ranks = self.ranks
+        return {
+            key: array("I", sorted(indices, key=ranks.__getitem__))
+            for key, indices in buckets.items()
+        }
+
+    def _build_letter_index(self) -> dict[str, tuple[str, ...]]:
+        buckets: dict[str, list[str]] = {}
+        for word in self.words:
+            buckets.setdefault(word[:1].lower(), []).append(word)
+        return {letter: tuple(words) for letter, words in buckets.items()}
+
+    @classmethod
+    def from_csv(cls, lang: str, source: CorpusSource) -> "LanguageCorpus":
+        words: list[str] = []
+        levels: dict[str, int] = {}
+        level_codes = array("B")
+        ranks = array("I")
+
+        with open(source.path, encoding="utf-8", newline="") as content:
+            for row in csv.DictReader(content):
+                word = (row.get("word") or "").strip()
+                if not word:
+                    continue
+                words.append(intern(word))
+
+                level = (row.get(source.level_column) or "").strip().lower() if source.level_column else ""
+                if level:
+                    code = levels.setdefault(intern(level), len(levels))
+                    if code >= NO_LEVEL:
+                        raise ValueError(f"Too many distinct levels in {source.path}")
+                    level_codes.append(code)
+                else:
+                    level_codes.append(NO_LEVEL)
+
+                rank = (row.get(source.rank_column) or "").strip() if source.rank_column else ""
+                ranks.append(int(rank) if rank.isdigit() else len(words))
+
+        return cls(
+            lang=lang,
+            words=tuple(words),
+            levels=tuple(levels),
+            level_codes=level_codes,
+            ranks=ranks,
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def level_of(self, index: int) -> str | None:
+        code = self.level_codes[index]
+        return None if code == NO_LEVEL else self.levels[code]
+
+    def rank_of(self, index: int) -> int:
+        return self.ranks[index]
+
+    def random_word(self) -> str:
+        return choice(self.words)
+
+    def words_starting_with(self, letter: str) -> tuple[str, ...]:
+        return self._letter_index.get(letter[:1].lower(), ())
+
+    def pick_by_length(
+        self,
+        length: int,
+        *,
+        level: str | None = None,
+        min_rank: int | None = None,
+        max_rank: int | None = None,
+    ) -> str | None:
+        code = ANY_LEVEL
+        if level is not None:
+            code = self._level_lookup.get(level.strip().lower())
+            if code is None:
+                return None
+        bucket = self._length_index.get((length, code))
+        if not bucket:
+            return None
+
+        lo, hi = 0, len(bucket)
+        rank_of = self.ranks.__getitem__
+        if min_rank is not None:
+            lo = bisect_left(bucket, min_rank, key=rank_of)
+        if max_rank is not None:
+            hi = bisect_right(bucket, max_rank, key=rank_of)
+        if lo >= hi:
+            return None
+        return self.words[bucket[randrange(lo, hi)]]
+
+
+_corpora: dict[str, LanguageCorpus] = {}
+_lock = threading.Lock()
+
+
+def get_corpus(lang: str | None) -> LanguageCorpus | None:
+    code = normalize_lang(lang)
+    if code is None:
+        return None
+    corpus = _corpora.get(code)
+    if corpus is None:
+        with _lock:
+            corpus = _corpora.get(code)
+            if corpus is None:
+                corpus = LanguageCorpus.from_csv(code, SOURCES[code])
+                _corpora[code] = corpus
+    return corpus
+
+
+def load_all() -> None:
+    for code in SOURCES:
+        get_corpus(code)
+
+
+def reload_corpus(lang: str, path: str | Path | None = None) -> LanguageCorpus:
+    """Rebuild one language from disk and swap it in for new requests.
+
+    Requests already holding the previous corpus keep using it; the swap is
+    a single dict assignment, so readers never see a half-built corpus.
+    """
+    code = normalize_lang(lang)
+    if code is None:
+        raise ValueError(f"Unsupported language: {lang}")
+    source = SOURCES[code]
+    if path is not None:
+        source = CorpusSource(Path(path), source.level_column, source.rank_column)
+    corpus = LanguageCorpus.from_csv(code, source)
+    with _lock:
+        SOURCES[code] = source
+        _corpora[code] = corpus
+    return corpus
@@ -0,0 +1,132 @@
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CounterDelta:
+    """Pending change for one row: optional reset to 0, then an increment, per column."""
+
+    increments: dict[str, int] = field(default_factory=dict)
+    resets: set[str] = field(default_factory=set)
+
+    def add(self, column: str, amount: int) -> None:
+        self.increments[column] = self.increments.get(column, 0) + amount
+
+    def reset(self, column: str) -> None:
+        self.resets.add(column)
+        self.increments.pop(column, None)
+
+    def then(self, later: "CounterDelta") -> "CounterDelta":
+        merged = CounterDelta(dict(self.increments), set(self.resets))
+        for column in later.resets:
+            merged.reset(column)
+        for column, amount in later.increments.items():
+            merged.add(column, amount)
+        return merged
+
+    @property
+    def columns(self) -> set[str]:
+        return set(self.increments) | self.resets
+
+    def apply(self, column: str, value: int) -> int:
+        base = 0 if column in self.resets else value
+        return base + self.increments.get(column, 0)
+
+
+class CounterBuffer:
+    """Thread-safe write-behind buffer of per-row counter deltas.
+
+    Increments are aggregated in memory and handed out by ``drain`` for a
+    caller to write as ``col = col + n``; one flush runs at a time. Drained
+    deltas stay visible to ``pending`` until ``complete`` (or ``restore`` on
+    failure) is called, so reads keep merging them while the flush is being
+    written. Only this process sees the buffer.
+
+    ``version`` works like a seqlock around the flush commit: it turns odd
+    in ``begin_commit`` and even again in ``complete``/``restore``. A reader
+    takes ``stable_version()``, reads the stored row, then ``snapshot()``;
+    if the versions differ the row may already contain the in-flight delta
+    and the read is retried.
+    """
+
+    def __init__(self, *, max_pending: int):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._stable = threading.Condition(self._lock)
+        self._pending: dict[int, CounterDelta] = {}
+        self._inflight: dict[int, CounterDelta] = {}
+        self._flushing = False
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, key: int, column: str, amount: int = 1) -> bool:
+        """Buffer an increment; return True once a flush is due."""
+        with self._lock:
+            self._pending.setdefault(key, CounterDelta()).add(column, amount)
+            return len(self._pending) >= self.max_pending
+
+    def reset(self, key: int, column: str) -> bool:
+        with self._lock:
+            self._pending.setdefault(key, CounterDelta()).reset(column)
+            return len(self._pending) >= self.max_pending
+
+    def _merged(self, key: int) -> CounterDelta | None:
+        inflight = self._inflight.get(key)
+        pending = self._pending.get(key)
+        if inflight is None and pending is None:
+            return None
+        # ``then`` copies, so callers never hold a delta that is still changing.
+        return (inflight or CounterDelta()).then(pending or CounterDelta())
+
+    def pending(self, key: int) -> CounterDelta | None:
+        with self._lock:
+            return self._merged(key)
+
+    def stable_version(self) -> int:
+        """The current version, waiting out a flush commit in progress."""
+        with self._stable:
+            while self._version % 2:
+                self._stable.wait()
+            return self._version
+
+    def snapshot(self, key: int) -> tuple[int, CounterDelta | None]:
+        with self._lock:
+            return self._version, self._merged(key)
+
+    def drain(self) -> dict[int, CounterDelta]:
+        """Hand out everything buffered so far; empty while another flush runs."""
+        with self._lock:
+            if self._flushing or not self._pending:
+                return {}
+            self._flushing = True
+            self._inflight = self._pending
+            self._pending = {}
+            return self._inflight
+
+    def begin_commit(self) -> None:
+        """Mark the drained deltas as possibly stored; call right before committing them."""
+        with self._lock:
+            self._version += 1
+
+    def _end_commit(self) -> None:
+        if self._version % 2:
+            self._version += 1
+            self._stable.notify_all()
+
+    def complete(self) -> None:
+        with self._lock:
+            self._inflight = {}
+            self._flushing = False
+            self._end_commit()
+
+    def restore(self) -> None:
+        """Put back deltas whose flush failed, ahead of anything buffered since."""
+        with self._lock:
+            for key, delta in self._inflight.items():
+                later = self._pending.get(key)
+                self._pending[key] = delta.then(later) if later else delta
+            self._inflight = {}
+            self._flushing = False
+            self._end_commit()
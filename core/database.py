@@ -1,20 +1,224 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import AsyncGenerator, Callable, Generator, TypeVar
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+
 from core.config import settings
 
 
-engine = create_engine(settings.DATABASE_URL, echo=False, future=True)
+T = TypeVar("T")
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+SQLITE_PRAGMAS = ("journal_mode", "synchronous", "busy_timeout", "mmap_size")
+SQLITE_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+
+
+def async_database_url(url: str) -> str:
+    """Point a sync DATABASE_URL at the matching async driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def upsert_insert_for(backend: str):
+    """The INSERT construct with ON CONFLICT support for a DATABASE_URL backend."""
+    insert = UPSERT_INSERTS.get(backend)
+    if insert is None:
+        supported = ", ".join(sorted(UPSERT_INSERTS))
+        raise ValueError(f"No upsert INSERT configured for DATABASE_URL backend {backend!r} (supported: {supported})")
+    return insert
+
+
+def upsert_insert(db: Session):
+    """The INSERT construct with ON CONFLICT support for the session's dialect."""
+    return upsert_insert_for(db.get_bind().dialect.name)
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def engine_options(url: str) -> dict[str, object]:
+    options: dict[str, object] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite lives and dies with its single connection; there is no
+    # pool to size.
+    if not _is_sqlite_memory(make_url(url)):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        # busy_timeout goes first so switching the journal mode waits for
+        # other connections instead of failing with "database is locked".
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(target: Engine) -> Engine:
+    if target.dialect.name == "sqlite":
+        event.listen(target, "connect", _apply_sqlite_pragmas)
+    return target
+
+
+# Repositories upsert on the hot paths, so an unsupported backend fails here
+# at startup rather than on the first request that writes.
+upsert_insert_for(make_url(settings.DATABASE_URL).get_backend_name())
+engine = configure_engine(
+    create_engine(settings.DATABASE_URL, echo=False, future=True, **engine_options(settings.DATABASE_URL))
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        echo=False,
+        **engine_options(settings.DATABASE_URL),
+    )
+    configure_engine(async_engine.sync_engine)
+    # Entities are read after the unit of work has finished, outside of any
+    # greenlet, so they must not expire on commit.
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
-# dependency
-from typing import Generator
 
+class Database:
+    """Request-scoped handle that runs repository code off the event loop.
+
+    With DATABASE_ASYNC the work runs on an ``AsyncSession`` through
+    ``run_sync``, so every query awaits the async driver; otherwise it runs
+    on a regular ``Session`` in the threadpool. Either way the same
+    repositories and services are used and the loop keeps serving other
+    requests while a query is in flight.
+    """
+
+    def __init__(self, session: Session | AsyncSession):
+        self.session = session
 
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    async def run_in_thread(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Like ``run`` but always on a worker thread, for units of work that
+        also parse files or do other CPU-heavy work between queries."""
+        if not isinstance(self.session, AsyncSession):
+            return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+        def in_thread() -> T:
+            with SessionLocal() as session:
+                return fn(session, *args, **kwargs)
+
+        return await run_in_threadpool(in_thread)
+
+    def service(self, factory: Callable[[Session], object]) -> "_ServiceProxy":
+        """Wrap ``factory(session)`` so each of its methods becomes awaitable."""
+        return _ServiceProxy(self, factory)
+
+
+class _ServiceProxy:
+    __slots__ = ("_db", "_factory")
+
+    def __init__(self, db: Database, factory: Callable[[Session], object]):
+        self._db = db
+        self._factory = factory
+
+    def __getattr__(self, name: str):
+        async def call(*args, **kwargs):
+            return await self._db.run(lambda session: getattr(self._factory(session), name)(*args, **kwargs))
+
+        return call
+
+
+# dependency
 def get_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_database() -> AsyncGenerator[Database, None]:
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield Database(session)
+        return
+    db = SessionLocal()
+    try:
+        yield Database(db)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def _read_sqlite_pragmas(connection) -> dict[str, object]:
+    values = {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in SQLITE_PRAGMAS}
+    values["synchronous"] = SQLITE_SYNCHRONOUS_NAMES.get(values["synchronous"], values["synchronous"])
+    return values
+
+
+def _describe_engine(label: str, target: Engine | AsyncEngine, pragmas: dict[str, object]) -> str:
+    pool = target.pool
+    parts = [
+        f"{label}: {target.url.render_as_string(hide_password=True)}",
+        f"pool={type(pool).__name__}",
+    ]
+    if isinstance(pool, QueuePool):
+        parts.append(f"size={pool.size()} overflow={pool._max_overflow} timeout={pool.timeout()}s")
+    parts.append(f"recycle={pool._recycle}s pre_ping={pool._pre_ping}")
+    parts.extend(f"{name}={value}" for name, value in pragmas.items())
+    return " ".join(parts)
+
+
+async def engine_report() -> list[str]:
+    """Describe the effective pool and SQLite settings of every configured engine.
+
+    The pragmas are read back from a live connection, so the report shows
+    what SQLite actually accepted (an in-memory database stays in "memory"
+    journal mode, for example) rather than what was requested.
+    """
+
+    def read_sync() -> dict[str, object]:
+        with engine.connect() as connection:
+            return _read_sqlite_pragmas(connection)
+
+    pragmas = await run_in_threadpool(read_sync) if engine.dialect.name == "sqlite" else {}
+    lines = [_describe_engine("sync", engine, pragmas)]
+    if async_engine is not None:
+        pragmas = {}
+        if async_engine.dialect.name == "sqlite":
+            async with async_engine.connect() as connection:
+                pragmas = await connection.run_sync(_read_sqlite_pragmas)
+        lines.append(_describe_engine("async", async_engine, pragmas))
+    return lines
@@ -0,0 +1,73 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """Return the id a page should continue below, or None for the first page.
+
+    Raises ValueError for anything that is not a cursor produced by
+    ``encode_cursor``.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError("Invalid cursor")
+    return value
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    before_id: int | None
+    include_total: bool
+
+    @property
+    def fetch_limit(self) -> int:
+        # One extra row tells us whether a next page exists without a COUNT.
+        return self.limit + 1
+
+    def split(self, rows: list) -> tuple[list, str | None]:
+        if len(rows) > self.limit:
+            rows = rows[: self.limit]
+            return rows, encode_cursor(rows[-1].id)
+        return rows, None
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="`next_cursor` from the previous page."),
+    include_total: bool = Query(False, description="Also count all matching rows."),
+) -> PageParams:
+    try:
+        before_id = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return PageParams(limit=limit, before_id=before_id, include_total=include_total)
+
+
+def keyset_by_id(stmt: Select, id_column, *, before_id: int | None = None, limit: int | None = None) -> Select:
+    """Order ``stmt`` newest first and continue below ``before_id``."""
+    if before_id is not None:
+        stmt = stmt.where(id_column < before_id)
+    stmt = stmt.order_by(id_column.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
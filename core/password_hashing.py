@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from core.config import settings
+
+
+T = TypeVar("T")
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+class PasswordHashPool:
+    """Runs password hashing on a fixed set of threads, away from the event loop.
+
+    argon2 releases the GIL while it works, so threads are enough to keep
+    the loop responsive. At most ``workers + max_queue`` calls may be
+    running or waiting; further calls fail straight away with
+    ``HashPoolSaturated`` instead of piling up behind a slow queue.
+    """
+
+    def __init__(self, *, workers: int, max_queue: int):
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _timed(self, fn: Callable[..., T], *args) -> T:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._busy_seconds += elapsed
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise HashPoolSaturated()
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            future = self._get_executor().submit(self._timed, fn, *args)
+        except BaseException:
+            self._finished(None)
+            raise
+        # The slot is freed when the hash itself finishes: a caller that is
+        # cancelled stops waiting, but a started job keeps its worker busy.
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, future: Future | None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future is not None and not future.cancelled():
+                self._completed += 1
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.workers),
+                "peak_in_flight": self._peak_in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_ms": round(self._busy_seconds * 1000 / self._completed, 2) if self._completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
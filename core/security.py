@@ -7,7 +7,15 @@ from typing import Union
 from pydantic import SecretStr
 
 
-pwd_ctx = CryptContext(schemes=["argon2"], deprecated="auto")
+# Hashes made with other parameters still verify; needs_update() flags them
+# so login can store a fresh hash.
+pwd_ctx = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 def _to_plain(p: Union[str, SecretStr]) -> str:
     return p.get_secret_value() if isinstance(p, SecretStr) else p
@@ -18,6 +26,10 @@ def hash_password(password: Union[str, SecretStr]) -> str:
 def verify_password(plain: Union[str, SecretStr], hashed: str) -> bool:
     return pwd_ctx.verify(_to_plain(plain), hashed)
 
+def verify_and_update_password(plain: Union[str, SecretStr], hashed: str) -> tuple[bool, str | None]:
+    """Return (valid, new_hash); new_hash is set when ``hashed`` uses outdated parameters."""
+    return pwd_ctx.verify_and_update(_to_plain(plain), hashed)
+
 
 
 
@@ -0,0 +1,35 @@
+import threading
+from functools import lru_cache
+
+from spellchecker import SpellChecker
+
+
+SUPPORTED_LANGS = ("en", "de")
+
+_checkers: dict[str, SpellChecker] = {}
+_lock = threading.Lock()
+
+
+def get_spellchecker(lang: str) -> SpellChecker:
+    checker = _checkers.get(lang)
+    if checker is None:
+        if lang not in SUPPORTED_LANGS:
+            raise ValueError(f"Unsupported language: {lang}")
+        with _lock:
+            checker = _checkers.get(lang)
+            if checker is None:
+                # Parsing the bundled frequency dictionary is the expensive
+                # part, so each process does it once per language.
+                checker = SpellChecker(language=lang)
+                _checkers[lang] = checker
+    return checker
+
+
+@lru_cache(maxsize=4096)
+def is_known_word(lang: str, word: str) -> bool:
+    return not get_spellchecker(lang).unknown([word])
+
+
+def preload() -> None:
+    for lang in SUPPORTED_LANGS:
+        get_spellchecker(lang)
@@ -0,0 +1,183 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Generic, Protocol, TypeVar
+
+from core.config import settings
+
+
+T = TypeVar("T")
+
+
+class RevocationBackend(Protocol):
+    def is_revoked(self, jti: str) -> bool: ...
+
+    def revoke(self, jti: str, expires_at: datetime) -> None: ...
+
+
+class LocalRevocationBackend:
+    """Bounded in-process set of revoked jtis, kept until the token would expire anyway."""
+
+    def __init__(self, *, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._revoked: OrderedDict[str, float] = OrderedDict()
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            expires = self._revoked.get(jti)
+            if expires is None:
+                return False
+            if expires <= time.time():
+                del self._revoked[jti]
+                return False
+            return True
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._revoked[jti] = expires_at.timestamp()
+            self._revoked.move_to_end(jti)
+            # Dropping the oldest entry only costs a database lookup later on.
+            while len(self._revoked) > self.max_entries:
+                self._revoked.popitem(last=False)
+
+
+class RedisRevocationBackend:
+    """Revoked jtis shared by every worker through Redis keys that expire with the token."""
+
+    prefix = "revoked_refresh_jti:"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("REFRESH_TOKEN_CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self.client = redis.Redis.from_url(url)
+
+    def is_revoked(self, jti: str) -> bool:
+        return bool(self.client.exists(self.prefix + jti))
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        ttl = max(1, int(expires_at.timestamp() - time.time()) + 1)
+        self.client.set(self.prefix + jti, 1, ex=ttl)
+
+
+class RefreshTokenCache:
+    """Answers "is this refresh jti revoked?" without the database when it can.
+
+    Known-good jtis sit in a bounded LRU for at most ``ttl_seconds`` (and
+    never past the token's own expiry); revocations go to ``backend``, which
+    is checked first. ``lookup`` returns None when the answer has to come
+    from the database.
+    """
+
+    def __init__(self, *, backend: RevocationBackend, max_entries: int, ttl_seconds: float):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._active: OrderedDict[str, float] = OrderedDict()
+
+    def lookup(self, jti: str) -> bool | None:
+        try:
+            if self.backend.is_revoked(jti):
+                return True
+        except Exception as exc:
+            print(f"Revocation backend lookup failed: {exc}")
+            return None
+        with self._lock:
+            valid_until = self._active.get(jti)
+            if valid_until is None:
+                return None
+            if valid_until <= time.time():
+                del self._active[jti]
+                return None
+            self._active.move_to_end(jti)
+            return False
+
+    def remember_active(self, jti: str, expires_at: datetime) -> None:
+        valid_until = min(expires_at.timestamp(), time.time() + self.ttl_seconds)
+        with self._lock:
+            self._active[jti] = valid_until
+            self._active.move_to_end(jti)
+            while len(self._active) > self.max_entries:
+                self._active.popitem(last=False)
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._active.pop(jti, None)
+        try:
+            self.backend.revoke(jti, expires_at)
+        except Exception as exc:
+            # The database row is already revoked; other workers fall back to
+            # it once their cached entry runs out.
+            print(f"Revocation backend update failed: {exc}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._active.clear()
+
+
+def build_refresh_token_cache() -> RefreshTokenCache:
+    if settings.REFRESH_TOKEN_CACHE_BACKEND == "redis":
+        if not settings.REFRESH_TOKEN_CACHE_REDIS_URL:
+            raise RuntimeError("REFRESH_TOKEN_CACHE_REDIS_URL is required for the redis backend")
+        backend: RevocationBackend = RedisRevocationBackend(settings.REFRESH_TOKEN_CACHE_REDIS_URL)
+    else:
+        backend = LocalRevocationBackend(max_entries=settings.REFRESH_TOKEN_CACHE_MAX_ENTRIES)
+    return RefreshTokenCache(
+        backend=backend,
+        max_entries=settings.REFRESH_TOKEN_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.REFRESH_TOKEN_CACHE_TTL_SECONDS,
+    )
+
+
+class VerifiedTokenCache(Generic[T]):
+    """Payloads of tokens whose signature and expiry were already checked.
+
+    Entries are keyed by a SHA-256 of the whole token (signature included),
+    so a tampered token never matches, and are dropped after
+    ``ttl_seconds`` or when the token expires, whichever comes first.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[float, T]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> T | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            valid_until, payload = entry
+            if valid_until <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, token: str, payload: T, *, expires_at: datetime | None) -> None:
+        if self.max_entries <= 0:
+            return
+        valid_until = time.time() + self.ttl_seconds
+        if expires_at is not None:
+            valid_until = min(valid_until, expires_at.timestamp())
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (valid_until, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -148,6 +148,19 @@ export async function api(path, method = "GET", body = null, options = {}) {
   return data;
 }
 
+// Fetches one page of a cursor-paginated list endpoint ({ items, next_cursor }).
+// Callers keep nextCursor and ask for the following page only when the user needs it.
+export async function apiPage(path, { cursor = null, pageSize = 50 } = {}) {
+  const params = new URLSearchParams({ limit: String(pageSize) });
+  if (cursor) params.set("cursor", cursor);
+  const sep = path.includes("?") ? "&" : "?";
+  const data = await api(`${path}${sep}${params}`, "GET");
+  return {
+    items: Array.isArray(data?.items) ? data.items : [],
+    nextCursor: data?.next_cursor || null,
+  };
+}
+
 export async function apiFetch(path, method = "GET", body = null, options = {}) {
   const res = await authorizedRequest(path, method, body, options);
 
@@ -1,4 +1,4 @@
-import { api, apiFetch, qs, show, PATHS } from "./api.js";
+import { api, apiPage, apiFetch, qs, show, PATHS } from "./api.js";
 import { applyTheme, getActiveTheme } from "./theme.js";
 
 let currentLang = "en";
@@ -7,6 +7,9 @@ let themeInputs = [];
 let langInputs = [];
 let sessionWords = 0;
 const SESSION_WORD_LIMIT = 10;
+const DECK_PAGE_SIZE = 50;
+const CARD_PAGE_SIZE = 100;
+const LOAD_MORE_VALUE = "load-more";
 
 const STATUS_TO_RATING = {
   easy: "high",
@@ -922,6 +925,7 @@ function initRandomAddModal() {
   const submitBtn = form?.querySelector('button[type="submit"]');
   const defaultHint = hint ? hint.textContent : "Pick a deck to store this word.";
   let decks = [];
+  let decksCursor = null;
   let isLoading = false;
 
   const setHint = (text, status) => {
@@ -939,6 +943,9 @@ function initRandomAddModal() {
     decks.forEach((deck) => {
       options.push(`<option value="${deck.id}">${escapeHtml(deck.title)}</option>`);
     });
+    if (decksCursor) {
+      options.push(`<option value="${LOAD_MORE_VALUE}">Load more decks…</option>`);
+    }
     deckSelect.innerHTML = options.join("");
   };
 
@@ -986,15 +993,19 @@ function initRandomAddModal() {
     }
   };
 
-  const loadDecks = async () => {
+  const loadDecks = async ({ more = false } = {}) => {
     if (isLoading) return;
     isLoading = true;
     setHint("Loading decks…");
     if (deckSelect) deckSelect.disabled = true;
     if (submitBtn) submitBtn.disabled = true;
     try {
-      const data = await api(PATHS.flashcardDecks, "GET");
-      decks = Array.isArray(data) ? data : [];
+      const page = await apiPage(PATHS.flashcardDecks, {
+        cursor: more ? decksCursor : null,
+        pageSize: DECK_PAGE_SIZE,
+      });
+      decks = more ? decks.concat(page.items) : page.items;
+      decksCursor = page.nextCursor;
       populateSelect();
       setHint(decks.length ? defaultHint : "Create a deck first to save words.", decks.length ? null : "error");
     } catch (err) {
@@ -1014,6 +1025,12 @@ function initRandomAddModal() {
     closeModal();
   });
 
+  deckSelect?.addEventListener("change", () => {
+    if (deckSelect.value !== LOAD_MORE_VALUE) return;
+    deckSelect.value = "";
+    loadDecks({ more: true });
+  });
+
   form?.addEventListener("submit", async (event) => {
     event.preventDefault();
     if (!deckSelect || !deckSelect.value) {
@@ -1469,10 +1486,13 @@ function initFlashcardWorkspace(options = {}) {
   if (!deckList || !wordListEl) return null;
 
   let decks = [];
+  let decksCursor = null;
   let activeDeckId = null;
   let filterTerm = "";
   let currentWords = [];
+  let wordsCursor = null;
   let wordFilterTerm = "";
+  let isLoadingMore = false;
 
   const pickTip = () => DEFAULT_TIPS[Math.floor(Math.random() * DEFAULT_TIPS.length)];
 
@@ -1572,6 +1592,9 @@ function initFlashcardWorkspace(options = {}) {
     });
   };
 
+  const loadMoreItem = (attr, label) =>
+    `<li class="list-more"><button class="btn ghost" type="button" ${attr}>${label}</button></li>`;
+
   const renderDecks = () => {
     const term = filterTerm.trim().toLowerCase();
     let items = decks;
@@ -1582,8 +1605,9 @@ function initFlashcardWorkspace(options = {}) {
       });
     }
 
+    const more = decksCursor ? loadMoreItem("data-load-more-decks", "Load more decks") : "";
     if (!items.length) {
-      deckList.innerHTML = "";
+      deckList.innerHTML = more;
       if (emptyState) {
         emptyState.hidden = false;
         emptyState.textContent = decks.length
@@ -1610,27 +1634,28 @@ function initFlashcardWorkspace(options = {}) {
           </li>
         `;
       })
-      .join("");
+      .join("") + more;
   };
 
   const renderWords = (words = []) => {
     if (!wordListEl) return;
     const filtered = applyWordFilter(words);
+    const more = wordsCursor ? loadMoreItem("data-load-more-words", "Load more cards") : "";
     if (!words.length) {
       wordListEl.innerHTML = "";
       setPlaceholder("No cards yet. Use Add to create one.");
-    } else if (!filtered.length) {
+    } else if (!filtered.length && !more) {
       wordListEl.innerHTML = "";
       setPlaceholder("No cards match your search.");
     } else {
-      wordListEl.innerHTML = filtered.map((item) => renderFlashcardWordCard(item)).join("");
+      wordListEl.innerHTML = filtered.map((item) => renderFlashcardWordCard(item)).join("") + more;
       wordListEl.hidden = false;
       if (placeholderEl) placeholderEl.hidden = true;
     }
     const count = words.length || 0;
     if (countEl) {
-      const label = count === 1 ? "card" : "cards";
-      countEl.textContent = `${count} ${label}`;
+      const label = count === 1 && !wordsCursor ? "card" : "cards";
+      countEl.textContent = `${count}${wordsCursor ? "+" : ""} ${label}`;
     }
     if (statsWrap) {
       statsWrap.hidden = !activeDeckId;
@@ -1650,20 +1675,45 @@ function initFlashcardWorkspace(options = {}) {
       setPlaceholder("Loading cards…");
     }
     try {
-      const data = await api(PATHS.flashcardDeckWords(deckId), "GET");
-      currentWords = Array.isArray(data) ? data : [];
+      const page = await apiPage(PATHS.flashcardDeckWords(deckId), { pageSize: CARD_PAGE_SIZE });
+      if (deckId !== activeDeckId) return;
+      currentWords = page.items;
+      wordsCursor = page.nextCursor;
       renderWords(currentWords);
     } catch (err) {
       console.error("Failed to load cards:", err);
       currentWords = [];
+      wordsCursor = null;
       setPlaceholder(err.message || "Failed to load cards.");
     }
   };
 
+  const loadMoreWords = async () => {
+    const deckId = activeDeckId;
+    if (!deckId || !wordsCursor || isLoadingMore) return;
+    isLoadingMore = true;
+    try {
+      const page = await apiPage(PATHS.flashcardDeckWords(deckId), {
+        cursor: wordsCursor,
+        pageSize: CARD_PAGE_SIZE,
+      });
+      if (deckId !== activeDeckId) return;
+      currentWords = currentWords.concat(page.items);
+      wordsCursor = page.nextCursor;
+      renderWords(currentWords);
+    } catch (err) {
+      console.error("Failed to load cards:", err);
+    } finally {
+      isLoadingMore = false;
+    }
+  };
+
   const selectDeck = (deckId) => {
     const deck = decks.find((item) => item.id === deckId);
     if (!deck) return;
     activeDeckId = deckId;
+    currentWords = [];
+    wordsCursor = null;
     resetWordSearch();
     updateHead(deck);
     renderDecks();
@@ -1673,6 +1723,7 @@ function initFlashcardWorkspace(options = {}) {
   const clearSelection = () => {
     activeDeckId = null;
     currentWords = [];
+    wordsCursor = null;
     resetWordSearch();
     if (wordListEl) {
       wordListEl.innerHTML = "";
@@ -1681,10 +1732,26 @@ function initFlashcardWorkspace(options = {}) {
     updateHead(null);
   };
 
+  const loadMoreDecks = async () => {
+    if (!decksCursor || isLoadingMore) return;
+    isLoadingMore = true;
+    try {
+      const page = await apiPage(PATHS.flashcardDecks, { cursor: decksCursor, pageSize: DECK_PAGE_SIZE });
+      decks = decks.concat(page.items);
+      decksCursor = page.nextCursor;
+      renderDecks();
+    } catch (err) {
+      console.error("Failed to load decks:", err);
+    } finally {
+      isLoadingMore = false;
+    }
+  };
+
   const loadDecks = async (autoSelect = true) => {
     try {
-      const data = await api(PATHS.flashcardDecks, "GET");
-      decks = Array.isArray(data) ? data : [];
+      const page = await apiPage(PATHS.flashcardDecks, { pageSize: DECK_PAGE_SIZE });
+      decks = page.items;
+      decksCursor = page.nextCursor;
       renderDecks();
       if (!decks.length) {
         clearSelection();
@@ -1809,6 +1876,10 @@ function initFlashcardWorkspace(options = {}) {
 
   if (wordListEl) {
     wordListEl.addEventListener("click", (event) => {
+      if (event.target.closest("[data-load-more-words]")) {
+        loadMoreWords();
+        return;
+      }
       const editBtn = event.target.closest(".word-card-edit");
       if (editBtn) {
         const card = editBtn.closest(".word-card");
@@ -1838,6 +1909,10 @@ function initFlashcardWorkspace(options = {}) {
   }
 
   deckList.addEventListener("click", (event) => {
+    if (event.target.closest("[data-load-more-decks]")) {
+      loadMoreDecks();
+      return;
+    }
     const item = event.target.closest(".deck-item");
     if (!item) return;
     const deckId = Number(item.dataset.deckId);
@@ -2017,7 +2092,11 @@ function initDeckImportModal(options = {}) {
 
     try {
       const deck = await api(PATHS.flashcardImport, "POST", formData);
-      setHint(`Imported “${deck.title}”`, "success");
+      const skipped = Array.isArray(deck.errors) ? deck.errors.length : 0;
+      setHint(
+        skipped ? `Imported “${deck.title}” (${skipped} rows skipped)` : `Imported “${deck.title}”`,
+        "success"
+      );
       if (typeof onDeckImported === "function") {
         onDeckImported(deck);
       }
@@ -6,6 +6,7 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from authx import TokenPayload
 from routers import (
+    admin as admin_router,
     auth as auth_router,
     user as user_router,
     random as random_router,
@@ -15,25 +16,48 @@ from routers import (
     flashcard as flashcard_router,
     words as words_router
 )
-from routers.auth import security
-from core.database import get_db
+from routers.auth import current_user, security
+from core import corpus, spelling
+from core.config import settings
+from core.database import Database, engine_report, get_database
+from core.password_hashing import password_hash_pool
+from core.http_client import create_http_client
+from repositories.user_repo import UserProfile, UserRepository
+from repositories.user_stats_repo import UserStatsRepository
+from services import scheduler
+from services.refresh_token_gc import run_refresh_token_gc
 from services.flashcard_service import FlashcardService
-from services.word_services import WordServices
 from services.wordle_services import WordleServices
 from fastapi_utils.tasks import repeat_every
-from models.user import User
 from contextlib import asynccontextmanager
 import uvicorn, asyncio
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    task = asyncio.create_task(background_task())
+    corpus.load_all()
+    if settings.PRELOAD_SPELLCHECKERS:
+        await asyncio.to_thread(spelling.preload)
+    app.state.http_client = create_http_client()
+    if settings.DB_REPORT_ON_STARTUP:
+        for line in await engine_report():
+            print(f"Database {line}")
+    tasks = [
+        asyncio.create_task(daily_reset_task()),
+        asyncio.create_task(stats_reconcile_task()),
+        asyncio.create_task(counter_flush_task()),
+        asyncio.create_task(refresh_token_gc_task()),
+    ]
     yield
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await asyncio.to_thread(flush_user_counters)
+    await asyncio.to_thread(password_hash_pool.shutdown)
+    await app.state.http_client.aclose()
 
 
 app = FastAPI(title="LanguageApp", lifespan=lifespan)
@@ -58,6 +82,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(admin_router.router)
 app.include_router(auth_router.router)
 app.include_router(user_router.router)
 app.include_router(random_router.router)
@@ -73,28 +98,69 @@ LANG_DISPLAY = {
 }
 VALID_LANGS = set(LANG_DISPLAY.keys())
 
-async def background_task():
+def reset_daily_counters(db: Session) -> int:
+    repo = UserRepository(db)
+    # Write out clicks buffered before the reset so they are zeroed too.
+    repo.flush_counters()
+    return repo.reset_random_session_words(chunk_size=settings.DAILY_RESET_CHUNK_SIZE)
+
+
+async def daily_reset_task():
+    await scheduler.run_daily(
+        "daily_reset",
+        reset_daily_counters,
+        hour=settings.DAILY_RESET_HOUR_UTC,
+        jitter_seconds=settings.DAILY_RESET_JITTER_SECONDS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        retry_seconds=settings.JOB_RETRY_SECONDS,
+    )
+
+def reconcile_user_stats() -> int:
+    from core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return UserStatsRepository(db).reconcile(chunk_size=settings.STATS_RECONCILE_CHUNK_SIZE)
+    finally:
+        db.close()
+
+
+async def stats_reconcile_task():
+    while True:
+        await asyncio.sleep(settings.STATS_RECONCILE_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(reconcile_user_stats)
+        except Exception as e:
+            print(f"User stats reconciliation failed: {e}")
+
+def flush_user_counters() -> int:
     from core.database import SessionLocal
-    from models.user import User
 
+    db = SessionLocal()
+    try:
+        return UserRepository(db).flush_counters()
+    finally:
+        db.close()
+
+
+async def counter_flush_task():
+    while True:
+        await asyncio.sleep(settings.COUNTER_FLUSH_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(flush_user_counters)
+        except Exception as e:
+            print(f"Counter flush failed: {e}")
+
+async def refresh_token_gc_task():
     while True:
-        await asyncio.sleep(86400)
-        db = SessionLocal()
+        await asyncio.sleep(settings.REFRESH_TOKEN_GC_INTERVAL_SECONDS)
         try:
-            users = db.query(User).all()
-            for user in users:
-                try:
-                    WordServices(db).refresh_random(user_id=user.id)
-                except Exception as e:
-                    print(f"Error for user {user.id}: {e}")
-        finally:
-            db.close()
-
-def resolve_profile_lang(db: Session, user_id: int | None) -> str:
-    if user_id is None:
-        return "en"
-    user = db.get(User, user_id)
-    candidate = (user.random_word_lang if user else None) or "en"
+            await asyncio.to_thread(run_refresh_token_gc)
+        except Exception as e:
+            print(f"Refresh token GC failed: {e}")
+
+def resolve_profile_lang(user: UserProfile) -> str:
+    candidate = user.random_word_lang or "en"
     candidate = candidate.lower()
     return candidate if candidate in VALID_LANGS else "en"
 
@@ -103,7 +169,7 @@ def resolve_profile_lang(db: Session, user_id: int | None) -> str:
 async def dashboard(
     request: Request,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     try:
         user_id = int(payload.sub)
@@ -112,8 +178,8 @@ async def dashboard(
 
     total_cards = 0
     if user_id is not None:
-        svc = FlashcardService(db)
-        total_cards = svc.count_user_cards(user_id)
+        svc = db.service(FlashcardService)
+        total_cards = await svc.count_user_cards(user_id)
 
     return templates.TemplateResponse(
         "home.html",
@@ -128,11 +194,11 @@ async def random_page(request: Request):
 async def wordle_page(
     request: Request,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = WordleServices(db)
-    stats = svc.get_stats(user_id=user_id)
+    svc = db.service(WordleServices)
+    stats = await svc.get_stats(user_id=user_id)
     return templates.TemplateResponse(
         "wordle.html",
         {"request": request, "active_page": "wordle", "wordle_stats": stats},
@@ -141,14 +207,9 @@ async def wordle_page(
 @app.get("/word-chain", response_class=HTMLResponse, name="word_chain_page")
 async def word_chain_page(
     request: Request,
-    payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    user: UserProfile = Depends(current_user),
 ):
-    try:
-        user_id = int(payload.sub)
-    except (TypeError, ValueError):
-        user_id = None
-    lang_code = resolve_profile_lang(db, user_id)
+    lang_code = resolve_profile_lang(user)
     lang_label = LANG_DISPLAY.get(lang_code, LANG_DISPLAY["en"])
     return templates.TemplateResponse(
         "word_chain.html",
@@ -167,12 +228,13 @@ async def auth_page(request: Request):
 async def flashcard_page(
     request: Request,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    total_cards = svc.count_user_cards(user_id)
-    due_cards = svc.count_due_cards(user_id)
+    svc = db.service(FlashcardService)
+    stats = await svc.get_user_stats(user_id)
+    total_cards = stats["total_cards"]
+    due_cards = stats["due_cards"]
     return templates.TemplateResponse(
         "flashcard.html",
         {"request": request, "active_page": "flashcard", "total_cards": total_cards, "due_cards": due_cards},
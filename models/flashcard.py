@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, UniqueConstraint
 from core.database import Base
 
 
@@ -6,12 +6,14 @@ class FlashcardDecks(Base):
     __tablename__ = "cardDecks"
     __table_args__ = (
         UniqueConstraint("user_id", "title", name="uq_card_decks_user_title"),
+        Index("ix_cardDecks_user_lang", "user_id", "lang"),
+        Index("ix_cardDecks_user_id_id", "user_id", "id"),
     )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(50), nullable=False, index=True)
-    description = Column(String(50), nullable=False, index=True)
-    category = Column(String(50), nullable=True, index=True)
-    lang = Column(String(10), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    title = Column(String(50), nullable=False)
+    description = Column(String(50), nullable=False)
+    category = Column(String(50), nullable=True)
+    lang = Column(String(10), nullable=False)
  
\ No newline at end of file
@@ -1,17 +1,28 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint, DateTime
+from sqlalchemy import Column, ForeignKey, Float, Index, Integer, String, UniqueConstraint, DateTime
 from datetime import datetime
+from random import random
 
 from core.database import Base
 
 
 class FlashcardWordList(Base):
     __tablename__ = "flashcard_words"
-    __table_args__ = (UniqueConstraint("deck_id", "word", name="uq_flashcard_words_deck_word"),)
+    __table_args__ = (
+        UniqueConstraint("deck_id", "word", name="uq_flashcard_words_deck_word"),
+        Index("ix_flashcard_words_deck_id_id", "deck_id", "id"),
+        Index("ix_flashcard_words_deck_due_sample", "deck_id", "due_at", "difficulty", "sample_key"),
+    )
 
     id = Column(Integer, primary_key=True)
-    deck_id = Column(Integer, ForeignKey("cardDecks.id", ondelete="CASCADE"), nullable=False, index=True)
-    word = Column(String(50), nullable=False, index=True)
-    definition = Column(String(255), nullable=False, index=True)
-    example = Column(String(255), nullable=True, index=True)
-    difficulty = Column(String(50), nullable=True, index=True)
+    deck_id = Column(Integer, ForeignKey("cardDecks.id", ondelete="CASCADE"), nullable=False)
+    word = Column(String(50), nullable=False)
+    definition = Column(String(255), nullable=False)
+    example = Column(String(255), nullable=True)
+    difficulty = Column(String(50), nullable=True)
     last_review = Column(DateTime, default=datetime.utcnow, nullable=True)
+    due_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    interval_days = Column(Integer, nullable=False, default=0, server_default="0")
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
+    # Uniform random position used to sample session cards without ORDER BY RANDOM().
+    sample_key = Column(Float, nullable=False, default=random)
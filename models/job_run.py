@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+
+from core.database import Base
+
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+
+    name = Column(String(64), primary_key=True)
+    last_run_at = Column(DateTime, nullable=True)
+    # Lease held by the worker currently running the job; expired leases can be taken over.
+    locked_by = Column(String(128), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
@@ -1,15 +1,17 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, UniqueConstraint
 from core.database import Base
 
 class WordList(Base):
     __tablename__ = "user_words"
     __table_args__ = (
         UniqueConstraint("user_id", "word", name="uq_user_words_user_word"),
+        Index("ix_user_words_user_lang_id", "user_id", "lang", "id"),
+        Index("ix_user_words_user_lang_status_id", "user_id", "lang", "status", "id"),
     )
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    word = Column(String(50), nullable=False, index=True)
-    status = Column(String(50), nullable=False, index=True)
-    translate = Column(String(50), nullable=True, index=True)
-    comment = Column(String(50), nullable=True, index=True)
-    lang = Column(String(50), nullable=False, index=True)
\ No newline at end of file
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    word = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False)
+    translate = Column(String(50), nullable=True)
+    comment = Column(String(50), nullable=True)
+    lang = Column(String(50), nullable=False)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, false
+
+from core.database import Base
+
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_cards = Column(Integer, nullable=False, default=0, server_default="0")
+    cards_unrated = Column(Integer, nullable=False, default=0, server_default="0")
+    cards_easy = Column(Integer, nullable=False, default=0, server_default="0")
+    cards_medium = Column(Integer, nullable=False, default=0, server_default="0")
+    cards_hard = Column(Integer, nullable=False, default=0, server_default="0")
+    due_cards = Column(Integer, nullable=False, default=0, server_default="0")
+    # due_cards is exact until this moment, when the next card becomes due.
+    due_valid_until = Column(DateTime, nullable=True)
+    words_easy = Column(Integer, nullable=False, default=0, server_default="0")
+    words_ok = Column(Integer, nullable=False, default=0, server_default="0")
+    words_hard = Column(Integer, nullable=False, default=0, server_default="0")
+    stale = Column(Boolean, nullable=False, default=False, server_default=false())
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
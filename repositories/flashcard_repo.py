@@ -1,14 +1,27 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
+
+from core.pagination import keyset_by_id
 from models.flashcard import FlashcardDecks
 from models.flashcardWordList import FlashcardWordList
+from repositories.user_stats_repo import UserStatsRepository
 
 
 class DeckRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.stats = UserStatsRepository(db)
 
-    def save_deck(self, *, user_id: int, title: str, description: str, category: str | None, lang: str) -> FlashcardDecks:
+    def save_deck(
+        self,
+        *,
+        user_id: int,
+        title: str,
+        description: str,
+        category: str | None,
+        lang: str,
+        commit: bool = True,
+    ) -> FlashcardDecks:
         stmt = select(FlashcardDecks).where(
             FlashcardDecks.user_id == user_id,
             FlashcardDecks.title == title,
@@ -31,18 +44,22 @@ class DeckRepository:
             self.db.add(entity)
         entity.lang = lang
 
+        if not commit:
+            self.db.flush()
+            return entity
         self.db.commit()
         self.db.refresh(entity)
         return entity
 
-    def list_decks(self, user_id: int) -> list[FlashcardDecks]:
-        stmt = (
-            select(FlashcardDecks)
-            .where(FlashcardDecks.user_id == user_id)
-            .order_by(FlashcardDecks.id.desc())
-        )
+    def list_decks(self, user_id: int, *, limit: int | None = None, before_id: int | None = None) -> list[FlashcardDecks]:
+        stmt = select(FlashcardDecks).where(FlashcardDecks.user_id == user_id)
+        stmt = keyset_by_id(stmt, FlashcardDecks.id, before_id=before_id, limit=limit)
         return list(self.db.execute(stmt).scalars())
 
+    def count_decks(self, user_id: int) -> int:
+        stmt = select(func.count(FlashcardDecks.id)).where(FlashcardDecks.user_id == user_id)
+        return self.db.execute(stmt).scalar_one()
+
     def get_deck(self, deck_id: int, user_id: int) -> FlashcardDecks | None:
         stmt = select(FlashcardDecks).where(
             FlashcardDecks.id == deck_id,
@@ -64,6 +81,7 @@ class DeckRepository:
             return False
         self.db.execute(delete(FlashcardWordList).where(FlashcardWordList.deck_id == deck_id))
         self.db.delete(deck)
+        self.stats.invalidate(user_id)
         self.db.commit()
         return True
 
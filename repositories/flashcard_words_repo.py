@@ -1,15 +1,26 @@
-from datetime import datetime, timedelta
-from sqlalchemy import select, func, or_, delete
+from datetime import datetime
+from random import random, shuffle
+from typing import Iterable, Iterator
+
+from sqlalchemy import Row, and_, case, select, func
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from core.database import upsert_insert
+from core.pagination import keyset_by_id
 from models.flashcardWordList import FlashcardWordList
 from models.flashcard import FlashcardDecks
+from repositories.user_stats_repo import UserStatsRepository
+from services.spaced_repetition import ReviewState, schedule_review
 
 
 class FlashcardWordRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.stats = UserStatsRepository(db)
+
+    def _deck_owner(self, deck_id: int) -> int | None:
+        return self.db.execute(select(FlashcardDecks.user_id).where(FlashcardDecks.id == deck_id)).scalar_one_or_none()
 
     def save_word(
         self,
@@ -26,11 +37,26 @@ class FlashcardWordRepository:
         )
         entity = self.db.execute(stmt).scalar_one_or_none()
 
+        owner = self._deck_owner(deck_id)
         if entity:
             entity.definition = definition
             entity.example = example
             if difficulty is not None:
+                old_difficulty, old_due_at = entity.difficulty, entity.due_at
+                # A changed rating is an answer, so the card moves in the
+                # schedule as it would through update_difficulty; saving the
+                # same rating again leaves its progress alone.
+                if (old_difficulty or "").lower() != difficulty.lower():
+                    self._reschedule(entity, difficulty.lower(), datetime.utcnow())
                 entity.difficulty = difficulty
+                if owner is not None:
+                    self.stats.on_card_changed(
+                        owner,
+                        old_difficulty=old_difficulty,
+                        new_difficulty=difficulty,
+                        old_due_at=old_due_at,
+                        new_due_at=entity.due_at,
+                    )
         else:
             entity = FlashcardWordList(
                 deck_id=deck_id,
@@ -38,17 +64,124 @@ class FlashcardWordRepository:
                 definition=definition,
                 example=example,
                 difficulty=difficulty,
+                due_at=datetime.utcnow(),
             )
             self.db.add(entity)
+            if owner is not None:
+                self.stats.on_card_added(owner, difficulty=difficulty, due_at=entity.due_at)
 
         self.db.commit()
         self.db.refresh(entity)
         return entity
 
-    def get_words_by_deck_id(self, deck_id: int) -> list[FlashcardWordList]:
-        stmt = select(FlashcardWordList).where(FlashcardWordList.deck_id == deck_id).order_by(FlashcardWordList.id.desc())
+    def bulk_upsert_words(
+        self,
+        *,
+        deck_id: int,
+        rows: Iterable[dict[str, str | None]],
+        batch_size: int = 500,
+        commit: bool = True,
+    ) -> dict[str, int]:
+        stmt = upsert_insert(self.db)(FlashcardWordList)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FlashcardWordList.deck_id, FlashcardWordList.word],
+            set_={
+                "definition": stmt.excluded.definition,
+                "example": stmt.excluded.example,
+                "difficulty": func.coalesce(stmt.excluded.difficulty, FlashcardWordList.difficulty),
+            },
+        )
+        existing = set(
+            self.db.execute(
+                select(FlashcardWordList.word).where(FlashcardWordList.deck_id == deck_id)
+            ).scalars()
+        )
+        counts = {"created": 0, "updated": 0}
+
+        def flush(batch: dict[str, dict[str, str | None]]) -> None:
+            for word in batch:
+                if word in existing:
+                    counts["updated"] += 1
+                else:
+                    counts["created"] += 1
+                    existing.add(word)
+            self.db.execute(stmt, list(batch.values()))
+
+        # Collapse duplicates the same way repeated save_word calls would:
+        # the last row wins, but an empty difficulty keeps the previous one.
+        # ON CONFLICT cannot touch the same row twice in one statement.
+        batch: dict[str, dict[str, str | None]] = {}
+        for row in rows:
+            previous = batch.get(row["word"])
+            difficulty = row.get("difficulty")
+            if difficulty is None and previous is not None:
+                difficulty = previous["difficulty"]
+            batch[row["word"]] = {
+                "deck_id": deck_id,
+                "word": row["word"],
+                "definition": row["definition"],
+                "example": row.get("example"),
+                "difficulty": difficulty,
+                "last_review": datetime.utcnow(),
+            }
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = {}
+        if batch:
+            flush(batch)
+
+        owner = self._deck_owner(deck_id)
+        if owner is not None:
+            self.stats.invalidate(owner)
+        if commit:
+            self.db.commit()
+        return counts
+
+    def get_words_by_deck_id(
+        self,
+        deck_id: int,
+        *,
+        limit: int | None = None,
+        before_id: int | None = None,
+    ) -> list[FlashcardWordList]:
+        stmt = select(FlashcardWordList).where(FlashcardWordList.deck_id == deck_id)
+        stmt = keyset_by_id(stmt, FlashcardWordList.id, before_id=before_id, limit=limit)
         return list(self.db.execute(stmt).scalars())
 
+    def count_words_in_deck(self, deck_id: int) -> int:
+        stmt = select(func.count(FlashcardWordList.id)).where(FlashcardWordList.deck_id == deck_id)
+        return self.db.execute(stmt).scalar_one()
+
+    def iter_export_rows(
+        self,
+        *,
+        user_id: int,
+        deck_id: int | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """Yield (deck title, lang, word, definition, example, difficulty) rows.
+
+        ``yield_per`` keeps a server-side cursor open where the driver supports
+        one, so only ``batch_size`` rows are buffered at a time.
+        """
+        stmt = (
+            select(
+                FlashcardDecks.title,
+                FlashcardDecks.lang,
+                FlashcardWordList.word,
+                FlashcardWordList.definition,
+                FlashcardWordList.example,
+                FlashcardWordList.difficulty,
+            )
+            .join(FlashcardDecks, FlashcardDecks.id == FlashcardWordList.deck_id)
+            .where(FlashcardDecks.user_id == user_id)
+            .order_by(FlashcardDecks.id.desc(), FlashcardWordList.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        if deck_id is not None:
+            stmt = stmt.where(FlashcardWordList.deck_id == deck_id)
+        yield from self.db.execute(stmt)
+
     def delete_word(self, *, deck_id: int, word_id: int) -> bool:
         stmt = select(FlashcardWordList).where(
             FlashcardWordList.id == word_id,
@@ -58,6 +191,9 @@ class FlashcardWordRepository:
         if entity is None:
             return False
 
+        owner = self._deck_owner(deck_id)
+        if owner is not None:
+            self.stats.on_card_removed(owner, difficulty=entity.difficulty, due_at=entity.due_at)
         self.db.delete(entity)
         self.db.commit()
         return True
@@ -88,6 +224,12 @@ class FlashcardWordRepository:
         self.db.refresh(entity)
         return entity
 
+    def _user_deck_ids(self, user_id: int, lang: str | None = None):
+        stmt = select(FlashcardDecks.id).where(FlashcardDecks.user_id == user_id)
+        if lang is not None:
+            stmt = stmt.where(FlashcardDecks.lang == lang)
+        return stmt.scalar_subquery()
+
     def count_words_for_user(self, user_id: int) -> int:
         stmt = (
             select(func.count(FlashcardWordList.id))
@@ -96,24 +238,61 @@ class FlashcardWordRepository:
         )
         return self.db.execute(stmt).scalar_one()
 
-    def count_due_cards(self, deck_ids: list[int]) -> int:
-        if not deck_ids:
-            return 0
-        cutoff = datetime.utcnow() - timedelta(days=3)
+    def count_due_cards(self, user_id: int) -> int:
         stmt = (
             select(func.count(FlashcardWordList.id))
-            .where(FlashcardWordList.deck_id.in_(deck_ids))
-            .where(
-                or_(
-                    FlashcardWordList.last_review.is_(None),
-                    FlashcardWordList.last_review <= cutoff,
-                    FlashcardWordList.difficulty == "hard",
-                    FlashcardWordList.difficulty.is_(None),
-                )
-            )
+            .where(FlashcardWordList.deck_id.in_(self._user_deck_ids(user_id)))
+            .where(FlashcardWordList.due_at <= datetime.utcnow())
         )
         return self.db.execute(stmt).scalar_one()
 
+    def get_deck_stats(self, user_id: int) -> list[Row]:
+        """Return (deck_id, title, lang, total, due) for every deck of the user.
+
+        The counts are correlated subqueries rather than a join + GROUP BY, so
+        the decks are read newest-first straight off (user_id, id) and each
+        count is a range read of (deck_id, due_at) with nothing to sort.
+        """
+        def card_count(*criteria):
+            return (
+                select(func.count())
+                .select_from(FlashcardWordList)
+                .where(FlashcardWordList.deck_id == FlashcardDecks.id, *criteria)
+                .correlate(FlashcardDecks)
+                .scalar_subquery()
+            )
+
+        stmt = (
+            select(
+                FlashcardDecks.id.label("deck_id"),
+                FlashcardDecks.title,
+                FlashcardDecks.lang,
+                card_count().label("total"),
+                card_count(FlashcardWordList.due_at <= datetime.utcnow()).label("due"),
+            )
+            .where(FlashcardDecks.user_id == user_id)
+            .order_by(FlashcardDecks.id.desc())
+        )
+        return list(self.db.execute(stmt))
+
+    def _reschedule(self, entity: FlashcardWordList, grade: str | None, now: datetime) -> None:
+        state = schedule_review(
+            ReviewState(
+                due_at=entity.due_at or now,
+                interval_days=entity.interval_days or 0,
+                ease=entity.ease or 2.5,
+                repetitions=entity.repetitions or 0,
+            ),
+            grade,
+            now,
+        )
+        entity.due_at = state.due_at
+        entity.interval_days = state.interval_days
+        entity.ease = state.ease
+        entity.repetitions = state.repetitions
+        entity.last_review = now
+        entity.sample_key = random()
+
     def update_difficulty(
         self,
         *,
@@ -130,33 +309,67 @@ class FlashcardWordRepository:
             return None
         normalized_current = (entity.difficulty or "").lower() or None
         normalized_new = (difficulty or "").lower() or None
+        old_due_at = entity.due_at
 
         if normalized_new == "easy" and normalized_current in {None, "hard"}:
             entity.difficulty = "medium"
         else:
             entity.difficulty = normalized_new
-        entity.last_review = datetime.utcnow()
+
+        self._reschedule(entity, normalized_new, datetime.utcnow())
+
+        owner = self._deck_owner(deck_id)
+        if owner is not None:
+            self.stats.on_card_changed(
+                owner,
+                old_difficulty=normalized_current,
+                new_difficulty=entity.difficulty,
+                old_due_at=old_due_at,
+                new_due_at=entity.due_at,
+            )
         self.db.commit()
         self.db.refresh(entity)
         return entity
 
+    def get_session_words_for_lang(self, *, user_id: int, lang: str, limit: int = 10) -> list[FlashcardWordList]:
+        return self._sample_session(self._user_deck_ids(user_id, lang), limit)
+
     def get_session_words_by_decks(self, deck_ids: list[int], limit: int = 10) -> list[FlashcardWordList]:
         if not deck_ids:
             return []
+        return self._sample_session(deck_ids, limit)
 
-        cutoff = datetime.utcnow() - timedelta(days=3)
-        stmt = (
-            select(FlashcardWordList)
-            .where(FlashcardWordList.deck_id.in_(deck_ids))
+    def _sample_session(self, deck_ids, limit: int) -> list[FlashcardWordList]:
+        """Sample up to ``limit`` due cards, hard first, then unrated, then the rest.
+
+        One statement covers every deck: the inner select range-scans
+        ``ix_flashcard_words_deck_due_sample`` (deck_id, due_at, difficulty,
+        sample_key) for due cards only, never touching the table, and keeps
+        the first ``limit`` ids by (tier, key from a random pivot, wrapping
+        around once). The sort is a top-N over due cards; cards that are not
+        due yet are never read. Within a tier a card's chance of being picked
+        is proportional to the gap in ``sample_key`` below it, which is random
+        but not equal across cards; every due card can be reached. The final
+        list is shuffled so hard cards are not always shown first.
+        """
+        pivot = random()
+        tier = case(
+            (FlashcardWordList.difficulty == "hard", 0),
+            (FlashcardWordList.difficulty.is_(None), 1),
+            else_=2,
+        )
+        wrapped = case((FlashcardWordList.sample_key >= pivot, 0), else_=1)
+        picked_ids = (
+            select(FlashcardWordList.id)
             .where(
-                or_(
-                    FlashcardWordList.last_review.is_(None),
-                    FlashcardWordList.last_review <= cutoff,
-                    FlashcardWordList.difficulty == "hard",
-                    FlashcardWordList.difficulty.is_(None),
-                )
+                FlashcardWordList.deck_id.in_(deck_ids),
+                FlashcardWordList.due_at <= datetime.utcnow(),
             )
-            .order_by(func.random())
+            .order_by(tier, wrapped, FlashcardWordList.sample_key)
             .limit(limit)
         )
-        return list(self.db.execute(stmt).scalars())
+        picked = list(
+            self.db.execute(select(FlashcardWordList).where(FlashcardWordList.id.in_(picked_ids))).scalars()
+        )
+        shuffle(picked)
+        return picked
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.job_run import JobRun
+
+
+class JobRunRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_or_create(self, name: str, *, last_run_at: datetime | None = None) -> JobRun:
+        job = self.db.get(JobRun, name)
+        if job is not None:
+            return job
+        self.db.add(JobRun(name=name, last_run_at=last_run_at))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Another worker created it first.
+            self.db.rollback()
+        return self.db.get(JobRun, name)
+
+    def try_acquire(self, name: str, *, owner: str, lease_seconds: int) -> bool:
+        now = datetime.utcnow()
+        stmt = (
+            update(JobRun)
+            .where(
+                JobRun.name == name,
+                or_(JobRun.locked_until.is_(None), JobRun.locked_until < now),
+            )
+            .values(locked_by=owner, locked_until=now + timedelta(seconds=lease_seconds))
+        )
+        acquired = self.db.execute(stmt).rowcount == 1
+        self.db.commit()
+        return acquired
+
+    def renew(self, name: str, *, owner: str, lease_seconds: int) -> bool:
+        """Extend a lease ``owner`` still holds; False once it has been lost."""
+        stmt = (
+            update(JobRun)
+            .where(JobRun.name == name, JobRun.locked_by == owner)
+            .values(locked_until=datetime.utcnow() + timedelta(seconds=lease_seconds))
+        )
+        renewed = self.db.execute(stmt).rowcount == 1
+        self.db.commit()
+        return renewed
+
+    def release(self, name: str, *, owner: str) -> None:
+        stmt = (
+            update(JobRun)
+            .where(JobRun.name == name, JobRun.locked_by == owner)
+            .values(locked_by=None, locked_until=None)
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def last_run_at(self, name: str) -> datetime | None:
+        return self.db.execute(select(JobRun.last_run_at).where(JobRun.name == name)).scalar_one_or_none()
+
+    def mark_run(self, name: str, *, at: datetime) -> None:
+        self.db.execute(update(JobRun).where(JobRun.name == name).values(last_run_at=at))
+        self.db.commit()
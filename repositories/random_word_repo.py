@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import String, func, literal, select, union_all
+
+from core.pagination import keyset_by_id
 from models.randomWordList import WordList
+from repositories.user_stats_repo import UserStatsRepository
 
 
 class WordRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.stats = UserStatsRepository(db)
 
     def save_user_word(self, *, user_id: int, word: str, status: str, translate: str, comment: str, lang: str) -> WordList:
         stmt = select(WordList).where(
@@ -14,6 +18,7 @@ class WordRepository:
         )
         existing = self.db.execute(stmt).scalar_one_or_none()
 
+        old_status = existing.status if existing else None
         if existing:
             existing.status = status
             if translate is not None:
@@ -26,6 +31,7 @@ class WordRepository:
         else:
             entity = WordList(user_id=user_id, word=word, status=status, translate=translate, comment=comment, lang=lang)
             self.db.add(entity)
+        self.stats.on_word_status_changed(user_id, old_status=old_status, new_status=status)
 
         self.db.commit()
         self.db.refresh(entity)
@@ -54,17 +60,26 @@ class WordRepository:
         self.db.refresh(entity)
         return entity
 
-    def get_all_words(self, user_id: int, limit: int = 10, lang: str | None = None) -> list[WordList]:
-        stmt = (
-            select(WordList)
-            .where(WordList.user_id == user_id)
-            .order_by(WordList.id.desc())
-            .limit(limit)
-        )
+    def get_all_words(
+        self,
+        user_id: int,
+        limit: int = 10,
+        lang: str | None = None,
+        *,
+        before_id: int | None = None,
+    ) -> list[WordList]:
+        stmt = select(WordList).where(WordList.user_id == user_id)
         if lang:
             stmt = stmt.where(WordList.lang == lang)
+        stmt = keyset_by_id(stmt, WordList.id, before_id=before_id, limit=limit)
         return list(self.db.execute(stmt).scalars())
 
+    def count_words(self, user_id: int, lang: str | None = None) -> int:
+        stmt = select(func.count(WordList.id)).where(WordList.user_id == user_id)
+        if lang:
+            stmt = stmt.where(WordList.lang == lang)
+        return self.db.execute(stmt).scalar_one()
+
     def get_words_by_status(self, user_id: int, status: str, limit: int = 10, lang: str | None = None) -> list[WordList]:
         stmt = (
             select(WordList)
@@ -78,3 +93,43 @@ class WordRepository:
         if lang:
             stmt = stmt.where(WordList.lang == lang)
         return list(self.db.execute(stmt).scalars())
+
+    def get_library_buckets(
+        self,
+        user_id: int,
+        *,
+        buckets: dict[str, tuple[str | None, int | None]],
+        limit: int = 10,
+        lang: str | None = None,
+    ) -> dict[str, list[WordList]]:
+        """Fetch several library buckets in one round trip.
+
+        ``buckets`` maps a bucket name to ``(status, before_id)``; a status of
+        None means "any status". Every bucket becomes its own keyset branch
+        (``id < before_id ORDER BY id DESC LIMIT n``) served by the
+        (user_id, lang[, status], id) indexes, and the branches are glued
+        together with UNION ALL. Up to ``limit + 1`` rows are returned per
+        bucket so callers can tell whether another page exists.
+        """
+        branches = []
+        for name, (status, before_id) in buckets.items():
+            stmt = select(WordList.id.label("id"), literal(name, String).label("bucket")).where(WordList.user_id == user_id)
+            if lang:
+                stmt = stmt.where(WordList.lang == lang)
+            if status is not None:
+                stmt = stmt.where(WordList.status == status)
+            stmt = keyset_by_id(stmt, WordList.id, before_id=before_id, limit=limit + 1)
+            branches.append(select(stmt.subquery()))
+
+        result: dict[str, list[WordList]] = {name: [] for name in buckets}
+        if not branches:
+            return result
+        page = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery()
+        stmt = select(WordList, page.c.bucket).join(page, page.c.id == WordList.id)
+        for entity, name in self.db.execute(stmt):
+            result[name].append(entity)
+        # At most limit + 1 rows per bucket: ordering them here keeps the
+        # database from sorting the joined rows in a temporary B-tree.
+        for entities in result.values():
+            entities.sort(key=lambda entity: entity.id, reverse=True)
+        return result
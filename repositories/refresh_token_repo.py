@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 
-from sqlalchemy import delete, select
+from sqlalchemy import and_, delete, func, or_, select
 from sqlalchemy.orm import Session
 
+from core.token_cache import build_refresh_token_cache
 from models.refresh_token import RefreshToken
 
 
+revocation_cache = build_refresh_token_cache()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 class RefreshTokenRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -20,22 +29,86 @@ class RefreshTokenRepository:
         self.db.add(token)
         self._commit()
         self.db.refresh(token)
+        revocation_cache.remember_active(jti, _as_utc(expires_at))
         return token
 
     def replace_for_user(self, *, user_id: int, jti: str, expires_at: datetime) -> RefreshToken:
+        replaced = self.db.execute(
+            select(RefreshToken.jti, RefreshToken.expires_at).where(RefreshToken.user_id == user_id)
+        ).all()
         self.db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
         self._commit()
+        for old_jti, old_expires_at in replaced:
+            revocation_cache.revoke(old_jti, _as_utc(old_expires_at))
         return self.add(user_id=user_id, jti=jti, expires_at=expires_at)
 
     def get_by_jti(self, jti: str) -> RefreshToken | None:
         return self.db.execute(select(RefreshToken).where(RefreshToken.jti == jti)).scalar_one_or_none()
 
+    def _mark_revoked(self, token: RefreshToken) -> None:
+        token.mark_revoked()
+        self.db.add(token)
+        self._commit()
+        revocation_cache.revoke(token.jti, _as_utc(token.expires_at))
+
     def revoke(self, jti: str) -> None:
         token = self.get_by_jti(jti)
         if token:
-            token.mark_revoked()
-            self.db.add(token)
-            self._commit()
+            self._mark_revoked(token)
+
+    def _stale(self, cutoff: datetime):
+        return or_(
+            RefreshToken.expires_at < cutoff,
+            and_(
+                RefreshToken.revoked.is_(True),
+                or_(RefreshToken.revoked_at.is_(None), RefreshToken.revoked_at < cutoff),
+            ),
+        )
+
+    def count_stale(self, *, cutoff: datetime) -> int:
+        return self.db.execute(select(func.count()).where(self._stale(cutoff))).scalar_one()
+
+    def count_all(self) -> int:
+        return self.db.execute(select(func.count()).select_from(RefreshToken)).scalar_one()
+
+    def delete_stale(self, *, cutoff: datetime, chunk_size: int = 1000, pause_seconds: float = 0.0) -> int:
+        """Delete tokens expired or revoked before ``cutoff`` in id-range batches; return rows deleted.
+
+        Each batch commits on its own and the loop sleeps ``pause_seconds``
+        between batches, so logins and refreshes are never queued behind one
+        long delete.
+        """
+        low, high = self.db.execute(select(func.min(RefreshToken.id), func.max(RefreshToken.id))).one()
+        if low is None:
+            return 0
+        deleted = 0
+        for start in range(low, high + 1, chunk_size):
+            stmt = delete(RefreshToken).where(
+                RefreshToken.id >= start,
+                RefreshToken.id < start + chunk_size,
+                self._stale(cutoff),
+            )
+            deleted += self.db.execute(stmt).rowcount
+            self.db.commit()
+            if pause_seconds:
+                time.sleep(pause_seconds)
+        return deleted
+
+    def compact(self) -> None:
+        """Give space freed by ``delete_stale`` back to the database."""
+        connection = self.db.connection()
+        if connection.dialect.name == "postgresql":
+            # VACUUM cannot run inside a transaction block.
+            self.db.commit()
+            with self.db.get_bind().connect() as autocommit:
+                autocommit.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(
+                    "VACUUM (ANALYZE) refresh_tokens"
+                )
+        elif connection.dialect.name == "sqlite":
+            # Frees pages only with auto_vacuum=INCREMENTAL; otherwise SQLite
+            # reuses them for new rows.
+            connection.exec_driver_sql("PRAGMA incremental_vacuum")
+            self.db.commit()
 
     def assert_active(self, *, jti: str, user_id: int) -> RefreshToken:
         token = self.get_by_jti(jti)
@@ -43,13 +116,10 @@ class RefreshTokenRepository:
         if not token or token.user_id != user_id:
             raise PermissionError("Refresh token is not registered")
         if token.revoked:
+            # Let the blocklist answer replays of this token from the cache.
+            revocation_cache.revoke(jti, _as_utc(token.expires_at))
             raise PermissionError("Refresh token has been revoked")
-        expires_at = token.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-        if expires_at <= now:
-            token.mark_revoked()
-            self.db.add(token)
-            self._commit()
+        if _as_utc(token.expires_at) <= now:
+            self._mark_revoked(token)
             raise PermissionError("Refresh token has expired")
         return token
@@ -1,8 +1,45 @@
+from dataclasses import dataclass
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+
+from core.config import settings
+from core.counters import CounterBuffer
+from core.profile_cache import ProfileCache
 from models.user import User
 
 
+WORDLE_COLUMNS = ("wordle_game", "wordle_wins", "wordle_losses", "wordle_win_streak")
+SESSION_COLUMNS = ("random_session_words",)
+PROFILE_COLUMNS = ("id", "username", "random_word_lang", "theme") + WORDLE_COLUMNS + SESSION_COLUMNS
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    """The user columns requests read; counters are as stored, without buffered changes."""
+
+    id: int
+    username: str
+    random_word_lang: str
+    theme: str
+    wordle_game: int
+    wordle_wins: int
+    wordle_losses: int
+    wordle_win_streak: int
+    random_session_words: int
+
+# Click-rate counters on users are buffered here and written in batches by
+# UserRepository.flush_counters (interval task, size threshold, shutdown).
+user_counters = CounterBuffer(max_pending=settings.COUNTER_FLUSH_MAX_PENDING)
+
+# Dropped for a user whenever this process writes their row; rows written by
+# other workers are picked up within USER_PROFILE_CACHE_TTL_SECONDS.
+user_profiles: ProfileCache[int, UserProfile] = ProfileCache(
+    max_entries=settings.USER_PROFILE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_PROFILE_CACHE_TTL_SECONDS,
+)
+
+
 class UserRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -19,85 +56,159 @@ class UserRepository:
     def _zero_or_value(self, value: int | None) -> int:
         return int(value or 0)
 
-    def get_wordle_stats(self, user_id: int) -> dict:
-        result = self.db.execute(
-            select(
-                User.wordle_game,
-                User.wordle_wins,
-                User.wordle_losses,
-                User.wordle_win_streak,
-            ).where(User.id == user_id)
+    def get_profile(self, user_id: int) -> UserProfile | None:
+        profile = user_profiles.get(user_id)
+        if profile is not None:
+            return profile
+        generation = user_profiles.generation
+        row = self.db.execute(
+            select(*(getattr(User, column) for column in PROFILE_COLUMNS)).where(User.id == user_id)
         ).one_or_none()
-
-        if result is None:
-            return {"played": 0, "wins": 0, "losses": 0, "win_streak": 0}
-
+        if row is None:
+            return None
+        values = dict(zip(PROFILE_COLUMNS, row))
+        for column in WORDLE_COLUMNS + SESSION_COLUMNS:
+            values[column] = self._zero_or_value(values[column])
+        profile = UserProfile(**values)
+        user_profiles.put(user_id, profile, generation=generation)
+        return profile
+
+    def update_settings(self, user_id: int, *, random_word_lang: str, theme: str) -> UserProfile | None:
+        self.db.execute(
+            update(User).where(User.id == user_id).values(random_word_lang=random_word_lang, theme=theme)
+        )
+        self.db.commit()
+        user_profiles.invalidate(user_id)
+        return self.get_profile(user_id)
+
+    def _stored_counters(self, user_id: int, columns: tuple[str, ...]) -> dict[str, int] | None:
+        profile = self.get_profile(user_id)
+        if profile is None:
+            return None
+        return {column: getattr(profile, column) for column in columns}
+
+    def _counters(self, user_id: int, columns: tuple[str, ...]) -> dict[str, int] | None:
+        """Stored counters plus buffered changes, each change counted exactly once.
+
+        A flush committing between reading the row and reading the buffer
+        could leave its delta both in the row and in the buffer, so the pair
+        is read again whenever the buffer version moved in between.
+        """
+        while True:
+            version = user_counters.stable_version()
+            values = self._stored_counters(user_id, columns)
+            if values is None:
+                return None
+            current, delta = user_counters.snapshot(user_id)
+            if current != version:
+                continue
+            if delta is None:
+                return values
+            return {column: delta.apply(column, value) for column, value in values.items()}
+
+    def _wordle_stats(self, values: dict[str, int]) -> dict:
         return {
-            "played": self._zero_or_value(result.wordle_game),
-            "wins": self._zero_or_value(result.wordle_wins),
-            "losses": self._zero_or_value(result.wordle_losses),
-            "win_streak": self._zero_or_value(result.wordle_win_streak),
+            "played": values["wordle_game"],
+            "wins": values["wordle_wins"],
+            "losses": values["wordle_losses"],
+            "win_streak": values["wordle_win_streak"],
         }
 
-    def get_random_session_words(self, user_id: int) -> dict:
-        result = self.db.execute(
-            select(
-                User.random_session_words,
-            ).where(User.id == user_id)
-        ).one_or_none()
+    def get_wordle_stats(self, user_id: int) -> dict:
+        values = self._counters(user_id, WORDLE_COLUMNS)
+        if values is None:
+            return {"played": 0, "wins": 0, "losses": 0, "win_streak": 0}
+        return self._wordle_stats(values)
 
-        if result is None:
+    def get_random_session_words(self, user_id: int) -> dict:
+        values = self._counters(user_id, SESSION_COLUMNS)
+        if values is None:
             return {"session_words": 0}
+        return {"session_words": values["random_session_words"]}
 
-        return {"session_words": self._zero_or_value(result.random_session_words)}
-
-    def record_random_session_words(self, user_id: int) -> dict:
-        user = self.get_by_id(user_id)
-        if user is None:
+    def _record(self, user_id: int, columns: tuple[str, ...], buffer_changes) -> dict[str, int]:
+        if self.get_profile(user_id) is None:
             raise ValueError("User not found")
+        if buffer_changes():
+            self.flush_counters()
+        return self._counters(user_id, columns)
 
-        user.random_session_words = self._zero_or_value(user.random_session_words) + 1
-
-        self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
-        return {"session_words": self._zero_or_value(user.random_session_words)}
+    def record_random_session_words(self, user_id: int) -> dict:
+        values = self._record(
+            user_id,
+            SESSION_COLUMNS,
+            lambda: user_counters.add(user_id, "random_session_words"),
+        )
+        return {"session_words": values["random_session_words"]}
 
     def refresh_random_session_words(self, user_id: int) -> dict:
-        user = self.get_by_id(user_id)
-        if user is None:
-            raise ValueError("User not found")
-
-        user.random_session_words = 0
-
-        self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self._record(
+            user_id,
+            SESSION_COLUMNS,
+            lambda: user_counters.reset(user_id, "random_session_words"),
+        )
         return {"session_words": 0}
 
     def record_wordle_result(self, user_id: int, *, is_win: bool) -> dict:
-        user = self.get_by_id(user_id)
-        if user is None:
-            raise ValueError("User not found")
-
-        user.wordle_game = self._zero_or_value(user.wordle_game) + 1
-        if is_win:
-            user.wordle_wins = self._zero_or_value(user.wordle_wins) + 1
-            user.wordle_win_streak = self._zero_or_value(user.wordle_win_streak) + 1
-        else:
-            user.wordle_losses = self._zero_or_value(user.wordle_losses) + 1
-            user.wordle_win_streak = 0
-
-        self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
-        return {
-            "played": self._zero_or_value(user.wordle_game),
-            "wins": self._zero_or_value(user.wordle_wins),
-            "losses": self._zero_or_value(user.wordle_losses),
-            "win_streak": self._zero_or_value(user.wordle_win_streak),
-        }
-
+        def buffer_changes() -> bool:
+            user_counters.add(user_id, "wordle_game")
+            if is_win:
+                user_counters.add(user_id, "wordle_wins")
+                return user_counters.add(user_id, "wordle_win_streak")
+            user_counters.add(user_id, "wordle_losses")
+            return user_counters.reset(user_id, "wordle_win_streak")
+
+        return self._wordle_stats(self._record(user_id, WORDLE_COLUMNS, buffer_changes))
+
+    def reset_random_session_words(self, *, chunk_size: int = 10000) -> int:
+        """Zero every user's session counter in id-range batches; return rows changed.
+
+        Each batch is its own short transaction, so writers are never blocked
+        behind one statement touching the whole table.
+        """
+        max_id = self.db.execute(select(func.max(User.id))).scalar_one()
+        if max_id is None:
+            return 0
+        changed = 0
+        for start in range(0, max_id + 1, chunk_size):
+            stmt = (
+                update(User)
+                .where(
+                    User.id >= start,
+                    User.id < start + chunk_size,
+                    User.random_session_words != 0,
+                )
+                .values(random_session_words=0)
+            )
+            changed += self.db.execute(stmt).rowcount
+            self.db.commit()
+        user_profiles.clear()
+        return changed
+
+    def flush_counters(self) -> int:
+        """Write buffered counter deltas as ``col = col + n`` in one transaction."""
+        pending = user_counters.drain()
+        if not pending:
+            return 0
+        try:
+            for user_id, delta in pending.items():
+                values = {}
+                for column in delta.columns:
+                    base = 0 if column in delta.resets else getattr(User, column)
+                    values[column] = base + delta.increments.get(column, 0)
+                self.db.execute(update(User).where(User.id == user_id).values(**values))
+            # From here until complete()/restore() readers cannot tell whether
+            # the row already holds the delta, so they wait.
+            user_counters.begin_commit()
+            self.db.commit()
+        except BaseException:
+            self.db.rollback()
+            user_counters.restore()
+            raise
+        # Drop the cached rows before the deltas stop being merged into reads.
+        user_profiles.invalidate(*pending)
+        user_counters.complete()
+        return len(pending)
 
     def create(self, *, email: str, username: str, password_hash: str) -> User:
         user = User(email=email, username=username, password_hash=password_hash)
@@ -105,3 +216,7 @@ class UserRepository:
         self.db.commit()
         self.db.refresh(user)
         return user
+
+    def update_password_hash(self, *, user_id: int, password_hash: str) -> None:
+        self.db.execute(update(User).where(User.id == user_id).values(password_hash=password_hash))
+        self.db.commit()
@@ -0,0 +1,208 @@
+from datetime import datetime
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from core.database import upsert_insert
+from models.flashcard import FlashcardDecks
+from models.flashcardWordList import FlashcardWordList
+from models.randomWordList import WordList
+from models.user_stats import UserStats
+
+
+CARD_DIFFICULTY_COLUMNS = {
+    None: "cards_unrated",
+    "easy": "cards_easy",
+    "medium": "cards_medium",
+    "hard": "cards_hard",
+}
+WORD_STATUS_COLUMNS = {
+    "easy": "words_easy",
+    "ok": "words_ok",
+    "hard": "words_hard",
+}
+COUNTER_COLUMNS = ("total_cards", *CARD_DIFFICULTY_COLUMNS.values(), "due_cards", *WORD_STATUS_COLUMNS.values())
+
+
+def _difficulty_column(difficulty: str | None) -> str:
+    return CARD_DIFFICULTY_COLUMNS.get((difficulty or "").lower() or None, "cards_unrated")
+
+
+class UserStatsRepository:
+    """Per-user counters kept in step with the card and word repositories.
+
+    Writers call the ``on_*`` hooks inside their own transaction; the deltas
+    are plain ``UPDATE col = col + n`` statements and do nothing until the
+    row has been built by the first read. Bulk changes just mark the row
+    stale, and reconcile() rebuilds rows from the source tables.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: int) -> UserStats:
+        stats = self.db.get(UserStats, user_id)
+        if stats is None or stats.stale:
+            return self.recompute([user_id])[user_id]
+        now = datetime.utcnow()
+        if stats.due_valid_until is not None and stats.due_valid_until <= now:
+            due, next_due = self._due_counts([user_id], now)
+            stats.due_cards = due.get(user_id, 0)
+            stats.due_valid_until = next_due.get(user_id)
+            self.db.commit()
+        return stats
+
+    def _apply(self, user_id: int, deltas: dict[str, int], **values) -> None:
+        for name, delta in deltas.items():
+            if delta:
+                values[name] = getattr(UserStats, name) + delta
+        if values:
+            self.db.execute(update(UserStats).where(UserStats.user_id == user_id).values(**values))
+
+    def _lower_due_valid_until(self, moment: datetime):
+        return case(
+            (UserStats.due_valid_until.is_(None), moment),
+            (UserStats.due_valid_until > moment, moment),
+            else_=UserStats.due_valid_until,
+        )
+
+    def on_card_added(self, user_id: int, *, difficulty: str | None, due_at: datetime) -> None:
+        deltas = {"total_cards": 1, _difficulty_column(difficulty): 1}
+        if due_at <= datetime.utcnow():
+            self._apply(user_id, {**deltas, "due_cards": 1})
+        else:
+            self._apply(user_id, deltas, due_valid_until=self._lower_due_valid_until(due_at))
+
+    def on_card_removed(self, user_id: int, *, difficulty: str | None, due_at: datetime) -> None:
+        deltas = {"total_cards": -1, _difficulty_column(difficulty): -1}
+        if due_at <= datetime.utcnow():
+            deltas["due_cards"] = -1
+        self._apply(user_id, deltas)
+
+    def on_card_changed(
+        self,
+        user_id: int,
+        *,
+        old_difficulty: str | None,
+        new_difficulty: str | None,
+        old_due_at: datetime,
+        new_due_at: datetime,
+    ) -> None:
+        deltas: dict[str, int] = {}
+        old_column = _difficulty_column(old_difficulty)
+        new_column = _difficulty_column(new_difficulty)
+        if old_column != new_column:
+            deltas[old_column] = -1
+            deltas[new_column] = 1
+
+        now = datetime.utcnow()
+        was_due = old_due_at <= now
+        is_due = new_due_at <= now
+        deltas["due_cards"] = int(is_due) - int(was_due)
+        if is_due:
+            self._apply(user_id, deltas)
+        else:
+            self._apply(user_id, deltas, due_valid_until=self._lower_due_valid_until(new_due_at))
+
+    def on_word_status_changed(self, user_id: int, *, old_status: str | None, new_status: str | None) -> None:
+        deltas: dict[str, int] = {}
+        if old_status in WORD_STATUS_COLUMNS:
+            deltas[WORD_STATUS_COLUMNS[old_status]] = -1
+        if new_status in WORD_STATUS_COLUMNS:
+            deltas[WORD_STATUS_COLUMNS[new_status]] = deltas.get(WORD_STATUS_COLUMNS[new_status], 0) + 1
+        self._apply(user_id, deltas)
+
+    def invalidate(self, user_id: int) -> None:
+        self._apply(user_id, {}, stale=True)
+
+    def _due_counts(self, user_ids: list[int], now: datetime) -> tuple[dict[int, int], dict[int, datetime]]:
+        due_stmt = (
+            select(FlashcardDecks.user_id, func.count(FlashcardWordList.id))
+            .join(FlashcardDecks, FlashcardDecks.id == FlashcardWordList.deck_id)
+            .where(FlashcardDecks.user_id.in_(user_ids), FlashcardWordList.due_at <= now)
+            .group_by(FlashcardDecks.user_id)
+        )
+        next_stmt = (
+            select(FlashcardDecks.user_id, func.min(FlashcardWordList.due_at))
+            .join(FlashcardDecks, FlashcardDecks.id == FlashcardWordList.deck_id)
+            .where(FlashcardDecks.user_id.in_(user_ids), FlashcardWordList.due_at > now)
+            .group_by(FlashcardDecks.user_id)
+        )
+        return dict(self.db.execute(due_stmt).all()), dict(self.db.execute(next_stmt).all())
+
+    def recompute(self, user_ids: list[int]) -> dict[int, UserStats]:
+        now = datetime.utcnow()
+        counters: dict[int, dict[str, int]] = {
+            user_id: {name: 0 for name in COUNTER_COLUMNS} for user_id in user_ids
+        }
+
+        card_stmt = (
+            select(FlashcardDecks.user_id, FlashcardWordList.difficulty, func.count(FlashcardWordList.id))
+            .join(FlashcardDecks, FlashcardDecks.id == FlashcardWordList.deck_id)
+            .where(FlashcardDecks.user_id.in_(user_ids))
+            .group_by(FlashcardDecks.user_id, FlashcardWordList.difficulty)
+        )
+        for user_id, difficulty, count in self.db.execute(card_stmt):
+            counters[user_id]["total_cards"] += count
+            counters[user_id][_difficulty_column(difficulty)] += count
+
+        word_stmt = (
+            select(WordList.user_id, WordList.status, func.count(WordList.id))
+            .where(WordList.user_id.in_(user_ids))
+            .group_by(WordList.user_id, WordList.status)
+        )
+        for user_id, status, count in self.db.execute(word_stmt):
+            column = WORD_STATUS_COLUMNS.get(status)
+            if column:
+                counters[user_id][column] += count
+
+        due, next_due = self._due_counts(user_ids, now)
+
+        rows = [
+            {
+                "user_id": user_id,
+                **values,
+                "due_cards": due.get(user_id, 0),
+                "due_valid_until": next_due.get(user_id),
+                "stale": False,
+                "updated_at": now,
+            }
+            for user_id, values in counters.items()
+        ]
+        # Two requests can both find the row missing and rebuild it at once;
+        # upserting makes the second one overwrite instead of failing on the
+        # primary key.
+        stmt = upsert_insert(self.db)(UserStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={name: stmt.excluded[name] for name in rows[0] if name != "user_id"},
+        )
+        self.db.execute(stmt, rows)
+        self.db.commit()
+        return {
+            stats.user_id: stats
+            for stats in self.db.execute(
+                select(UserStats)
+                .where(UserStats.user_id.in_(user_ids))
+                .execution_options(populate_existing=True)
+            ).scalars()
+        }
+
+    def reconcile(self, *, chunk_size: int = 500) -> int:
+        """Rebuild every materialized row from the source tables, in chunks."""
+        last_id = 0
+        processed = 0
+        while True:
+            user_ids = list(
+                self.db.execute(
+                    select(UserStats.user_id)
+                    .where(UserStats.user_id > last_id)
+                    .order_by(UserStats.user_id)
+                    .limit(chunk_size)
+                ).scalars()
+            )
+            if not user_ids:
+                return processed
+            self.recompute(user_ids)
+            processed += len(user_ids)
+            last_id = user_ids[-1]
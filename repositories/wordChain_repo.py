@@ -1,5 +1,8 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
+
+from core.pagination import keyset_by_id
 from models.wordChain import WordChainList
 
 
@@ -7,7 +10,7 @@ class WordChainRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def add_used_word(self, *, user_id: int, word: str) -> WordChainList:
+    def add_used_word(self, *, user_id: int, word: str) -> WordChainList | None:
         stmt = select(WordChainList).where(
             WordChainList.user_id == user_id,
             WordChainList.used_word == word,
@@ -20,18 +23,34 @@ class WordChainRepository:
             entity = WordChainList(user_id=user_id, used_word=word)
             self.db.add(entity)
 
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Stored by a concurrent request between the check and the insert.
+            self.db.rollback()
+            return None
         self.db.refresh(entity)
         return entity
     
-    def get_used_words(self, user_id: int, limit: int | None = None) -> list[WordChainList]:
-        stmt = (
-            select(WordChainList)
-            .where(WordChainList.user_id == user_id)
-            .order_by(WordChainList.id.desc())
+    def get_used_words(self, user_id: int, limit: int | None = None, *, before_id: int | None = None) -> list[WordChainList]:
+        stmt = select(WordChainList).where(WordChainList.user_id == user_id)
+        stmt = keyset_by_id(stmt, WordChainList.id, before_id=before_id, limit=limit)
+        return list(self.db.execute(stmt).scalars())
+
+    def count_used_words(self, user_id: int) -> int:
+        stmt = select(func.count(WordChainList.id)).where(WordChainList.user_id == user_id)
+        return self.db.execute(stmt).scalar_one()
+
+    def used_words_version(self, user_id: int) -> tuple[int, int | None]:
+        """(count, highest id) of the user's used words; changes on every add or clear."""
+        stmt = select(func.count(WordChainList.id), func.max(WordChainList.id)).where(
+            WordChainList.user_id == user_id
         )
-        if limit is not None:
-            stmt = stmt.limit(limit)
+        count, max_id = self.db.execute(stmt).one()
+        return count, max_id
+
+    def get_used_word_values(self, user_id: int) -> list[str]:
+        stmt = select(WordChainList.used_word).where(WordChainList.user_id == user_id)
         return list(self.db.execute(stmt).scalars())
 
     def clear_user_words(self, user_id: int) -> None:
@@ -0,0 +1,39 @@
+from hmac import compare_digest
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from core.config import settings
+from core.database import Database, get_database
+from core.password_hashing import password_hash_pool
+from services.refresh_token_gc import refresh_token_gc_stats, run_refresh_token_gc
+from starlette.concurrency import run_in_threadpool
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    # Without ADMIN_TOKEN the admin API does not exist.
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/password_hashing")
+async def password_hashing_stats():
+    return password_hash_pool.stats()
+
+
+@router.get("/refresh_tokens/gc")
+async def get_refresh_token_gc(db: Database = Depends(get_database)):
+    return await db.run(refresh_token_gc_stats)
+
+
+@router.post("/refresh_tokens/gc")
+async def trigger_refresh_token_gc(db: Database = Depends(get_database)):
+    # The collector opens its own sessions so each batch commits separately.
+    ran = await run_in_threadpool(run_refresh_token_gc)
+    if not ran:
+        raise HTTPException(status_code=409, detail="Collection already running")
+    return await db.run(refresh_token_gc_stats)
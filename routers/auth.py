@@ -1,16 +1,26 @@
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from hmac import compare_digest
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from authx import AuthX, AuthXConfig, TokenPayload
+from authx import AuthX, AuthXConfig, RequestToken, TokenPayload
+from authx.exceptions import (
+    AccessTokenRequiredError,
+    CSRFError,
+    FreshTokenRequiredError,
+    RefreshTokenRequiredError,
+    TokenTypeError,
+)
 from core.config import settings
-from core.database import SessionLocal, get_db
-from models.user import User
+from core.database import Database, get_database
+from core.token_cache import VerifiedTokenCache
 from schemas.auth import LoginIn, RegisterIn, UserOut
 from schemas.settings_user import UserSettingsIn, UserSettingsOut
-from repositories.refresh_token_repo import RefreshTokenRepository
+from repositories.refresh_token_repo import RefreshTokenRepository, revocation_cache
+from repositories.user_repo import UserProfile, UserRepository
 from services.auth_services import AuthService
 router = APIRouter(prefix="/user", tags=["user"])
 
@@ -31,14 +41,10 @@ config = AuthXConfig(
     JWT_COOKIE_CSRF_PROTECT=settings.JWT_COOKIE_CSRF_PROTECT,
 )
 
-security = AuthX(config=config)
-
-def _decode_token(token: str) -> TokenPayload:
-    return TokenPayload.decode(
-        token=token,
-        key=security.config.public_key,
-        algorithms=[security.config.JWT_ALGORITHM],
-    )
+verified_tokens: VerifiedTokenCache[TokenPayload] = VerifiedTokenCache(
+    max_entries=settings.JWT_VERIFY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.JWT_VERIFY_CACHE_TTL_SECONDS,
+)
 
 
 def _exp_to_datetime(exp_value: float | int | datetime) -> datetime:
@@ -47,6 +53,99 @@ def _exp_to_datetime(exp_value: float | int | datetime) -> datetime:
     return datetime.fromtimestamp(exp_value, tz=timezone.utc)
 
 
+def _remember_verified(token: str, payload: TokenPayload) -> TokenPayload:
+    expires_at = _exp_to_datetime(payload.exp) if payload.exp is not None else None
+    verified_tokens.put(token, payload, expires_at=expires_at)
+    return payload
+
+
+def _check_request_claims(
+    token: RequestToken,
+    payload: TokenPayload,
+    *,
+    verify_type: bool,
+    verify_fresh: bool,
+    verify_csrf: bool,
+) -> TokenPayload:
+    # Mirrors RequestToken.verify minus the JWT decode; these checks depend on
+    # the request (CSRF header, expected type) and so are never cached.
+    if verify_type and token.type != payload.type:
+        message = f"'{token.type}' token required, '{payload.type}' token received"
+        if token.type == "access":
+            raise AccessTokenRequiredError(message)
+        if token.type == "refresh":
+            raise RefreshTokenRequiredError(message)
+        raise TokenTypeError(message)
+    if verify_fresh and not payload.fresh:
+        raise FreshTokenRequiredError("Fresh token required")
+    if verify_csrf and token.location == "cookies":
+        if token.csrf is None:
+            raise CSRFError("Missing CSRF token in request")
+        if payload.csrf is None or not compare_digest(token.csrf, payload.csrf):
+            raise CSRFError("CSRF token mismatch")
+    return payload
+
+
+class CachedAuthX(AuthX):
+    """AuthX that checks a token's signature once per cache lifetime.
+
+    The dependency properties return the same callable on every access, so
+    FastAPI resolves a route's token dependency once per request no matter
+    how many times it is declared.
+    """
+
+    @cached_property
+    def access_token_required(self):
+        return super().access_token_required
+
+    @cached_property
+    def refresh_token_required(self):
+        return super().refresh_token_required
+
+    @cached_property
+    def fresh_token_required(self):
+        return super().fresh_token_required
+
+    def verify_token(
+        self,
+        token: RequestToken,
+        verify_type: bool = True,
+        verify_fresh: bool = False,
+        verify_csrf: bool = True,
+    ) -> TokenPayload:
+        payload = verified_tokens.get(token.token)
+        if payload is None:
+            payload = super().verify_token(token, verify_type=False, verify_fresh=False, verify_csrf=False)
+            _remember_verified(token.token, payload)
+        try:
+            return _check_request_claims(
+                token,
+                payload,
+                verify_type=verify_type,
+                verify_fresh=verify_fresh,
+                verify_csrf=verify_csrf,
+            )
+        except (TokenTypeError, FreshTokenRequiredError, CSRFError) as exc:
+            exc.login_type = exc.login_type or self.login_type
+            raise
+
+
+security = CachedAuthX(config=config)
+
+def _decode_token(token: str) -> TokenPayload:
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+    return _remember_verified(
+        token,
+        TokenPayload.decode(
+            token=token,
+            key=security.config.public_key,
+            algorithms=[security.config.JWT_ALGORITHM],
+        ),
+    )
+
+
 def _ensure_refresh_metadata(payload: TokenPayload) -> tuple[str, datetime]:
     if payload.jti is None:
         raise ValueError("Refresh token does not contain jti")
@@ -65,54 +164,56 @@ def _is_token_revoked(token: str, **_: Any) -> bool:
     if payload.type != "refresh" or payload.jti is None:
         return False
 
-    db = SessionLocal()
-    try:
-        repo = RefreshTokenRepository(db)
-        stored = repo.get_by_jti(payload.jti)
-        if stored is None:
-            return True
-        if stored.revoked:
-            return True
-        expires_at = stored.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
-        if expires_at <= datetime.now(timezone.utc):
-            stored.mark_revoked()
-            db.add(stored)
-            db.commit()
-            return True
-        return False
-    finally:
-        db.close()
+    # AuthX calls this synchronously on the event loop, so it only consults
+    # the revocation cache. A miss is let through: /refresh checks the row in
+    # assert_active off the loop, and /logout only revokes.
+    return revocation_cache.lookup(payload.jti) is True
 
 
 security.set_token_blocklist(_is_token_revoked)
 
+
+async def current_user(
+    payload: TokenPayload = Depends(security.access_token_required),
+    db: Database = Depends(get_database),
+) -> UserProfile:
+    """The signed-in user's profile, loaded at most once per request."""
+    try:
+        user_id = int(payload.sub)
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid subject in token") from exc
+    profile = await db.run(lambda session: UserRepository(session).get_profile(user_id))
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return profile
+
 @router.post("/register")
-async def post_reg(data: RegisterIn, db: Session = Depends(get_db)):
+async def post_reg(data: RegisterIn, db: Database = Depends(get_database)):
     svc = AuthService(db)
-    user = svc.register(email=data.email, username=data.username, password=data.password)
+    user = await svc.register(email=data.email, username=data.username, password=data.password)
     return UserOut(id=user.id, email=user.email, username=user.username)
     
 
 @router.post("/login")
-async def post_login(response: Response, data: LoginIn, db: Session = Depends(get_db)):
+async def post_login(response: Response, data: LoginIn, db: Database = Depends(get_database)):
     svc = AuthService(db)
-    user = svc.login(email=data.email, password=data.password)
+    user = await svc.login(email=data.email, password=data.password)
 
     access_token = security.create_access_token(uid=str(user.id))
     refresh_token = security.create_refresh_token(uid=str(user.id))
 
     refresh_payload = _decode_token(refresh_token)
     jti, expires_at = _ensure_refresh_metadata(refresh_payload)
-    RefreshTokenRepository(db).replace_for_user(user_id=user.id, jti=jti, expires_at=expires_at)
+    await db.run(
+        lambda session: RefreshTokenRepository(session).replace_for_user(user_id=user.id, jti=jti, expires_at=expires_at)
+    )
 
     security.set_access_cookies(access_token, response)
     security.set_refresh_cookies(refresh_token, response)
 
     return {"status": "ok"}
 
-@router.get("/me", dependencies=[Depends(security.access_token_required)])
+@router.get("/me")
 async def me(payload: TokenPayload = Depends(security.access_token_required)):
     return {"user_id": payload.sub}
 
@@ -120,10 +221,10 @@ async def me(payload: TokenPayload = Depends(security.access_token_required)):
 async def logout(
     response: Response,
     payload: TokenPayload = Depends(security.refresh_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     if payload.jti:
-        RefreshTokenRepository(db).revoke(payload.jti)
+        await db.run(lambda session: RefreshTokenRepository(session).revoke(payload.jti))
     security.unset_cookies(response)
     cookie_kwargs = {
         "path": "/",
@@ -173,7 +274,7 @@ async def logout(
 async def refresh(
     response: Response,
     payload: TokenPayload = Depends(security.refresh_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     try:
         user_id = int(payload.sub)
@@ -183,20 +284,22 @@ async def refresh(
     if payload.jti is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token missing identifier")
 
-    repo = RefreshTokenRepository(db)
-    try:
-        repo.assert_active(jti=payload.jti, user_id=user_id)
-    except PermissionError as exc:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
-
-    repo.revoke(payload.jti)
-
     new_access = security.create_access_token(uid=str(user_id))
     new_refresh = security.create_refresh_token(uid=str(user_id))
 
     new_refresh_payload = _decode_token(new_refresh)
     new_jti, new_expiry = _ensure_refresh_metadata(new_refresh_payload)
-    repo.add(user_id=user_id, jti=new_jti, expires_at=new_expiry)
+
+    def rotate(session: Session) -> None:
+        repo = RefreshTokenRepository(session)
+        repo.assert_active(jti=payload.jti, user_id=user_id)
+        repo.revoke(payload.jti)
+        repo.add(user_id=user_id, jti=new_jti, expires_at=new_expiry)
+
+    try:
+        await db.run(rotate)
+    except PermissionError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
     security.set_access_cookies(new_access, response)
     security.set_refresh_cookies(new_refresh, response)
@@ -206,15 +309,8 @@ async def refresh(
 @router.get(
     "/settings",
     response_model=UserSettingsOut,
-    dependencies=[Depends(security.access_token_required)]
 )
-async def get_settings(
-    payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
-):
-    user_id = int(payload.sub)
-    user = db.get(User, user_id)
-
+async def get_settings(user: UserProfile = Depends(current_user)):
     return UserSettingsOut(
         random_word_lang=user.random_word_lang or "en",
         theme=user.theme or "amber",
@@ -224,23 +320,19 @@ async def get_settings(
 @router.put(
     "/settings",
     response_model=UserSettingsOut,
-    dependencies=[Depends(security.access_token_required)]
 )
 async def update_settings(
     data: UserSettingsIn,
-    payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    user: UserProfile = Depends(current_user),
+    db: Database = Depends(get_database),
 ):
-    user_id = int(payload.sub)
-    user = db.get(User, user_id)
-
-    user.random_word_lang = data.random_word_lang
-    user.theme = data.theme
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    updated = await db.run(
+        lambda session: UserRepository(session).update_settings(
+            user.id, random_word_lang=data.random_word_lang, theme=data.theme
+        )
+    )
 
     return UserSettingsOut(
-        random_word_lang=user.random_word_lang,
-        theme=user.theme,
+        random_word_lang=updated.random_word_lang,
+        theme=updated.theme,
     )
@@ -1,16 +1,21 @@
 import csv
 import io
 import re
+import zlib
+from typing import IO, BinaryIO, Iterable, Iterator, Sequence
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
 
 from authx import TokenPayload
 
-from core.database import get_db
+from core.config import settings
+from core.database import Database, SessionLocal, get_database
+from core.pagination import PageParams, page_params
 from schemas.flashcard import (
+    DashboardStatsOut,
     DeckCreateIn,
+    DeckImportOut,
     DeckOut,
     DeckUpdateIn,
     FlashcardSessionOut,
@@ -19,9 +24,10 @@ from schemas.flashcard import (
     FlashcardWordOut,
     FlashcardWordUpdateIn,
 )
-from models.user import User
+from repositories.user_repo import UserProfile
+from schemas.pagination import Page
 from services.flashcard_service import FlashcardService
-from .auth import security
+from .auth import current_user, security
 from pydantic import ValidationError
 
 router = APIRouter(prefix="/flashcard", tags=["Flashcard"])
@@ -35,11 +41,11 @@ router = APIRouter(prefix="/flashcard", tags=["Flashcard"])
 async def create_deck(
     data: DeckCreateIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.save_deck(
+    svc = db.service(FlashcardService)
+    deck = await svc.save_deck(
         user_id=user_id,
         title=data.title,
         description=data.description,
@@ -51,16 +57,21 @@ async def create_deck(
 
 @router.get(
     "/decks",
-    response_model=list[DeckOut],
+    response_model=Page[DeckOut],
 )
 async def list_decks(
+    page: PageParams = Depends(page_params),
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    decks = svc.list_decks(user_id)
-    return [DeckOut.model_validate(deck, from_attributes=True) for deck in decks]
+    svc = db.service(FlashcardService)
+    decks, next_cursor = page.split(await svc.list_decks(user_id, limit=page.fetch_limit, before_id=page.before_id))
+    return Page[DeckOut](
+        items=[DeckOut.model_validate(deck, from_attributes=True) for deck in decks],
+        next_cursor=next_cursor,
+        total=await svc.count_decks(user_id) if page.include_total else None,
+    )
 
 
 @router.delete(
@@ -70,11 +81,11 @@ async def list_decks(
 async def delete_deck(
     deck_id: int,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deleted = svc.delete_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deleted = await svc.delete_deck(user_id=user_id, deck_id=deck_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Deck not found")
     return Response(status_code=204)
@@ -88,12 +99,12 @@ async def update_deck(
     deck_id: int,
     data: DeckUpdateIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
+    svc = db.service(FlashcardService)
     try:
-        deck = svc.update_deck(
+        deck = await svc.update_deck(
             user_id=user_id,
             deck_id=deck_id,
             title=data.title,
@@ -117,14 +128,14 @@ async def add_word_to_deck(
     deck_id: int,
     data: FlashcardWordCreateIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.get_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deck = await svc.get_deck(user_id=user_id, deck_id=deck_id)
     if deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
-    word = svc.save_word(
+    word = await svc.save_word(
         deck_id=deck_id,
         word=data.word,
         definition=data.definition,
@@ -135,21 +146,25 @@ async def add_word_to_deck(
 
 @router.get(
     "/decks/{deck_id}/words",
-    response_model=list[FlashcardWordOut],
+    response_model=Page[FlashcardWordOut],
 )
 async def list_words_for_deck(
     deck_id: int,
+    page: PageParams = Depends(page_params),
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.get_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deck = await svc.get_deck(user_id=user_id, deck_id=deck_id)
     if deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
-    words = svc.list_words(deck_id=deck_id)
-    print([FlashcardWordOut.model_validate(word, from_attributes=True) for word in words])
-    return [FlashcardWordOut.model_validate(word, from_attributes=True) for word in words]
+    words, next_cursor = page.split(await svc.list_words(deck_id=deck_id, limit=page.fetch_limit, before_id=page.before_id))
+    return Page[FlashcardWordOut](
+        items=[FlashcardWordOut.model_validate(word, from_attributes=True) for word in words],
+        next_cursor=next_cursor,
+        total=await svc.count_words(deck_id) if page.include_total else None,
+    )
 
 
 @router.put(
@@ -161,15 +176,15 @@ async def update_word_in_deck(
     word_id: int,
     data: FlashcardWordUpdateIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.get_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deck = await svc.get_deck(user_id=user_id, deck_id=deck_id)
     if deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
     try:
-        word = svc.update_word(
+        word = await svc.update_word(
             deck_id=deck_id,
             word_id=word_id,
             word=data.word,
@@ -192,15 +207,15 @@ async def update_word_difficulty(
     word_id: int,
     data: FlashcardWordDifficultyIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.get_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deck = await svc.get_deck(user_id=user_id, deck_id=deck_id)
     if deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
 
-    word = svc.update_word_difficulty(deck_id=deck_id, word_id=word_id, difficulty=data.difficulty)
+    word = await svc.update_word_difficulty(deck_id=deck_id, word_id=word_id, difficulty=data.difficulty)
     if word is None:
         raise HTTPException(status_code=404, detail="Card not found")
     return FlashcardWordOut.model_validate(word, from_attributes=True)
@@ -214,14 +229,14 @@ async def delete_word_from_deck(
     deck_id: int,
     word_id: int,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.get_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deck = await svc.get_deck(user_id=user_id, deck_id=deck_id)
     if deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
-    deleted = svc.delete_word(deck_id=deck_id, word_id=word_id)
+    deleted = await svc.delete_word(deck_id=deck_id, word_id=word_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Card not found")
     return Response(status_code=204)
@@ -232,16 +247,14 @@ async def delete_word_from_deck(
     response_model=FlashcardSessionOut,
 )
 async def get_global_session_cards(
-    payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    user: UserProfile = Depends(current_user),
+    db: Database = Depends(get_database),
 ):
-    user_id = int(payload.sub)
-    user = db.get(User, user_id)
-    lang = (user.random_word_lang if user else None) or "en"
+    lang = user.random_word_lang or "en"
     lang = "de" if lang.lower() == "de" else "en"
 
-    svc = FlashcardService(db)
-    cards = svc.get_session_cards_for_lang(user_id=user_id, lang=lang, limit=10)
+    svc = db.service(FlashcardService)
+    cards = await svc.get_session_cards_for_lang(user_id=user.id, lang=lang, limit=10)
     return {
         "lang": lang,
         "cards": [FlashcardWordOut.model_validate(card, from_attributes=True) for card in cards],
@@ -259,43 +272,99 @@ def _normalize_filename(title: str | None, deck_id: int) -> str:
     return f"{slug}.csv"
 
 
+EXPORT_COLUMNS = ["word", "definition", "example", "difficulty"]
+LIBRARY_EXPORT_COLUMNS = ["deck", "lang", *EXPORT_COLUMNS]
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _csv_chunks(header: list[str], rows: Iterable[Sequence[str | None]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _export_stream(*, user_id: int, deck_id: int | None, compress: bool) -> Iterator[bytes]:
+    # The request-scoped session is closed before the body is sent, so the
+    # stream owns its own session for as long as the client keeps reading.
+    db = SessionLocal()
+    try:
+        rows = FlashcardService(db).iter_export_rows(user_id=user_id, deck_id=deck_id)
+        if deck_id is None:
+            chunks = _csv_chunks(LIBRARY_EXPORT_COLUMNS, rows)
+        else:
+            chunks = _csv_chunks(EXPORT_COLUMNS, (row[2:] for row in rows))
+        yield from (_gzip_chunks(chunks) if compress else chunks)
+    finally:
+        db.close()
+
+
+def _export_response(*, user_id: int, deck_id: int | None, filename: str, compress: bool) -> StreamingResponse:
+    stream = _export_stream(user_id=user_id, deck_id=deck_id, compress=compress)
+    if compress:
+        response = StreamingResponse(stream, media_type="application/gzip")
+        filename = f"{filename}.gz"
+    else:
+        response = StreamingResponse(stream, media_type="text/csv; charset=utf-8")
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 @router.get("/export/flashcard_csv", response_class=StreamingResponse)
 async def export_flashcards_to_csv(
     deck_id: int = Query(..., gt=0, description="Deck ID to export"),
+    gzip: bool = Query(False, description="Compress the CSV with gzip"),
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.get_deck(user_id=user_id, deck_id=deck_id)
+    svc = db.service(FlashcardService)
+    deck = await svc.get_deck(user_id=user_id, deck_id=deck_id)
     if deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
 
-    words = svc.list_words(deck_id=deck_id)
+    filename = _normalize_filename(deck.title, deck.id)
+    return _export_response(user_id=user_id, deck_id=deck.id, filename=filename, compress=gzip)
 
-    buffer = io.StringIO()
-    fieldnames = ["word", "definition", "example", "difficulty"]
-    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-    writer.writeheader()
-    for word in words:
-        writer.writerow(
-            {
-                "word": word.word or "",
-                "definition": word.definition or "",
-                "example": word.example or "",
-                "difficulty": word.difficulty or "",
-            }
-        )
 
-    csv_data = buffer.getvalue().encode("utf-8")
-    filename = _normalize_filename(deck.title, deck.id)
-    response = StreamingResponse(iter([csv_data]), media_type="text/csv; charset=utf-8")
-    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+@router.get("/export/library_csv", response_class=StreamingResponse)
+async def export_library_to_csv(
+    gzip: bool = Query(False, description="Compress the CSV with gzip"),
+    payload: TokenPayload = Depends(security.access_token_required),
+):
+    user_id = int(payload.sub)
+    return _export_response(user_id=user_id, deck_id=None, filename="flashcards-library.csv", compress=gzip)
+
+
+MAX_REPORTED_IMPORT_ERRORS = 100
 
 
-def _parse_import_csv(content: str) -> list[dict[str, str | None]]:
-    stream = io.StringIO(content)
+def _iter_import_csv(
+    stream: IO[str],
+    *,
+    errors: list[dict[str, int | str]],
+    max_rows: int,
+) -> Iterator[dict[str, str | None]]:
+    """Yield validated rows from ``stream`` one at a time.
+
+    Invalid rows are appended to ``errors`` (up to MAX_REPORTED_IMPORT_ERRORS)
+    instead of stopping the import.
+    """
     reader = csv.DictReader(stream)
     if reader.fieldnames is None:
         raise HTTPException(status_code=400, detail="CSV file must include a header row.")
@@ -320,8 +389,14 @@ def _parse_import_csv(content: str) -> list[dict[str, str | None]]:
     if missing:
         raise HTTPException(status_code=400, detail="CSV must include Word and Definition columns.")
 
-    entries: list[dict[str, str | None]] = []
+    def reject(row_number: int, detail: str) -> None:
+        if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+            errors.append({"row": row_number, "detail": detail})
+
     for row_number, row in enumerate(reader, start=2):
+        if row_number - 1 > max_rows:
+            raise HTTPException(status_code=413, detail=f"CSV must not contain more than {max_rows} rows.")
+
         word = (row.get("word") or "").strip()
         definition = (row.get("definition") or "").strip()
         example = (row.get("example") or "").strip()
@@ -331,37 +406,70 @@ def _parse_import_csv(content: str) -> list[dict[str, str | None]]:
             continue
 
         if not word or not definition:
-            raise HTTPException(status_code=400, detail=f"Row {row_number}: word and definition are required.")
+            reject(row_number, "word and definition are required.")
+            continue
 
         try:
             validated = FlashcardWordCreateIn(word=word, definition=definition, example=example or None)
         except ValidationError as exc:
             messages = "; ".join(err.get("msg", "Invalid data") for err in exc.errors())
-            raise HTTPException(status_code=400, detail=f"Row {row_number}: {messages}") from exc
+            reject(row_number, messages)
+            continue
 
         normalized_difficulty = None
         if difficulty_raw:
             try:
                 normalized_difficulty = FlashcardWordDifficultyIn(difficulty=difficulty_raw).difficulty
-            except ValidationError as exc:
-                raise HTTPException(status_code=400, detail=f"Row {row_number}: difficulty must be easy, medium, or hard") from exc
-
-        entries.append(
-            {
-                "word": validated.word,
-                "definition": validated.definition,
-                "example": validated.example,
-                "difficulty": normalized_difficulty,
-            }
+            except ValidationError:
+                reject(row_number, "difficulty must be easy, medium, or hard")
+                continue
+
+        yield {
+            "word": validated.word,
+            "definition": validated.definition,
+            "example": validated.example,
+            "difficulty": normalized_difficulty,
+        }
+
+
+def _import_csv_upload(
+    svc: FlashcardService,
+    *,
+    user_id: int,
+    deck_data: DeckCreateIn,
+    upload: BinaryIO,
+) -> DeckImportOut:
+    errors: list[dict[str, int | str]] = []
+    # Decode incrementally from the spooled upload instead of reading it whole.
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    try:
+        rows = _iter_import_csv(stream, errors=errors, max_rows=settings.FLASHCARD_IMPORT_MAX_ROWS)
+        deck, counts = svc.import_deck(
+            user_id=user_id,
+            title=deck_data.title,
+            description=deck_data.description,
+            category=deck_data.category,
+            lang=deck_data.lang,
+            rows=rows,
+            batch_size=settings.FLASHCARD_IMPORT_BATCH_SIZE,
         )
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded.") from exc
+    except csv.Error as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {exc}") from exc
+    except ValueError as exc:
+        if errors:
+            first = errors[0]
+            raise HTTPException(status_code=400, detail=f"Row {first['row']}: {first['detail']}") from exc
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    finally:
+        stream.detach()
 
-    if not entries:
-        raise HTTPException(status_code=400, detail="CSV must contain at least one valid row.")
-
-    return entries
+    deck_out = DeckOut.model_validate(deck, from_attributes=True)
+    return DeckImportOut(**deck_out.model_dump(), **counts, errors=errors)
 
 
-@router.post("/import", response_model=DeckOut, status_code=201)
+@router.post("/import", response_model=DeckImportOut, status_code=201)
 async def import_flashcard_deck(
     title: str = Form(...),
     description: str = Form(...),
@@ -369,7 +477,7 @@ async def import_flashcard_deck(
     lang: str = Form("en"),
     file: UploadFile = File(...),
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     try:
         deck_data = DeckCreateIn(title=title, description=description, category=category, lang=lang)
@@ -380,46 +488,37 @@ async def import_flashcard_deck(
     if not filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only CSV files can be imported.")
 
-    raw_bytes = await file.read()
-    if not raw_bytes:
+    if file.size == 0:
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
-    try:
-        text = raw_bytes.decode("utf-8-sig")
-    except UnicodeDecodeError as exc:
-        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded.") from exc
-
-    words = _parse_import_csv(text)
-
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    deck = svc.save_deck(
-        user_id=user_id,
-        title=deck_data.title,
-        description=deck_data.description,
-        category=deck_data.category,
-        lang=deck_data.lang,
-    )
-
-    for word in words:
-        svc.save_word(
-            deck_id=deck.id,
-            word=word["word"],
-            definition=word["definition"],
-            example=word["example"],
-            difficulty=word["difficulty"],
+    # Parsing the upload is CPU and file work, so keep it off the loop even
+    # with the async engine.
+    return await db.run_in_thread(
+        lambda session: _import_csv_upload(
+            FlashcardService(session),
+            user_id=user_id,
+            deck_data=deck_data,
+            upload=file.file,
         )
-
-    return DeckOut.model_validate(deck, from_attributes=True)
+    )
 
 
 @router.get("/stats")
 async def get_flashcard_stats(
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
+):
+    user_id = int(payload.sub)
+    svc = db.service(FlashcardService)
+    return await svc.get_user_stats(user_id)
+
+
+@router.get("/stats/dashboard", response_model=DashboardStatsOut)
+async def get_dashboard_stats(
+    payload: TokenPayload = Depends(security.access_token_required),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = FlashcardService(db)
-    due_cards = svc.count_due_cards(user_id)
-    total_cards = svc.count_user_cards(user_id)
-    return {"due_cards": due_cards, "total_cards": total_cards}
+    svc = db.service(FlashcardService)
+    return await svc.get_dashboard_stats(user_id)
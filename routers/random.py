@@ -1,34 +1,22 @@
-import csv
-from random import choice
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from authx import TokenPayload
 
-from core.database import get_db
+from core.corpus import get_corpus
+from core.pagination import PageParams, decode_cursor, page_params
+from core.database import Database, get_database
+from schemas.pagination import Page
 from schemas.word import WordRatingIn, WordRatingOut, WordListOut, WordLibraryOut, WordLibraryUpdateIn
 from services.word_services import WordServices
-from models.user import User
 from models.randomWordList import WordList
-from .auth import security
+from repositories.user_repo import UserProfile
+from .auth import current_user, security
 
 
 router = APIRouter(prefix="/words", tags=["words"])
 
-with open("eng_words.csv", encoding="utf-8") as content:
-    eng_words = list(csv.DictReader(content))
-
-with open("germany_words.csv", encoding="utf-8") as content:
-    germany_words = list(csv.DictReader(content))
-
-LANG_DECKS = {
-    "en": eng_words,
-    "english": eng_words,
-    "de": germany_words,
-    "germany": germany_words,
-}
-
 VALID_LANGS = {"en", "de"}
 
 
@@ -49,20 +37,20 @@ def serialize_word_list(words):
 
 @router.get("/random/{lang}")
 async def get_random_word(lang: str):
-    deck = LANG_DECKS.get(lang.lower())
-    if not deck:
+    corpus = get_corpus(lang)
+    if not corpus:
         raise HTTPException(status_code=404, detail="Language is not supported")
-    return {"word": choice(deck)["word"]}
+    return {"word": corpus.random_word()}
 
 @router.post("/rate", response_model=WordRatingOut)
 async def rate_word(
     data: WordRatingIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = WordServices(db)
-    entity = svc.save_rating(
+    svc = db.service(WordServices)
+    entity = await svc.save_rating(
         user_id=user_id,
         word=data.word,
         status=data.status,
@@ -77,27 +65,47 @@ async def rate_word(
         word_lang=entity.lang,
     )
 
-@router.get("/all_random_words_by_id", response_model=list[WordListOut])
+@router.get("/all_random_words_by_id", response_model=Page[WordListOut])
 async def get_all_random_words(
-    payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    user: UserProfile = Depends(current_user),
+    db: Database = Depends(get_database),
 ):
-    user_id = int(payload.sub)
-    svc = WordServices(db)
-    lang = resolve_user_lang(db, user_id)
-    list_words = svc.get_user_words(user_id, lang=lang)
-    return serialize_word_list(list_words)
+    user_id = user.id
+    svc = db.service(WordServices)
+    lang = resolve_user_lang(user)
+    list_words, next_cursor = page.split(
+        await svc.get_user_words(user_id, limit=page.fetch_limit, lang=lang, before_id=page.before_id)
+    )
+    return Page[WordListOut](
+        items=serialize_word_list(list_words),
+        next_cursor=next_cursor,
+        total=await svc.count_user_words(user_id, lang=lang) if page.include_total else None,
+    )
 
 
 @router.get("/library", response_model=WordLibraryOut)
 async def get_word_library(
-    payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    limit: int = Query(10, ge=1, le=100),
+    bucket: Literal["recent", "high", "medium", "low"] | None = Query(
+        None, description="Fetch only this bucket, continuing from `cursor`."
+    ),
+    cursor: str | None = None,
+    user: UserProfile = Depends(current_user),
+    db: Database = Depends(get_database),
 ):
-    user_id = int(payload.sub)
-    svc = WordServices(db)
-    lang = resolve_user_lang(db, user_id)
-    snapshot = svc.get_library_snapshot(user_id, lang=lang)
+    if cursor and bucket is None:
+        raise HTTPException(status_code=400, detail="cursor requires bucket")
+    try:
+        before_id = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    user_id = user.id
+    svc = db.service(WordServices)
+    lang = resolve_user_lang(user)
+    cursors = {bucket: before_id} if bucket else None
+    snapshot, next_cursors = await svc.get_library_snapshot(user_id, limit=limit, lang=lang, cursors=cursors)
     return {
         "recent": serialize_word_list(snapshot["recent"]),
         "buckets": {
@@ -105,6 +113,7 @@ async def get_word_library(
             "medium": serialize_word_list(snapshot["medium"]),
             "low": serialize_word_list(snapshot["low"]),
         },
+        "next_cursors": next_cursors,
     }
 
 
@@ -113,41 +122,40 @@ async def update_word_in_library(
     word_id: int,
     data: WordLibraryUpdateIn,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     update_payload = data.dict(exclude_unset=True)
     if not update_payload:
         raise HTTPException(status_code=400, detail="Nothing to update")
 
     user_id = int(payload.sub)
-    svc = WordServices(db)
-    entity = svc.update_word_meta(user_id=user_id, word_id=word_id, **update_payload)
+    svc = db.service(WordServices)
+    entity = await svc.update_word_meta(user_id=user_id, word_id=word_id, **update_payload)
     if not entity:
         raise HTTPException(status_code=404, detail="Word not found")
     return serialize_word(entity)
 
 
-def resolve_user_lang(db: Session, user_id: int) -> str:
-    user = db.get(User, user_id)
-    lang = (user.random_word_lang if user else None) or "en"
+def resolve_user_lang(user: UserProfile) -> str:
+    lang = user.random_word_lang or "en"
     lang = lang.lower()
     return lang if lang in VALID_LANGS else "en"
 
 @router.get("/random_session_words")
-async def get_random_session_words(payload: TokenPayload = Depends(security.access_token_required), db: Session = Depends(get_db)):
+async def get_random_session_words(payload: TokenPayload = Depends(security.access_token_required), db: Database = Depends(get_database)):
     user_id = int(payload.sub)
-    svc = WordServices(db)
-    entity = svc.get_random_session_words(user_id=user_id)
+    svc = db.service(WordServices)
+    entity = await svc.get_random_session_words(user_id=user_id)
     if not entity:
         raise HTTPException(status_code=404, detail="Session not found")
     return entity
 
 @router.put("/random_session_words")
-async def increment_random_session_words(payload: TokenPayload = Depends(security.access_token_required), db: Session = Depends(get_db)):
+async def increment_random_session_words(payload: TokenPayload = Depends(security.access_token_required), db: Database = Depends(get_database)):
     user_id = int(payload.sub)
-    svc = WordServices(db)
+    svc = db.service(WordServices)
     try:
-        entity = svc.record_result(user_id=user_id)
+        entity = await svc.record_result(user_id=user_id)
     except ValueError:
         raise HTTPException(status_code=404, detail="Session not found")
     return entity
@@ -1,35 +1,21 @@
 import httpx
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends
 
-from core.config import settings
+from core.http_client import get_http_client
+from schemas.translate import TranslateBatchIn, TranslateBatchOut
+from services.translation_service import TranslationService
 
 router = APIRouter()
 
 @router.post("/translate")
-async def translate(payload: dict):
-    deepl_key = settings.DEEPL_KEY
-    if not deepl_key:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="DeepL key not configured")
-    async with httpx.AsyncClient() as client:
-        try:
-            r = await client.post(
-                "https://api-free.deepl.com/v2/translate",
-                headers={
-                    "Authorization": f"DeepL-Auth-Key {deepl_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "text": [payload["q"]],
-                    "source_lang": payload["source"].upper(),
-                    "target_lang": payload["target"].upper(),
-                }
-            )
-            r.raise_for_status()
-        except httpx.HTTPError as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="DeepL request failed") from exc
+async def translate(payload: dict, client: httpx.AsyncClient = Depends(get_http_client)):
+    svc = TranslationService(client)
+    translated = await svc.translate(text=payload["q"], source=payload["source"], target=payload["target"])
+    return {"translatedText": translated}
 
-        data = r.json()
-        translations = data.get("translations") or []
-        if not translations:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Unexpected DeepL response")
-        return {"translatedText": translations[0]["text"]}
+
+@router.post("/translate/batch", response_model=TranslateBatchOut)
+async def translate_batch(data: TranslateBatchIn, client: httpx.AsyncClient = Depends(get_http_client)):
+    svc = TranslationService(client)
+    translations = await svc.translate_many(data.q, source=data.source, target=data.target)
+    return TranslateBatchOut(translations=translations)
@@ -2,11 +2,10 @@ from collections import Counter
 from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from authx import TokenPayload
 
-from core.database import get_db
+from core.database import Database, get_database
 from routers.auth import security
 from services.wordle_services import WordleServices
 
@@ -53,23 +52,23 @@ def evaluate_guess(guess: str, target: str):
 @router.get("/stats")
 async def get_wordle_stats(
   payload: TokenPayload = Depends(security.access_token_required),
-  db: Session = Depends(get_db),
+  db: Database = Depends(get_database),
 ):
   user_id = int(payload.sub)
-  svc = WordleServices(db)
-  return svc.get_stats(user_id=user_id)
+  svc = db.service(WordleServices)
+  return await svc.get_stats(user_id=user_id)
 
 
 @router.post("/stats/result")
 async def update_wordle_result(
   data: WordleResultIn,
   payload: TokenPayload = Depends(security.access_token_required),
-  db: Session = Depends(get_db),
+  db: Database = Depends(get_database),
 ):
   user_id = int(payload.sub)
-  svc = WordleServices(db)
+  svc = db.service(WordleServices)
   is_win = data.result == "win"
-  return svc.record_result(user_id=user_id, is_win=is_win)
+  return await svc.record_result(user_id=user_id, is_win=is_win)
 
 
 @router.post("/check")
@@ -1,24 +1,19 @@
-from fastapi import APIRouter
-from random import choice
-import csv
+from fastapi import APIRouter, HTTPException, Query
 
-router = APIRouter(prefix="/wordle_random_word", tags=["Wordle"])
-
-with open("eng_words.csv", encoding="utf-8") as content:
-    eng_words = list(csv.DictReader(content))
+from core.corpus import get_corpus
 
-with open("germany_words.csv", encoding="utf-8") as content:
-    germany_words = list(csv.DictReader(content))
+router = APIRouter(prefix="/wordle_random_word", tags=["Wordle"])
 
 @router.get("/{lang}_{target}")
-async def wordle_get(lang: str, target: int):
-
-    if lang == "de":
-        words_csv = germany_words
-    else:
-        words_csv = eng_words
-
-    while True:
-        word = choice(words_csv)["word"]
-        if len(word) == target:
-            return word
+async def wordle_get(
+    lang: str,
+    target: int,
+    level: str | None = Query(None, description="CEFR level filter (English words only)"),
+    min_rank: int | None = Query(None, ge=1, description="Lowest frequency rank (German words only)"),
+    max_rank: int | None = Query(None, ge=1, description="Highest frequency rank (German words only)"),
+):
+    corpus = get_corpus("de" if lang == "de" else "en")
+    word = corpus.pick_by_length(target, level=level, min_rank=min_rank, max_rank=max_rank)
+    if word is None:
+        raise HTTPException(status_code=404, detail="No words match the requested length")
+    return word
@@ -1,56 +1,64 @@
-import csv
-from random import choice, randint
-
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from core.database import get_db
+from core.database import Database, get_database
+from core.pagination import PageParams, page_params
+from core.spelling import is_known_word
 from authx import TokenPayload
 from routers.auth import security
-from schemas.words import WordOut
-from spellchecker import SpellChecker
+from schemas.pagination import Page
+from schemas.words import WordOut, UsedWordOut
 
 from services.words_services import WordChainServices
 router = APIRouter(prefix="/word_chain", tags=["word_chain"])
 
-async def check_word(lang: str, word: str) -> None:
-    spell = SpellChecker(language=lang)
-    misspelled = spell.unknown([word]) 
-    return misspelled
-
-with open("eng_words.csv", encoding="utf-8") as content:
-    eng_words = list(csv.DictReader(content))
-
-with open("germany_words.csv", encoding="utf-8") as content:
-    germany_words = list(csv.DictReader(content))
+def check_word(lang: str, word: str) -> bool:
+    try:
+        return is_known_word(lang, word)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Language is not supported") from exc
 
 @router.post("/add_word/{word}/{lang}")  
 async def add_word(
     word: str,
     lang: str,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     normalized_word = word.lower()
-    checking = await check_word(lang=lang, word=normalized_word)
-    if checking:
+    if not check_word(lang=lang, word=normalized_word):
         raise HTTPException(status_code=400, detail="Incorrect word")
  
     user_id = int(payload.sub)
-    svc = WordChainServices(db)
-    entry = svc.add_word(user_id=user_id, word=normalized_word)
+    svc = db.service(WordChainServices)
+    entry = await svc.add_word(user_id=user_id, word=normalized_word)
     if entry:
         return {"detail": "The word has been saved."}
     raise HTTPException(status_code=400, detail="The word already exsist")
 
 
+@router.get("/used_words", response_model=Page[UsedWordOut])
+async def get_used_words(
+    page: PageParams = Depends(page_params),
+    payload: TokenPayload = Depends(security.access_token_required),
+    db: Database = Depends(get_database),
+):
+    user_id = int(payload.sub)
+    svc = db.service(WordChainServices)
+    words, next_cursor = page.split(await svc.get_words(user_id=user_id, limit=page.fetch_limit, before_id=page.before_id))
+    return Page[UsedWordOut](
+        items=[UsedWordOut(id=entry.id, word=entry.used_word) for entry in words],
+        next_cursor=next_cursor,
+        total=await svc.count_words(user_id=user_id) if page.include_total else None,
+    )
+
+
 @router.delete("/")
 async def clear_user_used_word(
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ):
     user_id = int(payload.sub)
-    svc = WordChainServices(db)
-    svc.clear_words(user_id=user_id)
+    svc = db.service(WordChainServices)
+    await svc.clear_words(user_id=user_id)
     return {"detail": "Word chain reset."}
 
 
@@ -59,34 +67,19 @@ async def bot_word(
     data: WordOut,
     lang: str,
     payload: TokenPayload = Depends(security.access_token_required),
-    db: Session = Depends(get_db),
+    db: Database = Depends(get_database),
 ) -> dict[str, str] | None:
     player_word = (data.word or "").strip().lower()
     if not player_word:
         raise HTTPException(status_code=400, detail="Word is required.")
     user_id = int(payload.sub)
-    svc = WordChainServices(db)
-    history = svc.get_words(user_id=user_id)
-    used_words = {item.used_word.lower() for item in history}
-    used_words.add(player_word)
-
-    first_letter = player_word[-1]
-    attempts = len(history)
-    words_list = eng_words if lang == "en" else germany_words
-
-    candidates = [
-        w["word"]
-        for w in words_list
-        if w["word"].lower().startswith(first_letter) and w["word"].lower() not in used_words
-    ]
-
-    if not candidates:
-        return None  # бот не знает слов → игрок победил
-
-    if attempts >= 80:
-        if randint(1, 10) > 7:
-            return None
-
-    word = choice(candidates)
-    svc.add_word(user_id=user_id, word=word)
+    svc = db.service(WordChainServices)
+    # None: the bot knows no word for the letter or gave up, so the player wins.
+    word = await svc.bot_move(
+        user_id=user_id,
+        lang="en" if lang == "en" else "de",
+        player_word=player_word,
+    )
+    if word is None:
+        return None
     return {"word": word}
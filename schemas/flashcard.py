@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, constr, field_validator
@@ -54,6 +55,17 @@ class DeckUpdateIn(DeckCreateIn):
     pass
 
 
+class ImportRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class DeckImportOut(DeckOut):
+    created: int = 0
+    updated: int = 0
+    errors: list[ImportRowError] = []
+
+
 class FlashcardWordCreateIn(BaseModel):
     word: constr(strip_whitespace=True, min_length=1, max_length=50)
     definition: constr(strip_whitespace=True, min_length=1, max_length=255)
@@ -79,6 +91,7 @@ class FlashcardWordOut(BaseModel):
     definition: str
     example: str | None = None
     difficulty: str | None = None
+    due_at: datetime | None = None
 
 
 class FlashcardWordUpdateIn(FlashcardWordCreateIn):
@@ -92,3 +105,21 @@ class FlashcardWordDifficultyIn(BaseModel):
 class FlashcardSessionOut(BaseModel):
     lang: str
     cards: list[FlashcardWordOut]
+
+
+class LangStatsOut(BaseModel):
+    total: int
+    due: int
+
+
+class DeckStatsOut(LangStatsOut):
+    deck_id: int
+    title: str
+    lang: str
+
+
+class DashboardStatsOut(BaseModel):
+    total_cards: int
+    due_cards: int
+    decks: list[DeckStatsOut]
+    langs: dict[str, LangStatsOut]
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field, constr
+
+
+class TranslateBatchIn(BaseModel):
+    q: list[constr(max_length=1000)] = Field(min_length=1, max_length=500)
+    source: constr(strip_whitespace=True, min_length=2, max_length=5)
+    target: constr(strip_whitespace=True, min_length=2, max_length=5)
+
+
+class TranslateBatchOut(BaseModel):
+    translations: list[str]
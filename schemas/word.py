@@ -36,6 +36,14 @@ class WordLibraryBuckets(BaseModel):
     low: list[WordListOut]
 
 
+class WordLibraryCursors(BaseModel):
+    recent: str | None = None
+    high: str | None = None
+    medium: str | None = None
+    low: str | None = None
+
+
 class WordLibraryOut(BaseModel):
     recent: list[WordListOut]
     buckets: WordLibraryBuckets
+    next_cursors: WordLibraryCursors
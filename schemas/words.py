@@ -2,3 +2,8 @@ from pydantic import BaseModel
 
 class WordOut(BaseModel):
     word: str
+
+
+class UsedWordOut(BaseModel):
+    id: int
+    word: str
@@ -0,0 +1,58 @@
+"""Time argon2 hashing for the configured cost and a few alternatives.
+
+Run from the project root:
+
+    python -m scripts.benchmark_argon2 [--rounds N]
+
+Aim for a single hash well under the login latency budget: with
+PASSWORD_HASH_WORKERS threads a worker can sustain roughly
+workers * 1000 / ms logins per second, and memory cost is paid per
+concurrent hash.
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import argon2
+
+from core.config import settings
+
+CANDIDATES = [
+    (2, 19456, 1),
+    (2, 65536, 1),
+    (3, 65536, 4),
+    (4, 131072, 4),
+]
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, rounds: int) -> list[float]:
+    hasher = argon2.using(rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash("benchmark-password")
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    configured = (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST_KIB, settings.ARGON2_PARALLELISM)
+    candidates = [configured] + [c for c in CANDIDATES if c != configured]
+    print(f"{'t':>3} {'m (KiB)':>9} {'p':>3} {'median ms':>10} {'max ms':>8} {'logins/s':>9}")
+    for time_cost, memory_cost, parallelism in candidates:
+        samples = measure(time_cost, memory_cost, parallelism, args.rounds)
+        median = statistics.median(samples)
+        throughput = settings.PASSWORD_HASH_WORKERS * 1000 / median
+        marker = "  <- configured" if (time_cost, memory_cost, parallelism) == configured else ""
+        print(
+            f"{time_cost:>3} {memory_cost:>9} {parallelism:>3} {median:>10.1f} {max(samples):>8.1f} "
+            f"{throughput:>9.1f}{marker}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Print query plans for the hot repository reads and fail on bad plans.
+
+Run from the project root against a migrated database:
+
+    python -m scripts.explain_queries
+
+The queries are captured from the repository methods themselves, so the
+plans always match the SQL the app actually sends. They run for a throwaway
+user with a deck, cards and words inserted in a transaction that is rolled
+back at the end, so a freshly migrated empty database gets the same plans
+as a populated one and nothing is left behind. A query fails when it sends
+no SELECT at all ("not exercised"), when it
+scans a whole table, sorts rows itself (a temp B-tree on SQLite, a Sort
+node on PostgreSQL; queries in BOUNDED_SORTS excepted) or does not use
+every index listed for it in EXPECTED_INDEXES. On PostgreSQL sequential scans are disabled for the
+session, which makes the planner show whether a usable index exists even
+on a near-empty development database.
+"""
+import json
+import re
+import sys
+import uuid
+from datetime import datetime
+
+from sqlalchemy import event, text
+
+from core.database import Base, SessionLocal, engine
+from models.flashcard import FlashcardDecks
+from models.flashcardWordList import FlashcardWordList
+from models.randomWordList import WordList
+from models.user import User
+from models.wordChain import WordChainList
+from models import flashcard, flashcardWordList, randomWordList, refresh_token, user, user_stats, wordChain  # noqa: F401
+from repositories.flashcard_repo import DeckRepository
+from repositories.flashcard_words_repo import FlashcardWordRepository
+from repositories.random_word_repo import WordRepository
+from repositories.user_stats_repo import UserStatsRepository
+from repositories.wordChain_repo import WordChainRepository
+
+LANG = "en"
+
+# Indexes each query must use. A tuple lists alternative names for the same
+# index: SQLite names the index behind a UNIQUE constraint itself.
+EXPECTED_INDEXES: dict[str, list[str | tuple[str, ...]]] = {
+    "list_decks": ["ix_cardDecks_user_id_id"],
+    "get_deck_by_lang": ["ix_cardDecks_user_lang"],
+    "get_words_by_deck_id": ["ix_flashcard_words_deck_id_id"],
+    "count_due_cards": ["ix_flashcard_words_deck_due_sample"],
+    "get_deck_stats": ["ix_cardDecks_user_id_id", "ix_flashcard_words_deck_due_sample"],
+    "get_session_words_for_lang": ["ix_cardDecks_user_lang", "ix_flashcard_words_deck_due_sample"],
+    "get_all_words": ["ix_user_words_user_lang_id"],
+    "get_words_by_status": ["ix_user_words_user_lang_status_id"],
+    "get_library_buckets": ["ix_user_words_user_lang_id", "ix_user_words_user_lang_status_id"],
+    "get_used_words": ["ix_word_chain_user_id_id"],
+    "get_used_word_values": [("uq_user_word_chain", "sqlite_autoindex_word_chain_1")],
+    "used_words_version": ["ix_word_chain_user_id_id"],
+    "due_counts": ["ix_flashcard_words_deck_due_sample"],
+}
+
+# Queries whose sort is an intended top-N over an index-only range: the
+# session sampler orders the ids of due cards only, across all of a user's
+# decks, and keeps ``limit`` of them.
+BOUNDED_SORTS = {"get_session_words_for_lang"}
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\S+)")
+
+
+def seed(db) -> tuple[int, int]:
+    """Insert one user with a deck, cards and words; return (user_id, deck_id).
+
+    The rows are only flushed: the caller rolls the transaction back.
+    """
+    marker = uuid.uuid4().hex[:12]
+    owner = User(email=f"explain-{marker}@example.invalid", username=f"explain-{marker}", password_hash="-")
+    db.add(owner)
+    db.flush()
+    deck = FlashcardDecks(user_id=owner.id, title="explain", description="", lang=LANG)
+    db.add(deck)
+    db.flush()
+    db.add_all(
+        FlashcardWordList(deck_id=deck.id, word=f"card{i}", definition="-", difficulty=difficulty)
+        for i, difficulty in enumerate(("hard", None, "easy"))
+    )
+    db.add_all(
+        WordList(user_id=owner.id, word=f"word{i}", status=status, lang=LANG)
+        for i, status in enumerate(("hard", "easy"))
+    )
+    db.add(WordChainList(user_id=owner.id, used_word="explain"))
+    db.flush()
+    return owner.id, deck.id
+
+
+def hot_queries(db, user_id: int, deck_id: int):
+    decks = DeckRepository(db)
+    cards = FlashcardWordRepository(db)
+    words = WordRepository(db)
+    chain = WordChainRepository(db)
+    stats = UserStatsRepository(db)
+    return {
+        "list_decks": lambda: decks.list_decks(user_id),
+        "get_deck_by_lang": lambda: decks.get_deck_by_lang(user_id, LANG),
+        "get_words_by_deck_id": lambda: cards.get_words_by_deck_id(deck_id),
+        "count_due_cards": lambda: cards.count_due_cards(user_id),
+        "get_deck_stats": lambda: cards.get_deck_stats(user_id),
+        "get_session_words_for_lang": lambda: cards.get_session_words_for_lang(user_id=user_id, lang=LANG),
+        "get_all_words": lambda: words.get_all_words(user_id, lang=LANG),
+        "get_words_by_status": lambda: words.get_words_by_status(user_id, "hard", lang=LANG),
+        "get_library_buckets": lambda: words.get_library_buckets(
+            user_id,
+            buckets={"recent": (None, None), "high": ("easy", None), "low": ("hard", 100)},
+            lang=LANG,
+        ),
+        "get_used_words": lambda: chain.get_used_words(user_id, limit=50),
+        "get_used_word_values": lambda: chain.get_used_word_values(user_id),
+        "used_words_version": lambda: chain.used_words_version(user_id),
+        "due_counts": lambda: stats._due_counts([user_id], datetime.utcnow()),
+    }
+
+
+def capture(db, call) -> list[tuple[str, object]]:
+    statements: list[tuple[str, object]] = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return [(sql, params) for sql, params in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+def sqlite_plan(conn, sql: str, params) -> tuple[list[str], list[str], set[str]]:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+    lines = [row[-1] for row in rows]
+    problems: list[str] = []
+    indexes: set[str] = set()
+    for line in lines:
+        # "SCAN <table>" without "USING ... INDEX" reads every row of the table;
+        # scans of materialized subqueries and constant rows are fine.
+        if line.startswith("SCAN ") and "USING" not in line and line.split()[1] in Base.metadata.tables:
+            problems.append(f"full scan: {line}")
+        if "USE TEMP B-TREE" in line:
+            problems.append(f"sort: {line}")
+        match = _SQLITE_INDEX.search(line)
+        if match:
+            indexes.add(match.group(1))
+    return lines, problems, indexes
+
+
+def postgres_plan(conn, sql: str, params) -> tuple[list[str], list[str], set[str]]:
+    raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params).scalar_one()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    lines: list[str] = []
+    problems: list[str] = []
+    indexes: set[str] = set()
+
+    def walk(node, depth=0):
+        label = node["Node Type"]
+        if "Relation Name" in node:
+            label += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+            indexes.add(node["Index Name"])
+        lines.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan":
+            problems.append(f"full scan: {label}")
+        if node["Node Type"] in ("Sort", "Incremental Sort"):
+            problems.append(f"sort: {label}")
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(plan[0]["Plan"])
+    return lines, problems, indexes
+
+
+def missing_indexes(name: str, used: set[str]) -> list[str]:
+    missing = []
+    for expected in EXPECTED_INDEXES.get(name, []):
+        names = expected if isinstance(expected, tuple) else (expected,)
+        if not used.intersection(names):
+            missing.append(f"missing index: {' / '.join(names)}")
+    return missing
+
+
+def report(dialect: str, explain, conn, captured: dict[str, list[tuple[str, object]]]) -> int:
+    failures = 0
+    if dialect == "postgresql":
+        conn.execute(text("SET LOCAL enable_seqscan = off"))
+    for name, statements in captured.items():
+        used: set[str] = set()
+        problems: list[str] = [] if statements else ["not exercised: no SELECT was sent"]
+        plans: list[list[str]] = []
+        for sql, params in statements:
+            lines, statement_problems, indexes = explain(conn, sql, params)
+            plans.append(lines)
+            problems.extend(statement_problems)
+            used |= indexes
+        if statements:
+            problems.extend(missing_indexes(name, used))
+        if name in BOUNDED_SORTS:
+            problems = [problem for problem in problems if not problem.startswith("sort: ")]
+        failures += bool(problems)
+        print(f"== {name}: {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"   !! {problem}")
+        for lines in plans:
+            for line in lines:
+                print(f"   {line}")
+    return failures
+
+
+def main() -> int:
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        explain = sqlite_plan
+    elif dialect == "postgresql":
+        explain = postgres_plan
+    else:
+        print(f"Unsupported dialect: {dialect}")
+        return 2
+
+    with SessionLocal() as db:
+        try:
+            queries = hot_queries(db, *seed(db))
+            captured = {name: capture(db, call) for name, call in queries.items()}
+            failures = report(dialect, explain, db.connection(), captured)
+        finally:
+            db.rollback()
+
+    print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} with bad plans")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
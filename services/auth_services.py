@@ -1,27 +1,59 @@
-from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from core.database import Database
 from repositories.user_repo import UserRepository
-from core.security import hash_password, verify_password, create_access_token, create_refresh_token, _to_plain
-from typing import Union
+from core.password_hashing import HashPoolSaturated, password_hash_pool
+from core.security import hash_password, verify_and_update_password
+from typing import Callable, TypeVar, Union
 from pydantic import SecretStr
 
+T = TypeVar("T")
+
+
+async def _hash_off_loop(fn: Callable[..., T], *args) -> T:
+    try:
+        return await password_hash_pool.run(fn, *args)
+    except HashPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _ensure_available(session: Session, email: str, username: str) -> None:
+    repo = UserRepository(session)
+    if repo.get_by_email(email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if repo.get_by_username(username):
+        raise HTTPException(status_code=400, detail="Username already taken")
+
+
 class AuthService:
-    def __init__(self, db: Session):
-        self.repo = UserRepository(db)
+    """Queries go through ``Database``; hashing runs on the password pool in between."""
 
+    def __init__(self, db: Database):
+        self.db = db
 
-    def register(self, *, email: str, username: str, password: Union[str, SecretStr]):
-        if self.repo.get_by_email(email):
-            raise HTTPException(status_code=400, detail="Email already registered")
-        if self.repo.get_by_username(username):
-            raise HTTPException(status_code=400, detail="Username already taken")
-        user = self.repo.create(email=email, username=username, password_hash=hash_password(password))
-        return user
 
+    async def register(self, *, email: str, username: str, password: Union[str, SecretStr]):
+        await self.db.run(_ensure_available, email, username)
+        password_hash = await _hash_off_loop(hash_password, password)
+        return await self.db.run(
+            lambda session: UserRepository(session).create(email=email, username=username, password_hash=password_hash)
+        )
 
-    def login(self, *, email: str, password: Union[str, SecretStr]):
-        user = self.repo.get_by_email(email)
-        if not user or not verify_password(password, user.password_hash):
+
+    async def login(self, *, email: str, password: Union[str, SecretStr]):
+        user = await self.db.run(lambda session: UserRepository(session).get_by_email(email))
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        valid, new_hash = await _hash_off_loop(verify_and_update_password, password, user.password_hash)
+        if not valid:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        if new_hash:
+            # Stored with older ARGON2_* settings; upgrade while we have the password.
+            await self.db.run(
+                lambda session: UserRepository(session).update_password_hash(user_id=user.id, password_hash=new_hash)
+            )
         return user
-        
\ No newline at end of file
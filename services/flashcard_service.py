@@ -1,15 +1,21 @@
+from typing import Iterable, Iterator
+
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from models.flashcard import FlashcardDecks
 from models.flashcardWordList import FlashcardWordList
 from repositories.flashcard_repo import DeckRepository
 from repositories.flashcard_words_repo import FlashcardWordRepository
+from repositories.user_stats_repo import CARD_DIFFICULTY_COLUMNS, WORD_STATUS_COLUMNS, UserStatsRepository
 
 
 class FlashcardService:
     def __init__(self, db: Session):
+        self.db = db
         self.deck_repo = DeckRepository(db)
         self.word_repo = FlashcardWordRepository(db)
+        self.stats_repo = UserStatsRepository(db)
 
     def save_deck(
         self,
@@ -28,8 +34,11 @@ class FlashcardService:
             lang=lang,
         )
 
-    def list_decks(self, user_id: int) -> list[FlashcardDecks]:
-        return self.deck_repo.list_decks(user_id)
+    def list_decks(self, user_id: int, *, limit: int | None = None, before_id: int | None = None) -> list[FlashcardDecks]:
+        return self.deck_repo.list_decks(user_id, limit=limit, before_id=before_id)
+
+    def count_decks(self, user_id: int) -> int:
+        return self.deck_repo.count_decks(user_id)
         
     def list_decks_by_lang(self, user_id: int, lang: str) -> list[FlashcardDecks]:
         return self.deck_repo.get_deck_by_lang(user_id=user_id, lang=lang)
@@ -51,8 +60,55 @@ class FlashcardService:
             difficulty=difficulty,
         )
 
-    def list_words(self, deck_id: int) -> list[FlashcardWordList]:
-        return self.word_repo.get_words_by_deck_id(deck_id)
+    def import_deck(
+        self,
+        *,
+        user_id: int,
+        title: str,
+        description: str,
+        category: str | None,
+        lang: str,
+        rows: Iterable[dict[str, str | None]],
+        batch_size: int = 500,
+    ) -> tuple[FlashcardDecks, dict[str, int]]:
+        """Create or update a deck and upsert ``rows`` into it in one transaction.
+
+        ``rows`` is consumed lazily, so a streaming parser only ever holds one
+        batch in memory. Nothing is committed if the rows produce no cards or
+        the iterator raises.
+        """
+        try:
+            deck = self.deck_repo.save_deck(
+                user_id=user_id,
+                title=title,
+                description=description,
+                category=category,
+                lang=lang,
+                commit=False,
+            )
+            counts = self.word_repo.bulk_upsert_words(
+                deck_id=deck.id,
+                rows=rows,
+                batch_size=batch_size,
+                commit=False,
+            )
+            if not counts["created"] and not counts["updated"]:
+                raise ValueError("CSV must contain at least one valid row.")
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        self.db.refresh(deck)
+        return deck, counts
+
+    def list_words(self, deck_id: int, *, limit: int | None = None, before_id: int | None = None) -> list[FlashcardWordList]:
+        return self.word_repo.get_words_by_deck_id(deck_id, limit=limit, before_id=before_id)
+
+    def count_words(self, deck_id: int) -> int:
+        return self.word_repo.count_words_in_deck(deck_id)
+
+    def iter_export_rows(self, *, user_id: int, deck_id: int | None = None) -> Iterator[Row]:
+        return self.word_repo.iter_export_rows(user_id=user_id, deck_id=deck_id)
 
     def get_deck(self, *, user_id: int, deck_id: int) -> FlashcardDecks | None:
         return self.deck_repo.get_deck(deck_id, user_id)
@@ -100,12 +156,38 @@ class FlashcardService:
         )
 
     def count_user_cards(self, user_id: int) -> int:
-        return self.word_repo.count_words_for_user(user_id)
+        return self.stats_repo.get(user_id).total_cards
 
     def count_due_cards(self, user_id: int) -> int:
-        decks = self.deck_repo.list_decks(user_id)
-        deck_ids = [deck.id for deck in decks]
-        return self.word_repo.count_due_cards(deck_ids)
+        return self.stats_repo.get(user_id).due_cards
+
+    def get_user_stats(self, user_id: int) -> dict:
+        stats = self.stats_repo.get(user_id)
+        return {
+            "total_cards": stats.total_cards,
+            "due_cards": stats.due_cards,
+            "difficulty": {
+                (difficulty or "unrated"): getattr(stats, column)
+                for difficulty, column in CARD_DIFFICULTY_COLUMNS.items()
+            },
+            "word_statuses": {status: getattr(stats, column) for status, column in WORD_STATUS_COLUMNS.items()},
+        }
+
+    def get_dashboard_stats(self, user_id: int) -> dict:
+        decks = []
+        per_lang: dict[str, dict[str, int]] = {}
+        total = due = 0
+        for row in self.word_repo.get_deck_stats(user_id):
+            deck_due = int(row.due)
+            decks.append(
+                {"deck_id": row.deck_id, "title": row.title, "lang": row.lang, "total": row.total, "due": deck_due}
+            )
+            lang_stats = per_lang.setdefault(row.lang, {"total": 0, "due": 0})
+            lang_stats["total"] += row.total
+            lang_stats["due"] += deck_due
+            total += row.total
+            due += deck_due
+        return {"total_cards": total, "due_cards": due, "decks": decks, "langs": per_lang}
 
     def update_word_difficulty(
         self,
@@ -117,6 +199,4 @@ class FlashcardService:
         return self.word_repo.update_difficulty(deck_id=deck_id, word_id=word_id, difficulty=difficulty)
 
     def get_session_cards_for_lang(self, *, user_id: int, lang: str, limit: int = 10) -> list[FlashcardWordList]:
-        decks = self.deck_repo.get_deck_by_lang(user_id=user_id, lang=lang)
-        deck_ids = [deck.id for deck in decks]
-        return self.word_repo.get_session_words_by_decks(deck_ids=deck_ids, limit=limit)
+        return self.word_repo.get_session_words_for_lang(user_id=user_id, lang=lang, limit=limit)
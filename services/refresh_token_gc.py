@@ -0,0 +1,83 @@
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from repositories.refresh_token_repo import RefreshTokenRepository
+from services import scheduler
+
+JOB_NAME = "refresh_token_gc"
+
+
+@dataclass
+class RefreshTokenGcStats:
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    total_deleted: int = 0
+    last_started_at: datetime | None = None
+    last_duration_ms: float | None = None
+    last_deleted: int | None = None
+    last_error: str | None = None
+
+
+_stats = RefreshTokenGcStats()
+_stats_lock = threading.Lock()
+
+
+def retention_cutoff(now: datetime | None = None) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=settings.REFRESH_TOKEN_GC_RETENTION_DAYS)
+
+
+def collect_stale_refresh_tokens(db: Session) -> int:
+    repo = RefreshTokenRepository(db)
+    deleted = repo.delete_stale(
+        cutoff=retention_cutoff(),
+        chunk_size=settings.REFRESH_TOKEN_GC_CHUNK_SIZE,
+        pause_seconds=settings.REFRESH_TOKEN_GC_PAUSE_SECONDS,
+    )
+    if deleted and settings.REFRESH_TOKEN_GC_COMPACT:
+        repo.compact()
+    return deleted
+
+
+def run_refresh_token_gc() -> bool:
+    """Run one collection unless another worker or request is already running it."""
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    try:
+        ran, deleted = scheduler.run_leased(
+            JOB_NAME, collect_stale_refresh_tokens, lease_seconds=settings.JOB_LEASE_SECONDS
+        )
+    except Exception as exc:
+        with _stats_lock:
+            _stats.failures += 1
+            _stats.last_error = str(exc)
+        raise
+    with _stats_lock:
+        if not ran:
+            _stats.skipped += 1
+            return False
+        _stats.runs += 1
+        _stats.total_deleted += deleted
+        _stats.last_started_at = started_at
+        _stats.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        _stats.last_deleted = deleted
+        _stats.last_error = None
+    return True
+
+
+def refresh_token_gc_stats(db: Session) -> dict[str, object]:
+    repo = RefreshTokenRepository(db)
+    with _stats_lock:
+        stats = asdict(_stats)
+    stats.update(
+        table_rows=repo.count_all(),
+        collectable_rows=repo.count_stale(cutoff=retention_cutoff()),
+        retention_days=settings.REFRESH_TOKEN_GC_RETENTION_DAYS,
+    )
+    return stats
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from random import uniform
+from typing import Callable, Iterator
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from repositories.job_run_repo import JobRunRepository
+
+# Identifies this process in job_runs.locked_by.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+def run_owner() -> str:
+    """A lease owner for one run, so two runs in this process exclude each other too."""
+    return f"{WORKER_ID}:{uuid4().hex[:12]}"
+
+
+@contextmanager
+def renewing_lease(name: str, *, owner: str, lease_seconds: int) -> Iterator[None]:
+    """Keep extending ``owner``'s lease on ``name`` while the block runs.
+
+    Renewal happens every third of the lease on a thread with its own
+    session, so a job that outlasts one lease is not taken over halfway.
+    """
+    stop = threading.Event()
+
+    def renew() -> None:
+        while not stop.wait(lease_seconds / 3):
+            db = SessionLocal()
+            try:
+                if not JobRunRepository(db).renew(name, owner=owner, lease_seconds=lease_seconds):
+                    print(f"Lease on job {name} was lost")
+                    return
+            except Exception as e:
+                print(f"Renewing the lease on job {name} failed: {e}")
+            finally:
+                db.close()
+
+    thread = threading.Thread(target=renew, name=f"lease-{name}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def last_boundary(now: datetime, hour: int) -> datetime:
+    """Most recent daily run slot at ``hour`` UTC that is not in the future."""
+    slot = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    return slot if slot <= now else slot - timedelta(days=1)
+
+
+def seconds_until_due(last_run_at: datetime | None, now: datetime, hour: int) -> float:
+    boundary = last_boundary(now, hour)
+    if last_run_at is None or last_run_at < boundary:
+        return 0.0
+    return (boundary + timedelta(days=1) - now).total_seconds()
+
+
+def run_job_once(
+    name: str,
+    job: Callable[[Session], object],
+    *,
+    hour: int,
+    lease_seconds: int,
+    owner: str | None = None,
+) -> bool:
+    """Run ``job`` if this worker wins the lease and the current slot has not run yet.
+
+    Returns False when another run holds the lease or already ran the slot.
+    """
+    owner = owner or run_owner()
+    db = SessionLocal()
+    try:
+        repo = JobRunRepository(db)
+        if not repo.try_acquire(name, owner=owner, lease_seconds=lease_seconds):
+            return False
+        try:
+            started_at = datetime.utcnow()
+            last_run_at = repo.last_run_at(name)
+            if last_run_at is not None and last_run_at >= last_boundary(started_at, hour):
+                return False
+            with renewing_lease(name, owner=owner, lease_seconds=lease_seconds):
+                job(db)
+            repo.mark_run(name, at=started_at)
+            return True
+        finally:
+            db.rollback()
+            repo.release(name, owner=owner)
+    finally:
+        db.close()
+
+
+def run_leased(
+    name: str,
+    job: Callable[[Session], object],
+    *,
+    lease_seconds: int,
+    owner: str | None = None,
+) -> tuple[bool, object]:
+    """Run ``job`` unless another run holds ``name``'s lease; return (ran, result)."""
+    owner = owner or run_owner()
+    db = SessionLocal()
+    try:
+        repo = JobRunRepository(db)
+        repo.get_or_create(name)
+        if not repo.try_acquire(name, owner=owner, lease_seconds=lease_seconds):
+            return False, None
+        try:
+            started_at = datetime.utcnow()
+            with renewing_lease(name, owner=owner, lease_seconds=lease_seconds):
+                result = job(db)
+            repo.mark_run(name, at=started_at)
+            return True, result
+        finally:
+            db.rollback()
+            repo.release(name, owner=owner)
+    finally:
+        db.close()
+
+
+def _last_run_at(name: str) -> datetime | None:
+    db = SessionLocal()
+    try:
+        # A job seen for the first time starts counting from now instead of
+        # firing immediately on the first deploy.
+        return JobRunRepository(db).get_or_create(name, last_run_at=datetime.utcnow()).last_run_at
+    finally:
+        db.close()
+
+
+async def run_daily(
+    name: str,
+    job: Callable[[Session], object],
+    *,
+    hour: int,
+    jitter_seconds: float,
+    lease_seconds: int,
+    retry_seconds: float,
+) -> None:
+    """Run ``job`` once per day at ``hour`` UTC across all workers.
+
+    The last successful run is stored in job_runs, so a restart catches up on
+    a missed slot instead of skipping it and never runs a slot twice. Jitter
+    spreads the workers' attempts so they do not all race for the lease.
+    """
+    while True:
+        last_run_at = await asyncio.to_thread(_last_run_at, name)
+        delay = seconds_until_due(last_run_at, datetime.utcnow(), hour)
+        await asyncio.sleep(delay + uniform(0, jitter_seconds))
+        try:
+            ran = await asyncio.to_thread(
+                run_job_once, name, job, hour=hour, lease_seconds=lease_seconds
+            )
+        except Exception as e:
+            print(f"Scheduled job {name} failed: {e}")
+            ran = False
+        if not ran:
+            await asyncio.sleep(retry_seconds)
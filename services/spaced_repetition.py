@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# A failed card comes back within the same study session instead of tomorrow.
+RELEARN_DELAY = timedelta(minutes=10)
+
+# SM-2 answer quality (0-5) for each rating the flashcard UI can send.
+GRADE_QUALITY = {
+    "hard": 2,
+    "medium": 4,
+    "easy": 5,
+}
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    due_at: datetime
+    interval_days: int = 0
+    ease: float = DEFAULT_EASE
+    repetitions: int = 0
+
+
+def schedule_review(state: ReviewState, grade: str | None, now: datetime) -> ReviewState:
+    """Return the SM-2 state after answering a card with ``grade``.
+
+    ``None`` clears the rating: the card is due again and starts over.
+    """
+    quality = GRADE_QUALITY.get(grade) if grade else None
+    if quality is None:
+        return ReviewState(due_at=now, ease=state.ease)
+
+    ease = state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    ease = max(MIN_EASE, round(ease, 4))
+
+    if quality < 3:
+        return ReviewState(due_at=now + RELEARN_DELAY, interval_days=0, ease=ease, repetitions=0)
+
+    if state.repetitions == 0:
+        interval = 1
+    elif state.repetitions == 1:
+        interval = 6
+    else:
+        interval = max(1, round(state.interval_days * state.ease))
+    return ReviewState(
+        due_at=now + timedelta(days=interval),
+        interval_days=interval,
+        ease=ease,
+        repetitions=state.repetitions + 1,
+    )
@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+from fastapi import HTTPException, status
+
+from core.cache import TTLCache
+from core.config import settings
+
+
+TranslationKey = tuple[str, str, str]
+
+_cache: TTLCache[TranslationKey, str] = TTLCache(
+    maxsize=settings.TRANSLATION_CACHE_SIZE,
+    ttl=settings.TRANSLATION_CACHE_TTL_SECONDS,
+)
+# Upstream lookups currently running, so concurrent requests for the same
+# text wait on one DeepL call instead of issuing their own.
+_inflight: dict[TranslationKey, asyncio.Future] = {}
+# The DeepL calls behind ``_inflight`` run as their own tasks so they outlive
+# the request that started them; the loop only keeps weak references.
+_fetches: set[asyncio.Task] = set()
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+class TranslationService:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def translate(self, *, text: str, source: str, target: str) -> str:
+        return (await self.translate_many([text], source=source, target=target))[0]
+
+    async def translate_many(self, texts: list[str], *, source: str, target: str) -> list[str]:
+        source, target = source.upper(), target.upper()
+        keys = [(source, target, normalize_text(text)) for text in texts]
+
+        results: dict[TranslationKey, str] = {}
+        pending: dict[TranslationKey, asyncio.Future] = {}
+        misses: list[TranslationKey] = []
+        loop = asyncio.get_running_loop()
+        for key in dict.fromkeys(keys):
+            if not key[2]:
+                results[key] = ""
+                continue
+            cached = _cache.get(key)
+            if cached is not None:
+                results[key] = cached
+                continue
+            future = _inflight.get(key)
+            if future is None:
+                future = loop.create_future()
+                _inflight[key] = future
+                misses.append(key)
+            pending[key] = future
+
+        size = max(1, settings.TRANSLATION_BATCH_SIZE)
+        for start in range(0, len(misses), size):
+            task = asyncio.create_task(self._fetch_chunk(misses[start:start + size], source=source, target=target))
+            _fetches.add(task)
+            task.add_done_callback(_fetches.discard)
+
+        for key, future in pending.items():
+            # Shielded so a caller that disconnects does not cancel the
+            # shared future the other waiters are on.
+            results[key] = await asyncio.shield(future)
+        return [results[key] for key in keys]
+
+    async def _fetch_chunk(self, keys: list[TranslationKey], *, source: str, target: str) -> None:
+        try:
+            translated = await self._request([key[2] for key in keys], source=source, target=target)
+        except BaseException as exc:
+            failure = exc
+            if isinstance(exc, asyncio.CancelledError):
+                failure = HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="DeepL request failed")
+            for key in keys:
+                future = _inflight.pop(key)
+                future.set_exception(failure)
+                # Mark as retrieved; callers that care await the future themselves.
+                future.exception()
+            if failure is not exc:
+                raise
+            return
+
+        for key, text in zip(keys, translated):
+            _cache.set(key, text)
+            _inflight.pop(key).set_result(text)
+
+    async def _request(self, texts: list[str], *, source: str, target: str) -> list[str]:
+        deepl_key = settings.DEEPL_KEY
+        if not deepl_key:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="DeepL key not configured")
+        try:
+            r = await self.client.post(
+                settings.DEEPL_API_URL,
+                headers={
+                    "Authorization": f"DeepL-Auth-Key {deepl_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "text": texts,
+                    "source_lang": source,
+                    "target_lang": target,
+                },
+            )
+            r.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="DeepL request failed") from exc
+
+        translations = r.json().get("translations") or []
+        if len(translations) != len(texts):
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Unexpected DeepL response")
+        return [item["text"] for item in translations]
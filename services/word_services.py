@@ -1,10 +1,19 @@
 from sqlalchemy.orm import Session
 
+from core.pagination import encode_cursor
 from models.randomWordList import WordList
 from repositories.random_word_repo import WordRepository
 from repositories.user_repo import UserRepository
 
 
+LIBRARY_BUCKETS = {
+    "recent": None,
+    "high": "easy",
+    "medium": "ok",
+    "low": "hard",
+}
+
+
 class WordServices:
     UNSET = object()
 
@@ -46,19 +55,51 @@ class WordServices:
             updates=updates,
         )
 
-    def get_user_words(self, user_id: int, limit: int = 10, lang: str | None = None) -> list[WordList]:
-        return self.repo.get_all_words(user_id, limit=limit, lang=lang)
+    def get_user_words(
+        self,
+        user_id: int,
+        limit: int = 10,
+        lang: str | None = None,
+        *,
+        before_id: int | None = None,
+    ) -> list[WordList]:
+        return self.repo.get_all_words(user_id, limit=limit, lang=lang, before_id=before_id)
+
+    def count_user_words(self, user_id: int, lang: str | None = None) -> int:
+        return self.repo.count_words(user_id, lang=lang)
 
     def get_words_by_status(self, user_id: int, status: str, limit: int = 10, lang: str | None = None) -> list[WordList]:
         return self.repo.get_words_by_status(user_id, status=status, limit=limit, lang=lang)
 
-    def get_library_snapshot(self, user_id: int, limit: int = 10, lang: str | None = None) -> dict[str, list[WordList]]:
-        return {
-            "recent": self.repo.get_all_words(user_id, limit=limit, lang=lang),
-            "high": self.repo.get_words_by_status(user_id, status="easy", limit=limit, lang=lang),
-            "medium": self.repo.get_words_by_status(user_id, status="ok", limit=limit, lang=lang),
-            "low": self.repo.get_words_by_status(user_id, status="hard", limit=limit, lang=lang),
-        }
+    def get_library_snapshot(
+        self,
+        user_id: int,
+        limit: int = 10,
+        lang: str | None = None,
+        *,
+        cursors: dict[str, int | None] | None = None,
+    ) -> tuple[dict[str, list[WordList]], dict[str, str | None]]:
+        """Return one page per bucket plus the cursor for each bucket's next page.
+
+        Without ``cursors`` every bucket starts from its newest word; with
+        them only the listed buckets are fetched, continuing below the given ids.
+        """
+        if cursors is None:
+            cursors = dict.fromkeys(LIBRARY_BUCKETS)
+        rows = self.repo.get_library_buckets(
+            user_id,
+            buckets={name: (LIBRARY_BUCKETS[name], before_id) for name, before_id in cursors.items()},
+            limit=limit,
+            lang=lang,
+        )
+        snapshot: dict[str, list[WordList]] = {name: [] for name in LIBRARY_BUCKETS}
+        next_cursors: dict[str, str | None] = dict.fromkeys(LIBRARY_BUCKETS)
+        for name, words in rows.items():
+            snapshot[name] = words[:limit]
+            if len(words) > limit:
+                next_cursors[name] = encode_cursor(words[limit - 1].id)
+        return snapshot, next_cursors
+
     def get_random_session_words(self, *, user_id: int) -> dict:
         return self.user_repo.get_random_session_words(user_id=user_id)
 
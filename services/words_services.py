@@ -1,18 +1,188 @@
+import threading
+from collections import OrderedDict
+from random import randint, randrange
+from typing import Iterable
+
 from sqlalchemy.orm import Session
 
+from core.corpus import LanguageCorpus, get_corpus
 from models.wordChain import WordChainList
 from repositories.wordChain_repo import WordChainRepository
 
 
+class CandidatePool:
+    """Unused words for one starting letter with O(1) pick and removal."""
+
+    __slots__ = ("_items", "_positions")
+
+    def __init__(self, words: tuple[str, ...], used: set[str]):
+        self._items: list[str] = []
+        self._positions: dict[str, int] = {}
+        for word in words:
+            key = word.lower()
+            if key in used or key in self._positions:
+                continue
+            self._positions[key] = len(self._items)
+            self._items.append(word)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def discard(self, key: str) -> None:
+        index = self._positions.pop(key, None)
+        if index is None:
+            return
+        last = self._items.pop()
+        if index < len(self._items):
+            self._items[index] = last
+            self._positions[last.lower()] = index
+
+    def choice(self) -> str | None:
+        if not self._items:
+            return None
+        return self._items[randrange(len(self._items))]
+
+
+class WordChainGame:
+    """Per-user word-chain state: used words plus lazily built per-letter pools.
+
+    ``version`` is the (count, highest id) of the stored words this state was
+    built from, or None before the first load. Other workers write to the
+    same table, so a cached game is reloaded whenever the stored version no
+    longer matches. Requests run on threadpool workers, so anything that
+    reads or changes the game holds ``lock``.
+    """
+
+    __slots__ = ("lang", "corpus", "used", "version", "lock", "_pools")
+
+    def __init__(
+        self,
+        *,
+        lang: str,
+        corpus: LanguageCorpus,
+        used_words: Iterable[str] = (),
+        version: tuple[int, int | None] | None = None,
+    ):
+        self.lang = lang
+        self.corpus = corpus
+        self.lock = threading.RLock()
+        self.used: set[str] = set()
+        self.version: tuple[int, int | None] | None = None
+        self._pools: dict[str, CandidatePool] = {}
+        self.reload(used_words, version)
+
+    def reload(self, used_words: Iterable[str], version: tuple[int, int | None] | None) -> None:
+        self.used = {word.lower() for word in used_words}
+        self.version = version
+        self._pools = {}
+
+    @property
+    def used_count(self) -> int:
+        return len(self.used)
+
+    def mark_used(self, word: str) -> None:
+        key = word.lower()
+        self.used.add(key)
+        pool = self._pools.get(key[:1])
+        if pool is not None:
+            pool.discard(key)
+
+    def stored(self, word_id: int) -> None:
+        """Account for a word this worker just inserted."""
+        if self.version is None:
+            return
+        count, max_id = self.version
+        self.version = (count + 1, max(word_id, max_id or 0))
+
+    def _pool(self, letter: str) -> CandidatePool:
+        letter = letter[:1].lower()
+        pool = self._pools.get(letter)
+        if pool is None:
+            pool = CandidatePool(self.corpus.words_starting_with(letter), self.used)
+            self._pools[letter] = pool
+        return pool
+
+    def has_candidates(self, letter: str) -> bool:
+        return len(self._pool(letter)) > 0
+
+    def pick(self, letter: str) -> str | None:
+        return self._pool(letter).choice()
+
+
+MAX_CACHED_GAMES = 2048
+# Bot gives up at random once this many words have been played.
+TIRED_AFTER_WORDS = 80
+_games: "OrderedDict[int, WordChainGame]" = OrderedDict()
+_games_lock = threading.Lock()
+
+
 class WordChainServices:
     def __init__(self, db: Session):
         self.repo = WordChainRepository(db)
 
     def add_word(self, *, user_id: int, word: str) -> WordChainList | None:
-        return self.repo.add_used_word(user_id=user_id, word=word)
+        entity = self.repo.add_used_word(user_id=user_id, word=word)
+        with _games_lock:
+            game = _games.get(user_id)
+        if game is not None:
+            with game.lock:
+                game.mark_used(word)
+                if entity is not None:
+                    game.stored(entity.id)
+        return entity
+
+    def get_words(self, *, user_id: int, limit: int | None = None, before_id: int | None = None) -> list[WordChainList]:
+        return self.repo.get_used_words(user_id=user_id, limit=limit, before_id=before_id)
 
-    def get_words(self, *, user_id: int, limit: int | None = None) -> list[WordChainList]:
-        return self.repo.get_used_words(user_id=user_id, limit=limit)
+    def count_words(self, *, user_id: int) -> int:
+        return self.repo.count_used_words(user_id=user_id)
 
     def clear_words(self, *, user_id: int) -> None:
         self.repo.clear_user_words(user_id=user_id)
+        with _games_lock:
+            _games.pop(user_id, None)
+
+    def get_game(self, *, user_id: int, lang: str) -> WordChainGame:
+        corpus = get_corpus(lang)
+        with _games_lock:
+            game = _games.get(user_id)
+            if game is None or game.lang != lang or game.corpus is not corpus:
+                game = WordChainGame(lang=lang, corpus=corpus)
+                _games[user_id] = game
+                while len(_games) > MAX_CACHED_GAMES:
+                    _games.popitem(last=False)
+            else:
+                _games.move_to_end(user_id)
+        # Checked under the game's lock so a move in flight on another thread
+        # has either finished (and advanced ``version``) or not started.
+        with game.lock:
+            version = self.repo.used_words_version(user_id)
+            if game.version != version:
+                game.reload(self.repo.get_used_word_values(user_id), version)
+        return game
+
+    def play_bot_word(self, *, user_id: int, game: WordChainGame, letter: str) -> str | None:
+        with game.lock:
+            while True:
+                word = game.pick(letter)
+                if word is None:
+                    return None
+                game.mark_used(word)
+                # Another worker may have stored this word already; try the next one.
+                entity = self.repo.add_used_word(user_id=user_id, word=word)
+                if entity is not None:
+                    game.stored(entity.id)
+                    return word
+
+    def bot_move(self, *, user_id: int, lang: str, player_word: str) -> str | None:
+        """Answer ``player_word`` with a word starting on its last letter, or None if the bot gives up."""
+        game = self.get_game(user_id=user_id, lang=lang)
+        with game.lock:
+            attempts = game.used_count
+            game.mark_used(player_word)
+            letter = player_word[-1]
+            if not game.has_candidates(letter):
+                return None
+            if attempts >= TIRED_AFTER_WORDS and randint(1, 10) > 7:
+                return None
+            return self.play_bot_word(user_id=user_id, game=game, letter=letter)
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time, so the environment has to be in place
+# before any application module is imported.
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("PRELOAD_SPELLCHECKERS", "false")
+os.environ.setdefault("DB_REPORT_ON_STARTUP", "false")
+# Cheap hashes keep the auth flows fast; the cost itself is not under test.
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST_KIB", "8192")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+import models.flashcard, models.flashcardWordList, models.job_run, models.randomWordList  # noqa: E401,F401
+import models.refresh_token, models.user, models.user_stats, models.wordChain  # noqa: E401,F401
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'repo.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,90 @@
+import threading
+
+from core.counters import CounterBuffer, CounterDelta
+
+
+def test_increments_and_resets_merge_in_order():
+    delta = CounterDelta()
+    delta.add("wins", 2)
+    delta.reset("streak")
+    delta.add("streak", 1)
+
+    later = CounterDelta()
+    later.reset("wins")
+    later.add("wins", 1)
+    merged = delta.then(later)
+
+    assert merged.apply("wins", 10) == 1
+    assert merged.apply("streak", 7) == 1
+    assert merged.apply("losses", 3) == 3
+    assert delta.apply("wins", 10) == 12
+
+
+def test_add_reports_when_a_flush_is_due():
+    buffer = CounterBuffer(max_pending=2)
+
+    assert buffer.add(1, "wins") is False
+    assert buffer.add(1, "wins") is False
+    assert buffer.add(2, "wins") is True
+
+
+def test_drained_deltas_stay_visible_until_complete():
+    buffer = CounterBuffer(max_pending=10)
+    buffer.add(1, "wins", 2)
+
+    drained = buffer.drain()
+    buffer.add(1, "wins")
+
+    assert drained[1].increments == {"wins": 2}
+    assert buffer.drain() == {}
+    assert buffer.pending(1).apply("wins", 0) == 3
+
+    buffer.complete()
+    assert buffer.pending(1).apply("wins", 0) == 1
+
+
+def test_restore_puts_failed_deltas_ahead_of_newer_ones():
+    buffer = CounterBuffer(max_pending=10)
+    buffer.add(1, "streak", 3)
+    buffer.drain()
+    buffer.reset(1, "streak")
+    buffer.add(1, "streak")
+
+    buffer.restore()
+
+    assert buffer.pending(1).apply("streak", 5) == 1
+    assert list(buffer.drain()) == [1]
+
+
+def test_version_is_odd_only_while_a_flush_commits():
+    buffer = CounterBuffer(max_pending=10)
+    buffer.add(1, "wins")
+    before = buffer.stable_version()
+
+    buffer.drain()
+    assert buffer.snapshot(1)[0] == before
+    buffer.begin_commit()
+    committing, _ = buffer.snapshot(1)
+    buffer.complete()
+    after, delta = buffer.snapshot(1)
+
+    assert committing % 2 == 1
+    assert after % 2 == 0 and after != before
+    assert delta is None
+
+
+def test_stable_version_waits_for_the_commit_to_finish():
+    buffer = CounterBuffer(max_pending=10)
+    buffer.add(1, "wins")
+    buffer.drain()
+    buffer.begin_commit()
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(buffer.stable_version()))
+    reader.start()
+
+    reader.join(timeout=0.1)
+    assert reader.is_alive()
+
+    buffer.restore()
+    reader.join(timeout=1)
+    assert seen and seen[0] % 2 == 0
@@ -0,0 +1,120 @@
+"""Run the same request flows against the sync and the async engine."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import core.database as database
+import main
+from core.config import settings
+from core.database import Base, Database, SessionLocal, async_database_url, configure_engine, engine_options
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tables():
+    Base.metadata.create_all(database.engine)
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    if request.param == "sync":
+
+        async def provider():
+            session = SessionLocal()
+            try:
+                yield Database(session)
+            finally:
+                session.close()
+
+        main.app.dependency_overrides[database.get_database] = provider
+        yield "sync"
+    else:
+        async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL)
+        )
+        configure_engine(async_engine.sync_engine)
+        sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def provider():
+            async with sessions() as session:
+                assert isinstance(Database(session).session, database.AsyncSession)
+                yield Database(session)
+
+        main.app.dependency_overrides[database.get_database] = provider
+        yield "async"
+    main.app.dependency_overrides.pop(database.get_database, None)
+
+
+def csrf(client: TestClient, kind: str = "access") -> dict[str, str]:
+    return {"X-CSRF-TOKEN": client.cookies.get(f"csrf_{kind}_token")}
+
+
+def sign_in(name: str) -> TestClient:
+    client = TestClient(main.app)
+    credentials = {"email": f"{name}@example.com", "password": "Passw0rd!"}
+    response = client.post("/user/register", json={**credentials, "username": name})
+    assert response.status_code == 200, response.text
+    response = client.post("/user/login", json=credentials)
+    assert response.status_code == 200, response.text
+    return client
+
+
+def test_auth_flow(mode):
+    client = sign_in(f"auth_{mode}")
+
+    assert client.get("/user/me").status_code == 200
+    duplicate = client.post(
+        "/user/register", json={"email": f"auth_{mode}@example.com", "username": f"other_{mode}", "password": "Passw0rd!"}
+    )
+    assert duplicate.status_code == 400
+    wrong = client.post("/user/login", json={"email": f"auth_{mode}@example.com", "password": "Wrong-passw0rd"})
+    assert wrong.status_code == 401
+
+    old_refresh = client.cookies.get("refresh_token")
+    assert client.post("/user/refresh", headers=csrf(client, "refresh")).status_code == 200
+    assert client.cookies.get("refresh_token") != old_refresh
+
+    assert client.post("/user/logout", headers=csrf(client, "refresh")).status_code == 200
+    stale = TestClient(main.app)
+    stale.cookies.set("refresh_token", old_refresh)
+    assert stale.post("/user/refresh", headers={"X-CSRF-TOKEN": "x"}).status_code == 401
+
+
+def test_settings_decks_and_counters(mode):
+    client = sign_in(f"settings_{mode}")
+
+    response = client.put(
+        "/user/settings", json={"random_word_lang": "de", "theme": "sapphire"}, headers=csrf(client)
+    )
+    assert response.json() == {"random_word_lang": "de", "theme": "sapphire"}
+    assert client.get("/user/settings").json() == {"random_word_lang": "de", "theme": "sapphire"}
+
+    for title in ("one", "two", "three"):
+        response = client.post(
+            "/flashcard/decks", json={"title": title, "description": "d", "lang": "en"}, headers=csrf(client)
+        )
+        assert response.status_code == 201, response.text
+    first = client.get("/flashcard/decks", params={"limit": 2, "include_total": True}).json()
+    assert [deck["title"] for deck in first["items"]] == ["three", "two"]
+    assert first["total"] == 3
+    rest = client.get("/flashcard/decks", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [deck["title"] for deck in rest["items"]] == ["one"]
+    assert rest["next_cursor"] is None
+
+    client.post("/wordle/stats/result", json={"result": "win"}, headers=csrf(client))
+    assert client.get("/wordle/stats").json()["wins"] == 1
+
+
+def test_import_runs_in_both_modes(mode):
+    client = sign_in(f"import_{mode}")
+
+    response = client.post(
+        "/flashcard/import",
+        data={"title": "imported", "description": "d", "lang": "en"},
+        files={"file": ("cards.csv", b"word,definition\nHaus,house\nBaum,tree\n", "text/csv")},
+        headers=csrf(client),
+    )
+
+    assert response.status_code == 201, response.text
+    deck = response.json()
+    words = client.get(f"/flashcard/decks/{deck['id']}/words").json()
+    assert sorted(word["word"] for word in words["items"]) == ["Baum", "Haus"]
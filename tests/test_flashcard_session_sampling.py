@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+import repositories.flashcard_words_repo as flashcard_words_repo
+from models.flashcard import FlashcardDecks
+from models.flashcardWordList import FlashcardWordList
+from models.user import User
+from repositories.flashcard_words_repo import FlashcardWordRepository
+
+PAST = datetime(2000, 1, 1)
+FUTURE = datetime.utcnow() + timedelta(days=30)
+
+
+@pytest.fixture
+def decks(db):
+    db.add(User(id=1, email="a@example.com", username="alice", password_hash="x"))
+    db.add_all(
+        [
+            FlashcardDecks(id=1, user_id=1, title="one", description="", lang="en"),
+            FlashcardDecks(id=2, user_id=1, title="two", description="", lang="en"),
+        ]
+    )
+    db.commit()
+    return [1, 2]
+
+
+def add_cards(db, deck_id, difficulty, keys, *, due_at=PAST):
+    cards = [
+        FlashcardWordList(
+            deck_id=deck_id,
+            word=f"{difficulty}-{deck_id}-{key}",
+            definition="x",
+            difficulty=difficulty,
+            due_at=due_at,
+            sample_key=key,
+        )
+        for key in keys
+    ]
+    db.add_all(cards)
+    db.commit()
+    return cards
+
+
+def sample(db, monkeypatch, *, limit, pivot=None, deck_ids=(1, 2)):
+    if pivot is not None:
+        # Every tier starts from the same pivot.
+        monkeypatch.setattr(flashcard_words_repo, "random", lambda: pivot)
+    return FlashcardWordRepository(db).get_session_words_by_decks(list(deck_ids), limit=limit)
+
+
+def test_tiers_are_filled_in_priority_order(db, decks, monkeypatch):
+    hard = add_cards(db, 1, "hard", [0.1, 0.5]) + add_cards(db, 2, "hard", [0.9])
+    unrated = add_cards(db, 1, None, [0.2, 0.3, 0.4]) + add_cards(db, 2, None, [0.6, 0.7])
+    add_cards(db, 1, "easy", [0.15, 0.25]) + add_cards(db, 2, "medium", [0.35])
+
+    for _ in range(20):
+        picked = sample(db, monkeypatch, limit=5)
+        ids = {card.id for card in picked}
+        assert {card.id for card in hard} <= ids
+        assert len(ids & {card.id for card in unrated}) == 2
+        assert all(card.difficulty in ("hard", None) for card in picked)
+
+
+def test_rest_tier_only_used_after_hard_and_unrated(db, decks, monkeypatch):
+    add_cards(db, 1, "hard", [0.5])
+    rest = add_cards(db, 1, "easy", [0.1, 0.2]) + add_cards(db, 2, "medium", [0.3]) + add_cards(db, 2, "odd", [0.4])
+
+    picked = sample(db, monkeypatch, limit=10)
+
+    assert sorted(card.difficulty for card in picked) == ["easy", "easy", "hard", "medium", "odd"]
+    assert {card.id for card in rest} <= {card.id for card in picked}
+
+
+def test_wraparound_returns_each_card_once(db, decks, monkeypatch):
+    cards = add_cards(db, 1, None, [0.1, 0.3, 0.5]) + add_cards(db, 2, None, [0.2, 0.4, 0.6])
+
+    # A pivot in the middle makes the sampler wrap around to the low keys.
+    picked = sample(db, monkeypatch, limit=6, pivot=0.35)
+
+    assert len(picked) == 6
+    assert sorted(card.id for card in picked) == sorted(card.id for card in cards)
+
+
+def test_wraparound_stops_at_limit(db, decks, monkeypatch):
+    add_cards(db, 1, "hard", [0.1, 0.3, 0.5, 0.7, 0.9])
+
+    picked = sample(db, monkeypatch, limit=4, pivot=0.8)
+
+    assert sorted(card.sample_key for card in picked) == [0.1, 0.3, 0.5, 0.9]
+
+
+def test_every_due_card_is_reachable_and_future_cards_are_not(db, decks, monkeypatch):
+    due = add_cards(db, 1, "hard", [0.05, 0.06, 0.5]) + add_cards(db, 2, "hard", [0.07, 0.99])
+    add_cards(db, 1, "hard", [0.055, 0.8], due_at=FUTURE)
+
+    reached = set()
+    # With the pivot at a card's key, that card is the first one at or above it.
+    for card in due:
+        picked = sample(db, monkeypatch, limit=1, pivot=card.sample_key)
+        assert [p.id for p in picked] == [card.id]
+        reached.add(picked[0].id)
+
+    assert reached == {card.id for card in due}
+
+
+def test_session_for_lang_only_uses_that_language(db, decks, monkeypatch):
+    db.add(FlashcardDecks(id=3, user_id=1, title="three", description="", lang="de"))
+    db.commit()
+    english = add_cards(db, 1, None, [0.1])
+    add_cards(db, 3, None, [0.2])
+
+    picked = FlashcardWordRepository(db).get_session_words_for_lang(user_id=1, lang="en", limit=10)
+
+    assert [card.id for card in picked] == [english[0].id]
+
+
+def test_one_statement_for_any_number_of_decks(db, decks, monkeypatch):
+    deck_ids = list(decks)
+    for deck_id in range(3, 23):
+        db.add(FlashcardDecks(id=deck_id, user_id=1, title=f"deck {deck_id}", description="", lang="en"))
+        deck_ids.append(deck_id)
+    db.commit()
+    for deck_id in deck_ids:
+        add_cards(db, deck_id, None, [deck_id / 100])
+        add_cards(db, deck_id, "hard", [deck_id / 100], due_at=FUTURE)
+
+    statements = []
+    bind = db.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        picked = FlashcardWordRepository(db).get_session_words_for_lang(user_id=1, lang="en", limit=5)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+
+    assert len(picked) == 5
+    assert all(card.difficulty is None for card in picked)
+    assert len(statements) == 1
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.database as database
+import main
+import services.refresh_token_gc as refresh_token_gc
+from core.config import settings
+from core.database import Base, SessionLocal
+from models.job_run import JobRun
+from repositories.job_run_repo import JobRunRepository
+from services import scheduler
+
+
+@pytest.fixture
+def jobs():
+    Base.metadata.create_all(database.engine)
+    yield
+    with SessionLocal() as db:
+        db.query(JobRun).delete()
+        db.commit()
+
+
+@pytest.fixture
+def blocked_gc(jobs, monkeypatch):
+    """Run the collector on a thread, as the periodic task does, and hold it mid-run."""
+    started = threading.Event()
+    finish = threading.Event()
+
+    def collect(db):
+        started.set()
+        finish.wait(5)
+        return 0
+
+    monkeypatch.setattr(refresh_token_gc, "collect_stale_refresh_tokens", collect)
+    periodic = threading.Thread(target=refresh_token_gc.run_refresh_token_gc)
+    periodic.start()
+    assert started.wait(5)
+    yield
+    finish.set()
+    periodic.join(5)
+
+
+def test_admin_trigger_during_periodic_run_gets_409(blocked_gc, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin")
+    client = TestClient(main.app)
+
+    response = client.post("/admin/refresh_tokens/gc", headers={"X-Admin-Token": "admin"})
+
+    assert response.status_code == 409
+
+
+def test_second_run_in_the_same_process_is_skipped(blocked_gc):
+    ran, _ = scheduler.run_leased(refresh_token_gc.JOB_NAME, lambda db: 0, lease_seconds=60)
+    assert ran is False
+
+
+def test_lease_is_renewed_while_a_long_job_runs(jobs):
+    taken_over = []
+
+    def job(db):
+        time.sleep(1.3)
+        with SessionLocal() as other:
+            taken_over.append(JobRunRepository(other).try_acquire("long_job", owner="other", lease_seconds=1))
+
+    ran, _ = scheduler.run_leased("long_job", job, lease_seconds=1)
+
+    assert ran is True
+    assert taken_over == [False]
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.password_hashing import HashPoolSaturated, PasswordHashPool
+
+
+@pytest.fixture
+def pool():
+    pool = PasswordHashPool(workers=1, max_queue=0)
+    yield pool
+    pool.shutdown()
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_hash_finishes(pool):
+    release = threading.Event()
+    hashed = threading.Event()
+
+    def slow_hash():
+        release.wait(5)
+        hashed.set()
+        return "hash"
+
+    async def scenario():
+        caller = asyncio.create_task(pool.run(slow_hash))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        busy = pool.stats()["in_flight"]
+        with pytest.raises(HashPoolSaturated):
+            await pool.run(slow_hash)
+        return busy
+
+    assert asyncio.run(scenario()) == 1
+
+    release.set()
+    assert hashed.wait(5)
+    pool.shutdown()
+    stats = pool.stats()
+    assert (stats["in_flight"], stats["completed"], stats["rejected"]) == (0, 1, 1)
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.flashcard import FlashcardDecks
+from models.user import User
+from repositories.flashcard_words_repo import FlashcardWordRepository
+from services.spaced_repetition import MIN_EASE, RELEARN_DELAY, ReviewState, schedule_review
+
+NOW = datetime(2026, 1, 1, 12)
+
+NEW = ReviewState(due_at=NOW)
+LEARNING = ReviewState(due_at=NOW, interval_days=1, ease=2.5, repetitions=1)
+MATURE = ReviewState(due_at=NOW, interval_days=10, ease=2.5, repetitions=3)
+AT_FLOOR = ReviewState(due_at=NOW, interval_days=10, ease=MIN_EASE, repetitions=3)
+
+
+@pytest.mark.parametrize(
+    "state, grade, due_in, interval_days, ease, repetitions",
+    [
+        (NEW, "hard", RELEARN_DELAY, 0, 2.18, 0),
+        (NEW, "medium", timedelta(days=1), 1, 2.5, 1),
+        (NEW, "easy", timedelta(days=1), 1, 2.6, 1),
+        (NEW, None, timedelta(0), 0, 2.5, 0),
+        (LEARNING, "medium", timedelta(days=6), 6, 2.5, 2),
+        (MATURE, "hard", RELEARN_DELAY, 0, 2.18, 0),
+        (MATURE, "medium", timedelta(days=25), 25, 2.5, 4),
+        # The interval grows with the ease the card had before this answer.
+        (MATURE, "easy", timedelta(days=25), 25, 2.6, 4),
+        (MATURE, None, timedelta(0), 0, 2.5, 0),
+        (MATURE, "unknown", timedelta(0), 0, 2.5, 0),
+        (AT_FLOOR, "hard", RELEARN_DELAY, 0, MIN_EASE, 0),
+        (AT_FLOOR, "medium", timedelta(days=13), 13, MIN_EASE, 4),
+    ],
+)
+def test_schedule_review(state, grade, due_in, interval_days, ease, repetitions):
+    result = schedule_review(state, grade, NOW)
+
+    assert result.due_at == NOW + due_in
+    assert result.interval_days == interval_days
+    assert result.ease == pytest.approx(ease)
+    assert result.repetitions == repetitions
+
+
+def test_ease_never_drops_below_the_floor():
+    state = MATURE
+    for _ in range(10):
+        state = schedule_review(state, "hard", NOW)
+
+    assert state.ease == MIN_EASE
+
+
+@pytest.fixture
+def cards(db):
+    db.add(User(id=1, email="a@example.com", username="alice", password_hash="x"))
+    db.add(FlashcardDecks(id=1, user_id=1, title="one", description="", lang="en"))
+    db.commit()
+    return FlashcardWordRepository(db)
+
+
+def test_saving_a_new_rating_reschedules_the_card(cards):
+    card = cards.save_word(deck_id=1, word="apple", definition="fruit")
+    cards.update_difficulty(deck_id=1, word_id=card.id, difficulty="medium")
+    assert card.due_at > datetime.utcnow() + timedelta(hours=23)
+
+    card = cards.save_word(deck_id=1, word="apple", definition="fruit", difficulty="hard")
+
+    assert card.due_at <= datetime.utcnow() + RELEARN_DELAY
+    assert (card.difficulty, card.repetitions) == ("hard", 0)
+
+
+def test_saving_the_same_rating_keeps_the_schedule(cards):
+    card = cards.save_word(deck_id=1, word="apple", definition="fruit")
+    cards.update_difficulty(deck_id=1, word_id=card.id, difficulty="medium")
+    due_at, repetitions = card.due_at, card.repetitions
+
+    card = cards.save_word(deck_id=1, word="apple", definition="a fruit", difficulty="medium")
+
+    assert (card.due_at, card.repetitions, card.definition) == (due_at, repetitions, "a fruit")
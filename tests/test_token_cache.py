@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import core.token_cache as token_cache
+from core.token_cache import LocalRevocationBackend, RefreshTokenCache
+
+TTL = 60
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+    def time(self) -> float:
+        return self.now
+
+
+class BrokenBackend:
+    def is_revoked(self, jti: str) -> bool:
+        raise ConnectionError("backend down")
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        raise ConnectionError("backend down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(token_cache, "time", clock)
+    return clock
+
+
+def expiring_in(clock: FakeTime, seconds: float) -> datetime:
+    return datetime.fromtimestamp(clock.now + seconds, tz=timezone.utc)
+
+
+def make_cache(backend=None) -> RefreshTokenCache:
+    return RefreshTokenCache(
+        backend=backend or LocalRevocationBackend(max_entries=10),
+        max_entries=10,
+        ttl_seconds=TTL,
+    )
+
+
+def test_unknown_jti_needs_the_database(clock):
+    assert make_cache().lookup("jti") is None
+
+
+def test_revoke_replaces_a_cached_active_jti(clock):
+    cache = make_cache()
+    cache.remember_active("jti", expiring_in(clock, 3600))
+    assert cache.lookup("jti") is False
+
+    cache.revoke("jti", expiring_in(clock, 3600))
+
+    assert cache.lookup("jti") is True
+
+
+def test_active_entries_expire_with_the_ttl_or_the_token(clock):
+    cache = make_cache()
+    cache.remember_active("long", expiring_in(clock, 3600))
+    cache.remember_active("short", expiring_in(clock, 10))
+
+    clock.now += 10
+    assert (cache.lookup("long"), cache.lookup("short")) == (False, None)
+
+    clock.now += TTL
+    assert cache.lookup("long") is None
+
+
+def test_revocations_are_dropped_once_the_token_expires(clock):
+    cache = make_cache()
+    cache.revoke("jti", expiring_in(clock, 30))
+    assert cache.lookup("jti") is True
+
+    clock.now += 30
+    assert cache.lookup("jti") is None
+
+
+def test_failing_backend_falls_back_to_the_database(clock):
+    cache = make_cache(BrokenBackend())
+    cache.remember_active("jti", expiring_in(clock, 3600))
+
+    assert cache.lookup("jti") is None
+
+    cache.revoke("jti", expiring_in(clock, 3600))
+    assert cache._active == {}
@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import services.translation_service as translation_service
+from core.cache import TTLCache
+from core.config import settings
+from services.translation_service import TranslationService
+
+TTL = 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeDeepL:
+    """Answers like DeepL (upper-cased text) and records every request."""
+
+    def __init__(self, *, delay: float = 0, status_code: int = 200):
+        self.delay = delay
+        self.status_code = status_code
+        self.requests: list[list[str]] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        texts = json.loads(request.content)["text"]
+        self.requests.append(texts)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code)
+        return httpx.Response(200, json={"translations": [{"text": text.upper()} for text in texts]})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(translation_service, "_cache", TTLCache(maxsize=100, ttl=TTL, clock=clock))
+    monkeypatch.setattr(translation_service, "_inflight", {})
+    monkeypatch.setattr(settings, "DEEPL_KEY", "test-key")
+    return clock
+
+
+def run(deepl: FakeDeepL, scenario):
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(deepl)) as client:
+            # A waiter whose future is never resolved would hang; fail instead.
+            return await asyncio.wait_for(scenario(TranslationService(client)), timeout=5)
+
+    return asyncio.run(main())
+
+
+def test_cache_hit_skips_upstream(clock):
+    deepl = FakeDeepL()
+
+    async def scenario(svc):
+        first = await svc.translate(text="hello", source="en", target="de")
+        second = await svc.translate(text="  hello ", source="EN", target="DE")
+        return first, second
+
+    assert run(deepl, scenario) == ("HELLO", "HELLO")
+    assert deepl.requests == [["hello"]]
+
+
+def test_miss_fetches_only_uncached_texts(clock):
+    deepl = FakeDeepL()
+
+    async def scenario(svc):
+        await svc.translate(text="hello", source="en", target="de")
+        return await svc.translate_many(["hello", "world", "world"], source="en", target="de")
+
+    assert run(deepl, scenario) == ["HELLO", "WORLD", "WORLD"]
+    assert deepl.requests == [["hello"], ["world"]]
+
+
+def test_expired_entry_is_fetched_again(clock):
+    deepl = FakeDeepL()
+
+    async def scenario(svc):
+        await svc.translate(text="hello", source="en", target="de")
+        clock.now += TTL - 1
+        await svc.translate(text="hello", source="en", target="de")
+        clock.now += 1
+        return await svc.translate(text="hello", source="en", target="de")
+
+    assert run(deepl, scenario) == "HELLO"
+    assert deepl.requests == [["hello"], ["hello"]]
+
+
+def test_concurrent_identical_requests_share_one_upstream_call(clock):
+    deepl = FakeDeepL(delay=0.05)
+
+    async def scenario(svc):
+        return await asyncio.gather(
+            svc.translate(text="hello", source="en", target="de"),
+            svc.translate(text="hello", source="en", target="de"),
+        )
+
+    assert run(deepl, scenario) == ["HELLO", "HELLO"]
+    assert deepl.requests == [["hello"]]
+    assert translation_service._inflight == {}
+
+
+def test_cancelled_leader_does_not_fail_the_followers(clock):
+    deepl = FakeDeepL(delay=0.05)
+
+    async def scenario(svc):
+        leader = asyncio.create_task(svc.translate(text="hello", source="en", target="de"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(svc.translate(text="hello", source="en", target="de"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower, leader.cancelled()
+
+    assert run(deepl, scenario) == ("HELLO", True)
+    assert deepl.requests == [["hello"]]
+    assert translation_service._inflight == {}
+    assert translation_service._cache.get(("EN", "DE", "hello")) == "HELLO"
+
+
+def test_upstream_failure_reaches_every_waiter_and_is_not_cached(clock):
+    deepl = FakeDeepL(delay=0.05, status_code=500)
+
+    async def scenario(svc):
+        return await asyncio.gather(
+            svc.translate(text="hello", source="en", target="de"),
+            svc.translate(text="hello", source="en", target="de"),
+            return_exceptions=True,
+        )
+
+    results = run(deepl, scenario)
+    assert [exc.status_code for exc in results if isinstance(exc, HTTPException)] == [502, 502]
+    assert len(deepl.requests) == 1
+    assert translation_service._inflight == {}
+    assert len(translation_service._cache) == 0
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=TTL, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+
+    clock.now += TTL
+    assert cache.get("a") is None
+    assert cache.get("c", "gone") == "gone"
+    assert len(cache) == 0
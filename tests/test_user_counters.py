@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import repositories.user_repo as user_repo
+from core.counters import CounterBuffer
+from core.profile_cache import ProfileCache
+from models.user import User
+from repositories.user_repo import UserRepository
+
+
+@pytest.fixture
+def repo(db, monkeypatch):
+    monkeypatch.setattr(user_repo, "user_counters", CounterBuffer(max_pending=100))
+    monkeypatch.setattr(
+        user_repo, "user_profiles", ProfileCache(max_entries=100, ttl_seconds=60)
+    )
+    db.add(User(id=1, email="a@example.com", username="alice", password_hash="x"))
+    db.commit()
+    return UserRepository(db)
+
+
+def read_wins_in_thread(bind) -> tuple[threading.Thread, list[int]]:
+    """Read the user's wins the way another request would, on its own session."""
+    seen: list[int] = []
+
+    def read():
+        session = Session(bind=bind)
+        try:
+            seen.append(UserRepository(session).get_wordle_stats(1)["wins"])
+        finally:
+            session.close()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    return thread, seen
+
+
+def test_buffered_results_are_counted_once(repo):
+    repo.record_wordle_result(1, is_win=True)
+    repo.record_wordle_result(1, is_win=True)
+    assert repo.get_wordle_stats(1)["wins"] == 2
+
+    assert repo.flush_counters() == 1
+    assert repo.get_wordle_stats(1) == {"played": 2, "wins": 2, "losses": 0, "win_streak": 2}
+
+
+def test_read_between_commit_and_complete_is_not_double_counted(repo, db, monkeypatch):
+    repo.record_wordle_result(1, is_win=True)
+    repo.get_wordle_stats(1)  # cache the profile as stored: 0 wins
+    readers = []
+    invalidate = user_repo.user_profiles.invalidate
+
+    # Runs after the flush committed and before complete(): the row already
+    # holds the win while the buffer still has it in flight.
+    def invalidate_then_read(*keys):
+        invalidate(*keys)
+        thread, seen = read_wins_in_thread(db.get_bind())
+        thread.join(timeout=0.2)
+        readers.append((thread, seen))
+
+    monkeypatch.setattr(user_repo.user_profiles, "invalidate", invalidate_then_read)
+    repo.flush_counters()
+
+    thread, seen = readers[0]
+    thread.join(timeout=5)
+    assert seen == [1]
+
+
+def test_read_before_the_flush_commits_includes_the_inflight_delta(repo, db):
+    repo.record_wordle_result(1, is_win=True)
+    bind = db.get_bind()
+    readers = []
+
+    def read_after_update(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("UPDATE USERS") and not readers:
+            thread, seen = read_wins_in_thread(bind)
+            thread.join(timeout=5)
+            readers.append((thread, seen))
+
+    event.listen(bind, "after_cursor_execute", read_after_update)
+    try:
+        repo.flush_counters()
+    finally:
+        event.remove(bind, "after_cursor_execute", read_after_update)
+
+    thread, seen = readers[0]
+    assert not thread.is_alive()
+    assert seen == [1]
+    assert repo.get_wordle_stats(1)["wins"] == 1
@@ -0,0 +1,65 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.flashcard import FlashcardDecks
+from models.flashcardWordList import FlashcardWordList
+from models.user import User
+from models.user_stats import UserStats
+from repositories.user_stats_repo import UserStatsRepository
+
+
+def add_user_with_cards(db, *, cards):
+    db.add(User(id=1, email="a@example.com", username="alice", password_hash="x"))
+    db.add(FlashcardDecks(id=1, user_id=1, title="one", description="", lang="en"))
+    db.add_all(
+        FlashcardWordList(deck_id=1, word=f"w{i}", definition="x", difficulty="hard") for i in range(cards)
+    )
+    db.commit()
+
+
+def test_first_read_builds_the_row(db):
+    add_user_with_cards(db, cards=3)
+
+    stats = UserStatsRepository(db).get(1)
+
+    assert (stats.total_cards, stats.cards_hard, stats.due_cards) == (3, 3, 3)
+    assert db.query(UserStats).count() == 1
+
+
+def test_concurrent_first_reads_do_not_collide(db):
+    add_user_with_cards(db, cards=2)
+    bind = db.get_bind()
+    other = Session(bind=bind)
+    raced = []
+
+    # Let a second request build the row just before this one writes it,
+    # after both have seen it missing.
+    @event.listens_for(bind, "before_cursor_execute")
+    def build_row_first(conn, cursor, statement, parameters, context, executemany):
+        if raced or not statement.lstrip().upper().startswith("INSERT INTO USER_STATS"):
+            return
+        raced.append(True)
+        UserStatsRepository(other).get(1)
+
+    try:
+        stats = UserStatsRepository(db).get(1)
+    finally:
+        event.remove(bind, "before_cursor_execute", build_row_first)
+        other.close()
+
+    assert raced
+    assert (stats.total_cards, stats.cards_hard, stats.stale) == (2, 2, False)
+    assert db.query(UserStats).count() == 1
+
+
+def test_stale_row_is_rebuilt_in_place(db):
+    add_user_with_cards(db, cards=1)
+    repo = UserStatsRepository(db)
+    repo.get(1)
+    db.add(FlashcardWordList(deck_id=1, word="bulk", definition="x", difficulty=None))
+    repo.invalidate(1)
+    db.commit()
+
+    stats = repo.get(1)
+
+    assert (stats.total_cards, stats.cards_unrated, stats.stale) == (2, 1, False)
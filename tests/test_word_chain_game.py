@@ -0,0 +1,148 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+from sqlalchemy.orm import Session
+
+import services.words_services as words_services
+from models.user import User
+from repositories.wordChain_repo import WordChainRepository
+from services.words_services import WordChainServices
+
+
+@pytest.fixture
+def user(db):
+    db.add(User(id=1, email="a@example.com", username="alice", password_hash="x"))
+    db.commit()
+    words_services._games.clear()
+    yield 1
+    words_services._games.clear()
+
+
+@pytest.fixture
+def busy_switching():
+    # Switch threads as often as possible so unlocked interleavings show up.
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+@pytest.fixture
+def other_worker(db):
+    # A second session writes straight to the table, the way a request served
+    # by another process would, without touching this process's cache.
+    session = Session(bind=db.get_bind())
+    yield WordChainRepository(session)
+    session.close()
+
+
+def test_game_is_reused_while_nothing_changed(db, user):
+    svc = WordChainServices(db)
+    game = svc.get_game(user_id=user, lang="en")
+    svc.add_word(user_id=user, word="apple")
+
+    assert svc.get_game(user_id=user, lang="en") is game
+    assert "apple" in game.used
+
+
+def test_bot_words_keep_the_cached_game_current(db, user):
+    svc = WordChainServices(db)
+    game = svc.get_game(user_id=user, lang="en")
+    word = svc.play_bot_word(user_id=user, game=game, letter="a")
+
+    assert word is not None
+    assert svc.get_game(user_id=user, lang="en") is game
+
+
+def test_words_added_by_another_worker_reload_the_game(db, user, other_worker):
+    svc = WordChainServices(db)
+    game = svc.get_game(user_id=user, lang="en")
+    other_worker.add_used_word(user_id=user, word="apple")
+
+    assert svc.get_game(user_id=user, lang="en") is game
+    assert "apple" in game.used
+
+
+def test_clear_by_another_worker_reloads_the_game(db, user, other_worker):
+    svc = WordChainServices(db)
+    svc.add_word(user_id=user, word="apple")
+    game = svc.get_game(user_id=user, lang="en")
+    other_worker.clear_user_words(user_id=user)
+
+    assert svc.get_game(user_id=user, lang="en") is game
+    assert game.used == set()
+
+
+class SlowGames(OrderedDict):
+    """Pauses after every lookup, widening the gap before the entry is touched again."""
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        time.sleep(0.0005)
+        return value
+
+
+def test_concurrent_lookups_survive_eviction(db, monkeypatch):
+    monkeypatch.setattr(words_services, "MAX_CACHED_GAMES", 2)
+    monkeypatch.setattr(words_services, "_games", SlowGames())
+    bind = db.get_bind()
+    errors = []
+
+    def play(offset):
+        session = Session(bind=bind)
+        try:
+            svc = WordChainServices(session)
+            for step in range(40):
+                svc.get_game(user_id=(offset + step) % 5 + 1, lang="en")
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=play, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(words_services._games) <= 2
+
+
+def test_concurrent_moves_never_repeat_a_word(db, user, busy_switching):
+    bind = db.get_bind()
+    WordChainServices(db).get_game(user_id=user, lang="en")
+    answers: list[str | None] = []
+    errors = []
+
+    def play():
+        session = Session(bind=bind)
+        try:
+            svc = WordChainServices(session)
+            for _ in range(5):
+                answers.append(svc.bot_move(user_id=user, lang="en", player_word="apple"))
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=play) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    words = [word for word in answers if word is not None]
+    assert errors == []
+    assert len(words) == 30
+    assert len(set(words)) == len(words)
+    stored = WordChainRepository(db).get_used_word_values(user)
+    assert sorted(stored) == sorted(words)
+
+    game = WordChainServices(db).get_game(user_id=user, lang="en")
+    pool = game._pool("e")
+    assert all(pool._items[index].lower() == key for key, index in pool._positions.items())
+    assert not {word.lower() for word in pool._items} & set(words)